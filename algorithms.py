@@ -1,409 +1,1994 @@
-from typing import List, Tuple
-
-def selection_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int]], List[str]]:
+import heapq
+import os
+import random
+import time
+from collections import Counter, deque
+from functools import partial
+from itertools import chain
+from operator import itemgetter
+from typing import Callable, Dict, Generator, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import messages as msg
+from traces import NOTE, VISIT, COMPARE, SWAP, WRITE, OP_NAMES, Step, Trace, shift_step
+from tracearchive import ARCHIVE_SUFFIX, TraceArchive, write_archive
+from tracefile import TraceFile, write_trace
+from tracepool import iter_radix_passes, sort_chunks
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the vectorized sorts.
+    np = None
+
+SortResult = Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]
+SortOutput = Union[SortResult, Dict[str, int], None]
+
+# "none" only sorts, "counters" tallies operations and recursion depth,
+# "full" records a replayable trace.
+RECORDING_LEVELS = ("none", "counters", "full")
+
+
+def _counters(notes: int = 0, visits: int = 0, compares: int = 0, swaps: int = 0, writes: int = 0,
+              max_depth: int = 0) -> Dict[str, int]:
+    """Packs operation counts as returned by the "counters" recording level."""
+    return {"notes": notes, "visits": visits, "compares": compares, "swaps": swaps, "writes": writes,
+            "max_depth": max_depth}
+
+
+def _run(arr: List[int], steps: Iterator[Step], stream: bool, level: str,
+         stats: Optional[Dict[str, int]] = None, path: Optional[str] = None,
+         counted: Optional[Callable[[], Dict[str, int]]] = None, **trace_options) -> SortOutput:
     """
-    Performs Selection Sort on the input array.
+    Drives a sorting generator at the requested recording level.
+
+    The "none" and "counters" levels run `counted` instead, if given: an
+    untraced version of the sort that only tallies its operations in plain
+    integers, so they never build a step.
 
     Args:
-        arr (List[int]): The array to sort.
+        arr (List[int]): The array being sorted by the generator.
+        steps (Iterator[Step]): The sorting generator.
+        stream (bool): If True, the generator is consumed lazily via Trace.fill.
+            Only valid with the "full" level.
+        level (str): One of RECORDING_LEVELS.
+        stats (Optional[Dict[str, int]]): Statistics the generator updates
+            while running, such as "max_depth".
+        path (Optional[str]): If set, the "full" trace is written to this
+            file as it is generated and read back through a memory map
+            instead of being kept in memory. Paths ending in ARCHIVE_SUFFIX
+            get a compressed trace archive instead.
+        counted (Optional[Callable[[], Dict[str, int]]]): Sorts the array
+            without tracing and returns the counts the generator's steps
+            would add up to, as for the "counters" level.
+        **trace_options: Keyword arguments for Trace, such as backend or
+            keyframe_interval, or for tracearchive.write_archive, such as codec.
+            The backend is ignored when writing to `path`.
 
     Returns:
-        Tuple[List[List[int]], List[List[int]], List[str]]:
-            - steps: List of array states after each operation.
-            - highlights: List of indices to highlight at each step.
-            - messages: List of descriptive messages for each step.
+        Union[SortResult, Dict[str, int], None]:
+            - "full": The (steps, highlights, messages) views of the trace.
+            - "counters": Operation counts by name plus "max_depth".
+            - "none": None; the array is just sorted.
     """
-    steps = []
-    highlights = []
-    messages = []
-    steps.append(arr.copy())
-    highlights.append([])
-    messages.append("Initial array")
+    if level not in RECORDING_LEVELS:
+        raise ValueError(f"Unknown recording level {level!r}; expected one of {RECORDING_LEVELS}.")
+    if stream and level != "full":
+        raise ValueError("Only the 'full' recording level can be streamed.")
+    if path is not None and (stream or level != "full"):
+        raise ValueError("Only full, non-streamed traces can be written to a file.")
+
+    if level != "full" and counted is not None:
+        counts = counted()
+        return None if level == "none" else counts
+    if level == "none":
+        deque(steps, maxlen=0)
+        return None
+    if level == "counters":
+        counts = Counter(map(itemgetter(0), steps))
+        result = {name: counts[op] for op, name in OP_NAMES.items()}
+        result["max_depth"] = stats["max_depth"] if stats else 0
+        return result
+
+    if path is not None:
+        # File traces are not held in in-memory columns, so the backend does not apply.
+        trace_options.pop("backend", None)
+    if path is not None and path.endswith(ARCHIVE_SUFFIX):
+        write_archive(path, arr, steps, **trace_options)
+        return TraceArchive(path).views()
+    if path is not None:
+        write_trace(path, arr, steps, **trace_options)
+        return TraceFile(path).views()
+
+    trace = Trace(arr, steps, **trace_options)
+    if not stream:
+        trace.fill()
+    return trace.views()
+
+
+def iter_selection_sort(arr: List[int]) -> Iterator[Step]:
+    """
+    Sorts the input array in place with Selection Sort, yielding each step.
+
+    Args:
+        arr (List[int]): The array to sort.
 
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
     for i in range(len(arr)):
         min_idx = i
-        messages.append(f"Selecting index {i} as the initial minimum.")
+        yield VISIT, i, 0, msg.SELECT_MINIMUM, (i,)
         for j in range(i + 1, len(arr)):
-            highlights.append([min_idx, j])
-            steps.append(arr.copy())
-            messages.append(f"Comparing index {min_idx} (value {arr[min_idx]}) with index {j} (value {arr[j]}).")
+            yield COMPARE, min_idx, j, msg.COMPARE, (min_idx, arr[min_idx], j, arr[j])
             if arr[min_idx] > arr[j]:
                 min_idx = j
-                messages.append(f"New minimum found at index {min_idx} (value {arr[min_idx]}).")
+                yield VISIT, min_idx, 0, msg.NEW_MINIMUM, (min_idx, arr[min_idx])
         if min_idx != i:
             arr[i], arr[min_idx] = arr[min_idx], arr[i]
-            steps.append(arr.copy())
-            highlights.append([i, min_idx])
-            messages.append(f"Swapped index {i} (value {arr[i]}) with index {min_idx} (value {arr[min_idx]}).")
+            yield SWAP, i, min_idx, msg.SWAP, (i, arr[i], min_idx, arr[min_idx])
         else:
-            highlights.append([])
-            messages.append("No swap needed.")
-    messages.append("Selection Sort completed.")
-    return steps, highlights, messages
+            yield NOTE, 0, 0, msg.NO_SWAP, ()
+    yield NOTE, 0, 0, msg.SELECTION_SORT_COMPLETED, ()
 
 
-def bubble_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int]], List[str]]:
+def count_selection_sort(arr: List[int]) -> Dict[str, int]:
     """
-    Performs Bubble Sort on the input array.
+    Sorts the input array in place with Selection Sort, without tracing.
 
     Args:
         arr (List[int]): The array to sort.
 
     Returns:
-        Tuple[List[List[int]], List[List[int]], List[str]]:
-            - steps: List of array states after each operation.
-            - highlights: List of indices to highlight at each step.
-            - messages: List of descriptive messages for each step.
+        Dict[str, int]: The operation counts of iter_selection_sort's steps.
+    """
+    n = len(arr)
+    notes = visits = compares = swaps = 0
+    for i in range(n):
+        min_idx = i
+        visits += 1
+        compares += n - i - 1
+        for j in range(i + 1, n):
+            if arr[min_idx] > arr[j]:
+                min_idx = j
+                visits += 1
+        if min_idx != i:
+            arr[i], arr[min_idx] = arr[min_idx], arr[i]
+            swaps += 1
+        else:
+            notes += 1
+    return _counters(notes + 1, visits, compares, swaps)
+
+
+def selection_sort(arr: List[int], stream: bool = False, level: str = "full", **trace_options) -> SortOutput:
+    """
+    Performs Selection Sort on the input array.
+
+    Args:
+        arr (List[int]): The array to sort.
+        stream (bool): If True, steps are generated lazily as the returned
+            views are filled instead of sorting the whole array up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
+
+    Returns:
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each operation.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    return _run(arr, iter_selection_sort(arr), stream, level, counted=partial(count_selection_sort, arr),
+                **trace_options)
+
+
+def iter_bubble_sort(arr: List[int]) -> Iterator[Step]:
     """
-    steps = []
-    highlights = []
-    messages = []
-    steps.append(arr.copy())
-    highlights.append([])
-    messages.append("Initial array")
+    Sorts the input array in place with Bubble Sort, yielding each step.
 
+    Args:
+        arr (List[int]): The array to sort.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
     n = len(arr)
     for i in range(n):
         swapped = False
-        messages.append(f"Starting pass {i + 1}.")
+        yield NOTE, 0, 0, msg.START_PASS, (i + 1,)
         for j in range(0, n - i - 1):
-            highlights.append([j, j + 1])
-            steps.append(arr.copy())
-            messages.append(f"Comparing index {j} (value {arr[j]}) with index {j + 1} (value {arr[j + 1]}).")
+            yield COMPARE, j, j + 1, msg.COMPARE, (j, arr[j], j + 1, arr[j + 1])
             if arr[j] > arr[j + 1]:
                 arr[j], arr[j + 1] = arr[j + 1], arr[j]
-                steps.append(arr.copy())
-                highlights.append([j, j + 1])
-                messages.append(f"Swapped index {j} (value {arr[j]}) with index {j + 1} (value {arr[j + 1]}).")
+                yield SWAP, j, j + 1, msg.SWAP, (j, arr[j], j + 1, arr[j + 1])
                 swapped = True
         if not swapped:
-            messages.append("No swaps in this pass. Array is sorted.")
+            yield NOTE, 0, 0, msg.PASS_SORTED, ()
             break
-    messages.append("Bubble Sort completed.")
-    return steps, highlights, messages
+    yield NOTE, 0, 0, msg.BUBBLE_SORT_COMPLETED, ()
 
 
-def insertion_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int]], List[str]]:
+def count_bubble_sort(arr: List[int]) -> Dict[str, int]:
     """
-    Performs Insertion Sort on the input array.
+    Sorts the input array in place with Bubble Sort, without tracing.
 
     Args:
         arr (List[int]): The array to sort.
 
     Returns:
-        Tuple[List[List[int]], List[List[int]], List[str]]:
-            - steps: List of array states after each operation.
-            - highlights: List of indices to highlight at each step.
-            - messages: List of descriptive messages for each step.
+        Dict[str, int]: The operation counts of iter_bubble_sort's steps.
+    """
+    n = len(arr)
+    notes = compares = swaps = 0
+    for i in range(n):
+        swapped = False
+        notes += 1
+        compares += n - i - 1
+        for j in range(0, n - i - 1):
+            if arr[j] > arr[j + 1]:
+                arr[j], arr[j + 1] = arr[j + 1], arr[j]
+                swaps += 1
+                swapped = True
+        if not swapped:
+            notes += 1
+            break
+    return _counters(notes + 1, compares=compares, swaps=swaps)
+
+
+def bubble_sort(arr: List[int], stream: bool = False, level: str = "full", **trace_options) -> SortOutput:
+    """
+    Performs Bubble Sort on the input array.
+
+    Args:
+        arr (List[int]): The array to sort.
+        stream (bool): If True, steps are generated lazily as the returned
+            views are filled instead of sorting the whole array up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
+
+    Returns:
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each operation.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    return _run(arr, iter_bubble_sort(arr), stream, level, counted=partial(count_bubble_sort, arr),
+                **trace_options)
+
+
+def iter_insertion_sort(arr: List[int]) -> Iterator[Step]:
+    """
+    Sorts the input array in place with Insertion Sort, yielding each step.
+
+    Args:
+        arr (List[int]): The array to sort.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
+    for i in range(1, len(arr)):
+        key = arr[i]
+        j = i - 1
+        yield VISIT, i, 0, msg.INSERTING, (i, key)
+        while j >= 0 and key < arr[j]:
+            yield COMPARE, j, j + 1, msg.COMPARE_KEY, (key, j, arr[j])
+            arr[j + 1] = arr[j]
+            yield WRITE, j + 1, arr[j], msg.MOVED, (arr[j], j, j + 1)
+            j -= 1
+        arr[j + 1] = key
+        yield WRITE, j + 1, key, msg.INSERTED_KEY, (key, j + 1)
+    yield NOTE, 0, 0, msg.INSERTION_SORT_COMPLETED, ()
+
+
+def count_insertion_sort(arr: List[int]) -> Dict[str, int]:
     """
-    steps = []
-    highlights = []
-    messages = []
-    steps.append(arr.copy())
-    highlights.append([])
-    messages.append("Initial array")
+    Sorts the input array in place with Insertion Sort, without tracing.
+
+    Args:
+        arr (List[int]): The array to sort.
 
+    Returns:
+        Dict[str, int]: The operation counts of iter_insertion_sort's steps.
+    """
+    moves = 0
     for i in range(1, len(arr)):
         key = arr[i]
         j = i - 1
-        messages.append(f"Inserting element at index {i} (value {key}).")
         while j >= 0 and key < arr[j]:
-            highlights.append([j, j + 1])
-            steps.append(arr.copy())
-            messages.append(f"Comparing key (value {key}) with index {j} (value {arr[j]}).")
             arr[j + 1] = arr[j]
-            steps.append(arr.copy())
-            highlights.append([j, j + 1])
-            messages.append(f"Moved value {arr[j]} from index {j} to index {j + 1}.")
             j -= 1
         arr[j + 1] = key
-        steps.append(arr.copy())
-        highlights.append([j + 1])
-        messages.append(f"Inserted key (value {key}) at index {j + 1}.")
-    messages.append("Insertion Sort completed.")
-    return steps, highlights, messages
+        moves += i - 1 - j
+    inserted = max(0, len(arr) - 1)
+    # Every move is one successful comparison and one write.
+    return _counters(1, inserted, moves, 0, moves + inserted)
 
 
-def heap_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int]], List[str]]:
+def insertion_sort(arr: List[int], stream: bool = False, level: str = "full", **trace_options) -> SortOutput:
     """
-    Performs Heap Sort on the input array.
+    Performs Insertion Sort on the input array.
 
     Args:
         arr (List[int]): The array to sort.
+        stream (bool): If True, steps are generated lazily as the returned
+            views are filled instead of sorting the whole array up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
 
     Returns:
-        Tuple[List[List[int]], List[List[int]], List[str]]:
-            - steps: List of array states after each operation.
-            - highlights: List of indices to highlight at each step.
-            - messages: List of descriptive messages for each step.
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each operation.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    return _run(arr, iter_insertion_sort(arr), stream, level, counted=partial(count_insertion_sort, arr),
+                **trace_options)
+
+
+def iter_heap_sort(arr: List[int], stats: Optional[Dict[str, int]] = None) -> Iterator[Step]:
     """
-    steps = []
-    highlights = []
-    messages = []
-    steps.append(arr.copy())
-    highlights.append([])
-    messages.append("Initial array")
+    Sorts the input array in place with Heap Sort, yielding each step.
+
+    Args:
+        arr (List[int]): The array to sort.
+        stats (Optional[Dict[str, int]]): If given, "max_depth" is updated
+            with the most levels a single heapify sifted through.
 
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
     n = len(arr)
 
-    def heapify(n: int, i: int):
+    def heapify(n: int, i: int) -> Iterator[Step]:
         """
-        Ensures the subtree rooted at index i satisfies the heap property.
+        Ensures the subtree rooted at index i satisfies the heap property,
+        sifting the root down one level per iteration.
 
         Args:
             n (int): Size of the heap.
             i (int): Root index of the subtree.
         """
-        largest = i
-        l = 2 * i + 1     
-        r = 2 * i + 2    
-
-        if l < n:
-            highlights.append([largest, l])
-            steps.append(arr.copy())
-            messages.append(f"Comparing index {largest} (value {arr[largest]}) with left child index {l} (value {arr[l]}).")
-            if arr[l] > arr[largest]:
-                largest = l
-                messages.append(f"New largest found at index {largest} (value {arr[largest]}).")
-
-        if r < n:
-            highlights.append([largest, r])
-            steps.append(arr.copy())
-            messages.append(f"Comparing index {largest} (value {arr[largest]}) with right child index {r} (value {arr[r]}).")
-            if arr[r] > arr[largest]:
-                largest = r
-                messages.append(f"New largest found at index {largest} (value {arr[largest]}).")
-
-        if largest != i:
-            arr[i], arr[largest] = arr[largest], arr[i] 
-            steps.append(arr.copy())
-            highlights.append([i, largest])
-            messages.append(f"Swapped index {i} (value {arr[i]}) with index {largest} (value {arr[largest]}).")
-            heapify(n, largest)
+        depth = 1
+        while True:
+            if stats is not None and depth > stats["max_depth"]:
+                stats["max_depth"] = depth
+            largest = i
+            l = 2 * i + 1
+            r = 2 * i + 2
+
+            if l < n:
+                yield COMPARE, largest, l, msg.COMPARE_LEFT_CHILD, (largest, arr[largest], l, arr[l])
+                if arr[l] > arr[largest]:
+                    largest = l
+                    yield VISIT, largest, 0, msg.NEW_LARGEST, (largest, arr[largest])
+
+            if r < n:
+                yield COMPARE, largest, r, msg.COMPARE_RIGHT_CHILD, (largest, arr[largest], r, arr[r])
+                if arr[r] > arr[largest]:
+                    largest = r
+                    yield VISIT, largest, 0, msg.NEW_LARGEST, (largest, arr[largest])
+
+            if largest == i:
+                return
+            arr[i], arr[largest] = arr[largest], arr[i]
+            yield SWAP, i, largest, msg.SWAP, (i, arr[i], largest, arr[largest])
+            i = largest
+            depth += 1
 
     for i in range(n // 2 - 1, -1, -1):
-        heapify(n, i)
+        yield from heapify(n, i)
 
     for i in range(n-1, 0, -1):
         arr[i], arr[0] = arr[0], arr[i]
-        steps.append(arr.copy())
-        highlights.append([0, i])
-        messages.append(f"Swapped index 0 (value {arr[0]}) with index {i} (value {arr[i]}).")
+        yield SWAP, 0, i, msg.SWAP, (0, arr[0], i, arr[i])
+        yield from heapify(i, 0)
+    yield NOTE, 0, 0, msg.HEAP_SORT_COMPLETED, ()
+
+
+def count_heap_sort(arr: List[int]) -> Dict[str, int]:
+    """
+    Sorts the input array in place with Heap Sort, without tracing.
+
+    Args:
+        arr (List[int]): The array to sort.
+
+    Returns:
+        Dict[str, int]: The operation counts of iter_heap_sort's steps and
+        its "max_depth".
+    """
+    n = len(arr)
+    visits = compares = swaps = max_depth = 0
+
+    def heapify(n: int, i: int):
+        """Sifts the root of the subtree at index i down to its place."""
+        nonlocal visits, compares, swaps, max_depth
+        depth = 1
+        while True:
+            largest = i
+            l = 2 * i + 1
+            r = 2 * i + 2
+            if l < n:
+                compares += 1
+                if arr[l] > arr[largest]:
+                    largest = l
+                    visits += 1
+            if r < n:
+                compares += 1
+                if arr[r] > arr[largest]:
+                    largest = r
+                    visits += 1
+            if largest == i:
+                break
+            arr[i], arr[largest] = arr[largest], arr[i]
+            swaps += 1
+            i = largest
+            depth += 1
+        if depth > max_depth:
+            max_depth = depth
+
+    for i in range(n // 2 - 1, -1, -1):
+        heapify(n, i)
+
+    for i in range(n - 1, 0, -1):
+        arr[i], arr[0] = arr[0], arr[i]
+        swaps += 1
         heapify(i, 0)
-    messages.append("Heap Sort completed.")
-    return steps, highlights, messages
+    return _counters(1, visits, compares, swaps, 0, max_depth)
 
 
-def quick_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int]], List[str]]:
+def heap_sort(arr: List[int], stream: bool = False, level: str = "full", **trace_options) -> SortOutput:
     """
-    Performs Quick Sort on the input array.
+    Performs Heap Sort on the input array.
 
     Args:
         arr (List[int]): The array to sort.
+        stream (bool): If True, steps are generated lazily as the returned
+            views are filled instead of sorting the whole array up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
 
     Returns:
-        Tuple[List[List[int]], List[List[int]], List[str]]:
-            - steps: List of array states after each operation.
-            - highlights: List of indices to highlight at each step.
-            - messages: List of descriptive messages for each step.
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each operation.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
     """
-    steps = []
-    highlights = []
-    messages = []
-    steps.append(arr.copy())
-    highlights.append([])
-    messages.append("Initial array")
+    stats = {"max_depth": 0}
+    return _run(arr, iter_heap_sort(arr, stats), stream, level, stats, counted=partial(count_heap_sort, arr),
+                **trace_options)
+
 
-    def quick_sort_recursive(low: int, high: int):
+# Pivot selection strategies and partition schemes supported by quick_sort.
+PIVOT_STRATEGIES = ("last", "median-of-three", "random", "ninther")
+PARTITION_SCHEMES = ("lomuto", "three-way", "dual-pivot")
+
+
+def iter_quick_sort(arr: List[int], stats: Optional[Dict[str, int]] = None, smaller_first: bool = False,
+                    pivot: str = "last", partition: str = "lomuto", seed: Optional[int] = None) -> Iterator[Step]:
+    """
+    Sorts the input array in place with Quick Sort, yielding each step.
+
+    Subarrays waiting to be sorted are kept on an explicit stack instead of
+    the call stack, so sorted or reversed inputs of any size do not hit
+    Python's recursion limit.
+
+    Args:
+        arr (List[int]): The array to sort.
+        stats (Optional[Dict[str, int]]): If given, "max_depth" is updated
+            with the deepest partitioning level reached.
+        smaller_first (bool): If True, the smaller side of each partition is
+            sorted first, which bounds the stack to O(log n) entries but
+            changes the order of the steps. If False, the left side is
+            always sorted first, as in the recursive formulation.
+        pivot (str): One of PIVOT_STRATEGIES. "last" takes the last element,
+            "median-of-three" the median of the first, middle and last
+            elements, "random" a random element and "ninther" the median of
+            three medians of three spread over the subarray.
+        partition (str): One of PARTITION_SCHEMES. "lomuto" splits the
+            subarray into elements smaller than the pivot and the rest,
+            "three-way" also gathers the elements equal to the pivot so that
+            they are never visited again, and "dual-pivot" splits it into
+            three parts around two pivots.
+        seed (Optional[int]): Seed for the "random" pivot strategy.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
+    if pivot not in PIVOT_STRATEGIES:
+        raise ValueError(f"Unknown pivot strategy {pivot!r}; expected one of {PIVOT_STRATEGIES}.")
+    if partition not in PARTITION_SCHEMES:
+        raise ValueError(f"Unknown partition scheme {partition!r}; expected one of {PARTITION_SCHEMES}.")
+    rng = random.Random(seed)
+
+    def median_of_three(i: int, j: int, k: int) -> Generator[Step, None, int]:
         """
-        Recursively applies Quick Sort on the subarrays.
+        Finds which of three indices holds the median value.
 
-        Args:
-            low (int): Starting index of the subarray.
-            high (int): Ending index of the subarray.
+        Returns:
+            int: The index of the median.
         """
-        if low < high:
-            pi = partition(low, high)
-            quick_sort_recursive(low, pi - 1)
-            quick_sort_recursive(pi + 1, high)
+        low, high = (i, j) if arr[i] <= arr[j] else (j, i)
+        yield COMPARE, i, j, msg.COMPARE, (i, arr[i], j, arr[j])
+        yield COMPARE, high, k, msg.COMPARE, (high, arr[high], k, arr[k])
+        if arr[high] <= arr[k]:
+            median = high
+        else:
+            yield COMPARE, low, k, msg.COMPARE, (low, arr[low], k, arr[k])
+            median = k if arr[low] <= arr[k] else low
+        yield VISIT, median, 0, msg.MEDIAN_OF_THREE, (i, j, k, median)
+        return median
 
-    def partition(low: int, high: int) -> int:
+    def choose_pivot(low: int, high: int) -> Generator[Step, None, int]:
         """
-        Partitions the array around a pivot element.
+        Picks the pivot of arr[low..high] with the selected strategy.
+
+        Returns:
+            int: The index of the pivot.
+        """
+        if pivot == "random":
+            index = rng.randint(low, high)
+            yield VISIT, index, 0, msg.RANDOM_PIVOT, (index, arr[index])
+            return index
+        if pivot == "last" or high - low < 2:
+            return high
+        mid = (low + high) // 2
+        if pivot == "median-of-three" or high - low < 8:
+            return (yield from median_of_three(low, mid, high))
+        step = (high - low) // 8
+        first = yield from median_of_three(low, low + step, low + 2 * step)
+        second = yield from median_of_three(mid - step, mid, mid + step)
+        third = yield from median_of_three(high - 2 * step, high - step, high)
+        return (yield from median_of_three(first, second, third))
+
+    def move_pivot(index: int, target: int) -> Iterator[Step]:
+        """
+        Swaps a chosen pivot into the position the partition scheme expects it at.
+        """
+        if index != target:
+            arr[index], arr[target] = arr[target], arr[index]
+            yield SWAP, target, index, msg.SWAP_PIVOT, (target, arr[target], index, arr[index])
+
+    def lomuto_partition(low: int, high: int) -> Generator[Step, None, List[Tuple[int, int]]]:
+        """
+        Partitions the subarray around a pivot moved to its end.
 
         Args:
             low (int): Starting index for the partition.
             high (int): Ending index for the partition.
 
         Returns:
-            int: The partitioning index.
+            List[Tuple[int, int]]: The subarrays left to sort, left to right.
         """
-        pivot = arr[high]
+        yield from move_pivot((yield from choose_pivot(low, high)), high)
+        pivot_value = arr[high]
         i = low - 1
-        messages.append(f"Choosing pivot at index {high} (value {pivot}).")
+        yield VISIT, high, 0, msg.CHOOSE_PIVOT, (high, pivot_value)
         for j in range(low, high):
-            highlights.append([j, high])
-            steps.append(arr.copy())
-            messages.append(f"Comparing index {j} (value {arr[j]}) with pivot index {high} (value {pivot}).")
-            if arr[j] < pivot:
+            yield COMPARE, j, high, msg.COMPARE_PIVOT, (j, arr[j], high, pivot_value)
+            if arr[j] < pivot_value:
                 i += 1
                 arr[i], arr[j] = arr[j], arr[i]
-                steps.append(arr.copy())
-                highlights.append([i, j])
-                messages.append(f"Swapped index {i} (value {arr[i]}) with index {j} (value {arr[j]}).")
+                yield SWAP, i, j, msg.SWAP, (i, arr[i], j, arr[j])
         arr[i + 1], arr[high] = arr[high], arr[i + 1]
-        steps.append(arr.copy())
-        highlights.append([i + 1, high])
-        messages.append(f"Swapped pivot index {i + 1} (value {arr[i + 1]}) with index {high} (value {arr[high]}).")
-        return i + 1
+        yield SWAP, i + 1, high, msg.SWAP_PIVOT, (i + 1, arr[i + 1], high, arr[high])
+        return [(low, i), (i + 2, high)]
+
+    def three_way_partition(low: int, high: int) -> Generator[Step, None, List[Tuple[int, int]]]:
+        """
+        Partitions the subarray into values smaller than, equal to and
+        greater than the pivot (Dijkstra's Dutch national flag scheme).
+        Each element is compared once, three ways.
+
+        Args:
+            low (int): Starting index for the partition.
+            high (int): Ending index for the partition.
 
-    quick_sort_recursive(0, len(arr) - 1)
-    messages.append("Quick Sort completed.")
-    return steps, highlights, messages
+        Returns:
+            List[Tuple[int, int]]: The subarrays left to sort, left to right.
+        """
+        yield from move_pivot((yield from choose_pivot(low, high)), high)
+        pivot_value = arr[high]
+        yield VISIT, high, 0, msg.CHOOSE_PIVOT, (high, pivot_value)
+        lt, i, gt = low, low, high
+        while i <= gt:
+            yield COMPARE, i, i, msg.COMPARE_PIVOT_VALUE, (i, arr[i], pivot_value)
+            if arr[i] < pivot_value:
+                if lt != i:
+                    arr[lt], arr[i] = arr[i], arr[lt]
+                    yield SWAP, lt, i, msg.SWAP, (lt, arr[lt], i, arr[i])
+                lt += 1
+                i += 1
+            elif arr[i] > pivot_value:
+                if i != gt:
+                    arr[i], arr[gt] = arr[gt], arr[i]
+                    yield SWAP, i, gt, msg.SWAP, (i, arr[i], gt, arr[gt])
+                gt -= 1
+            else:
+                i += 1
+        yield NOTE, 0, 0, msg.EQUAL_TO_PIVOT, (lt, gt, pivot_value)
+        return [(low, lt - 1), (gt + 1, high)]
 
+    def dual_pivot_partition(low: int, high: int) -> Generator[Step, None, List[Tuple[int, int]]]:
+        """
+        Partitions the subarray around two pivots p <= q into values below
+        p, values between p and q, and values above q (Yaroslavskiy's scheme).
 
-def merge_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int]], List[str]]:
+        The pivots are the two ends for "last", two random elements for
+        "random", and the elements at one and two thirds of the subarray
+        for the median strategies.
+
+        Args:
+            low (int): Starting index for the partition.
+            high (int): Ending index for the partition.
+
+        Returns:
+            List[Tuple[int, int]]: The subarrays left to sort, left to right.
+        """
+        if pivot == "last":
+            first, second = low, high
+        elif pivot == "random":
+            first, second = rng.sample(range(low, high + 1), 2)
+            yield VISIT, first, 0, msg.RANDOM_PIVOT, (first, arr[first])
+            yield VISIT, second, 0, msg.RANDOM_PIVOT, (second, arr[second])
+        else:
+            third = (high - low) // 3
+            first, second = low + third, high - third
+        yield from move_pivot(first, low)
+        if second == low:
+            second = first
+        yield from move_pivot(second, high)
+        yield COMPARE, low, high, msg.COMPARE, (low, arr[low], high, arr[high])
+        if arr[low] > arr[high]:
+            arr[low], arr[high] = arr[high], arr[low]
+            yield SWAP, low, high, msg.SWAP, (low, arr[low], high, arr[high])
+        p, q = arr[low], arr[high]
+        yield VISIT, low, 0, msg.CHOOSE_PIVOT, (low, p)
+        yield VISIT, high, 0, msg.CHOOSE_PIVOT, (high, q)
+
+        lt, k, gt = low + 1, low + 1, high - 1
+        while k <= gt:
+            yield COMPARE, k, low, msg.COMPARE_PIVOT, (k, arr[k], low, p)
+            if arr[k] < p:
+                if k != lt:
+                    arr[k], arr[lt] = arr[lt], arr[k]
+                    yield SWAP, lt, k, msg.SWAP, (lt, arr[lt], k, arr[k])
+                lt += 1
+            else:
+                yield COMPARE, k, high, msg.COMPARE_PIVOT, (k, arr[k], high, q)
+                if arr[k] > q:
+                    while k < gt:
+                        yield COMPARE, gt, high, msg.COMPARE_PIVOT, (gt, arr[gt], high, q)
+                        if arr[gt] <= q:
+                            break
+                        gt -= 1
+                    if k != gt:
+                        arr[k], arr[gt] = arr[gt], arr[k]
+                        yield SWAP, k, gt, msg.SWAP, (k, arr[k], gt, arr[gt])
+                    gt -= 1
+                    yield COMPARE, k, low, msg.COMPARE_PIVOT, (k, arr[k], low, p)
+                    if arr[k] < p:
+                        if k != lt:
+                            arr[k], arr[lt] = arr[lt], arr[k]
+                            yield SWAP, lt, k, msg.SWAP, (lt, arr[lt], k, arr[k])
+                        lt += 1
+            k += 1
+        lt -= 1
+        gt += 1
+        if lt != low:
+            arr[low], arr[lt] = arr[lt], arr[low]
+            yield SWAP, lt, low, msg.SWAP_PIVOT, (lt, arr[lt], low, arr[low])
+        if gt != high:
+            arr[high], arr[gt] = arr[gt], arr[high]
+            yield SWAP, gt, high, msg.SWAP_PIVOT, (gt, arr[gt], high, arr[high])
+        if p == q:
+            # Everything between the pivots equals them and is already in place.
+            return [(low, lt - 1), (gt + 1, high)]
+        return [(low, lt - 1), (lt + 1, gt - 1), (gt + 1, high)]
+
+    partition_range = {
+        "lomuto": lomuto_partition,
+        "three-way": three_way_partition,
+        "dual-pivot": dual_pivot_partition,
+    }[partition]
+
+    # (low, high, depth) of the subarrays still to sort; the last one pushed is sorted next.
+    stack = [(0, len(arr) - 1, 1)]
+    while stack:
+        low, high, depth = stack.pop()
+        if stats is not None and depth > stats["max_depth"]:
+            stats["max_depth"] = depth
+        if low < high:
+            ranges = yield from partition_range(low, high)
+            # Parts with fewer than two elements are never pushed, which keeps
+            # the stack at O(log n) entries on sorted input, but they still
+            # count as one level deeper, as recursive calls on them would.
+            if stats is not None and depth + 1 > stats["max_depth"]:
+                stats["max_depth"] = depth + 1
+            if smaller_first:
+                ranges = sorted(ranges, key=lambda bounds: bounds[1] - bounds[0])
+            stack.extend((start, end, depth + 1) for start, end in reversed(ranges) if start < end)
+    yield NOTE, 0, 0, msg.QUICK_SORT_COMPLETED, ()
+
+
+def count_quick_sort(arr: List[int], smaller_first: bool = False, pivot: str = "last",
+                     partition: str = "lomuto", seed: Optional[int] = None) -> Dict[str, int]:
     """
-    Performs Merge Sort on the input array.
+    Sorts the input array in place with Quick Sort, without tracing.
+
+    Args:
+        arr (List[int]): The array to sort.
+        smaller_first (bool): Sort the smaller side of each partition first.
+        pivot (str): One of PIVOT_STRATEGIES.
+        partition (str): One of PARTITION_SCHEMES.
+        seed (Optional[int]): Seed for the "random" pivot strategy; the
+            same seed picks the same pivots as iter_quick_sort.
+
+    Returns:
+        Dict[str, int]: The operation counts of iter_quick_sort's steps and
+        its "max_depth".
+    """
+    if pivot not in PIVOT_STRATEGIES:
+        raise ValueError(f"Unknown pivot strategy {pivot!r}; expected one of {PIVOT_STRATEGIES}.")
+    if partition not in PARTITION_SCHEMES:
+        raise ValueError(f"Unknown partition scheme {partition!r}; expected one of {PARTITION_SCHEMES}.")
+    rng = random.Random(seed)
+    notes = visits = compares = swaps = max_depth = 0
+
+    def median_of_three(i: int, j: int, k: int) -> int:
+        """Returns which of three indices holds the median value."""
+        nonlocal visits, compares
+        low, high = (i, j) if arr[i] <= arr[j] else (j, i)
+        compares += 2
+        if arr[high] <= arr[k]:
+            median = high
+        else:
+            compares += 1
+            median = k if arr[low] <= arr[k] else low
+        visits += 1
+        return median
+
+    def choose_pivot(low: int, high: int) -> int:
+        """Returns the index of the pivot of arr[low..high]."""
+        nonlocal visits
+        if pivot == "random":
+            visits += 1
+            return rng.randint(low, high)
+        if pivot == "last" or high - low < 2:
+            return high
+        mid = (low + high) // 2
+        if pivot == "median-of-three" or high - low < 8:
+            return median_of_three(low, mid, high)
+        step = (high - low) // 8
+        first = median_of_three(low, low + step, low + 2 * step)
+        second = median_of_three(mid - step, mid, mid + step)
+        third = median_of_three(high - 2 * step, high - step, high)
+        return median_of_three(first, second, third)
+
+    def move_pivot(index: int, target: int):
+        """Swaps a chosen pivot to where the partition scheme expects it."""
+        nonlocal swaps
+        if index != target:
+            arr[index], arr[target] = arr[target], arr[index]
+            swaps += 1
+
+    def lomuto_partition(low: int, high: int) -> List[Tuple[int, int]]:
+        """Partitions arr[low..high] around a pivot moved to its end."""
+        nonlocal visits, compares, swaps
+        move_pivot(choose_pivot(low, high), high)
+        pivot_value = arr[high]
+        i = low - 1
+        visits += 1
+        compares += high - low
+        for j in range(low, high):
+            if arr[j] < pivot_value:
+                i += 1
+                arr[i], arr[j] = arr[j], arr[i]
+        swaps += i - low + 2
+        arr[i + 1], arr[high] = arr[high], arr[i + 1]
+        return [(low, i), (i + 2, high)]
+
+    def three_way_partition(low: int, high: int) -> List[Tuple[int, int]]:
+        """Partitions arr[low..high] into values below, equal to and above the pivot."""
+        nonlocal notes, visits, compares, swaps
+        move_pivot(choose_pivot(low, high), high)
+        pivot_value = arr[high]
+        visits += 1
+        lt, i, gt = low, low, high
+        while i <= gt:
+            compares += 1
+            if arr[i] < pivot_value:
+                if lt != i:
+                    arr[lt], arr[i] = arr[i], arr[lt]
+                    swaps += 1
+                lt += 1
+                i += 1
+            elif arr[i] > pivot_value:
+                if i != gt:
+                    arr[i], arr[gt] = arr[gt], arr[i]
+                    swaps += 1
+                gt -= 1
+            else:
+                i += 1
+        notes += 1
+        return [(low, lt - 1), (gt + 1, high)]
+
+    def dual_pivot_partition(low: int, high: int) -> List[Tuple[int, int]]:
+        """Partitions arr[low..high] around two pivots p <= q."""
+        nonlocal visits, compares, swaps
+        if pivot == "last":
+            first, second = low, high
+        elif pivot == "random":
+            first, second = rng.sample(range(low, high + 1), 2)
+            visits += 2
+        else:
+            third = (high - low) // 3
+            first, second = low + third, high - third
+        move_pivot(first, low)
+        if second == low:
+            second = first
+        move_pivot(second, high)
+        compares += 1
+        if arr[low] > arr[high]:
+            arr[low], arr[high] = arr[high], arr[low]
+            swaps += 1
+        p, q = arr[low], arr[high]
+        visits += 2
+
+        lt, k, gt = low + 1, low + 1, high - 1
+        while k <= gt:
+            compares += 1
+            if arr[k] < p:
+                if k != lt:
+                    arr[k], arr[lt] = arr[lt], arr[k]
+                    swaps += 1
+                lt += 1
+            else:
+                compares += 1
+                if arr[k] > q:
+                    while k < gt:
+                        compares += 1
+                        if arr[gt] <= q:
+                            break
+                        gt -= 1
+                    if k != gt:
+                        arr[k], arr[gt] = arr[gt], arr[k]
+                        swaps += 1
+                    gt -= 1
+                    compares += 1
+                    if arr[k] < p:
+                        if k != lt:
+                            arr[k], arr[lt] = arr[lt], arr[k]
+                            swaps += 1
+                        lt += 1
+            k += 1
+        lt -= 1
+        gt += 1
+        if lt != low:
+            arr[low], arr[lt] = arr[lt], arr[low]
+            swaps += 1
+        if gt != high:
+            arr[high], arr[gt] = arr[gt], arr[high]
+            swaps += 1
+        if p == q:
+            return [(low, lt - 1), (gt + 1, high)]
+        return [(low, lt - 1), (lt + 1, gt - 1), (gt + 1, high)]
+
+    partition_range = {
+        "lomuto": lomuto_partition,
+        "three-way": three_way_partition,
+        "dual-pivot": dual_pivot_partition,
+    }[partition]
+
+    stack = [(0, len(arr) - 1, 1)]
+    while stack:
+        low, high, depth = stack.pop()
+        if depth > max_depth:
+            max_depth = depth
+        if low < high:
+            ranges = partition_range(low, high)
+            if depth + 1 > max_depth:
+                max_depth = depth + 1
+            if smaller_first:
+                ranges = sorted(ranges, key=lambda bounds: bounds[1] - bounds[0])
+            stack.extend((start, end, depth + 1) for start, end in reversed(ranges) if start < end)
+    return _counters(notes + 1, visits, compares, swaps, 0, max_depth)
+
+
+def quick_sort(arr: List[int], stream: bool = False, level: str = "full", smaller_first: bool = False,
+               pivot: str = "last", partition: str = "lomuto", seed: Optional[int] = None,
+               **trace_options) -> SortOutput:
+    """
+    Performs Quick Sort on the input array.
 
     Args:
         arr (List[int]): The array to sort.
+        stream (bool): If True, steps are generated lazily as the returned
+            views are filled instead of sorting the whole array up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        smaller_first (bool): Sort the smaller side of each partition first,
+            keeping the pending-subarray stack at O(log n) entries.
+        pivot (str): Pivot strategy: "last", "median-of-three", "random" or "ninther".
+        partition (str): Partition scheme: "lomuto", "three-way" or "dual-pivot".
+        seed (Optional[int]): Seed for the "random" pivot strategy.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
 
     Returns:
-        Tuple[List[List[int]], List[List[int]], List[str]]:
-            - steps: List of array states after each merge operation.
-            - highlights: List of indices to highlight at each step.
-            - messages: List of descriptive messages for each merge operation.
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each operation.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    stats = {"max_depth": 0}
+    steps = iter_quick_sort(arr, stats, smaller_first, pivot, partition, seed)
+    counted = partial(count_quick_sort, arr, smaller_first, pivot, partition, seed)
+    return _run(arr, steps, stream, level, stats, counted=counted, **trace_options)
+
+
+def iter_merge_sort(arr: List[int], stats: Optional[Dict[str, int]] = None,
+                    bottom_up: bool = False) -> Iterator[Step]:
     """
-    steps = []
-    highlights = []
-    messages = []
-    steps.append(arr.copy())
-    highlights.append([])
-    messages.append("Initial array")
+    Sorts the input array in place with Merge Sort, yielding each step.
+
+    Every merge copies only its left run into one auxiliary buffer allocated
+    up front and reads the right run in place, so no lists are allocated
+    while sorting.
+
+    Args:
+        arr (List[int]): The array to sort.
+        stats (Optional[Dict[str, int]]): If given, "max_depth" is updated
+            with the deepest recursion level reached.
+        bottom_up (bool): If True, merge runs of width 1, 2, 4, ... from the
+            left instead of recursing. When the length is a power of two
+            the merges are the recursive ones, done level by level.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
+    # A left run is at most half the array, except in the last bottom-up pass.
+    aux = [0] * (len(arr) if bottom_up else len(arr) // 2)
+
+    def merge(start: int, mid: int, end: int) -> Iterator[Step]:
+        """
+        Merges the sorted runs arr[start:mid] and arr[mid:end].
+
+        Args:
+            start (int): The starting index of the left run.
+            mid (int): The starting index of the right run.
+            end (int): The index one past the end of the right run.
+        """
+        left_length = mid - start
+        for offset in range(left_length):
+            aux[offset] = arr[start + offset]
+
+        # The write position k never passes the right run's read position j,
+        # so reading the right run in place is safe.
+        i, j, k = 0, mid, start
+        while i < left_length and j < end:
+            left, right = aux[i], arr[j]
+            yield COMPARE, k, k, msg.MERGE_COMPARE, (left, right)
+            if left < right:
+                arr[k] = left
+                yield WRITE, k, left, msg.PLACED_LEFT, (left, k)
+                i += 1
+            else:
+                arr[k] = right
+                yield WRITE, k, right, msg.PLACED_RIGHT, (right, k)
+                j += 1
+            k += 1
+
+        while i < left_length:
+            arr[k] = aux[i]
+            yield WRITE, k, aux[i], msg.PLACED_LEFT, (aux[i], k)
+            i += 1
+            k += 1
+
+        while j < end:
+            arr[k] = arr[j]
+            yield WRITE, k, arr[j], msg.PLACED_RIGHT, (arr[j], k)
+            j += 1
+            k += 1
+
+        yield NOTE, 0, 0, msg.MERGED, (start, end - 1)
 
-    def merge_sort_recursive(sub_arr: List[int], start: int):
+    def merge_sort_recursive(start: int, end: int, depth: int = 1) -> Iterator[Step]:
         """
         Recursively divides and merges the array.
 
         Args:
-            sub_arr (List[int]): The subarray to sort.
-            start (int): The starting index of the subarray in the original array.
-        """
-        if len(sub_arr) > 1:
-            mid = len(sub_arr) // 2
-            left_half = sub_arr[:mid]
-            right_half = sub_arr[mid:]
-
-            merge_sort_recursive(left_half, start)
-            merge_sort_recursive(right_half, start + mid)
-
-            i = j = k = 0
-
-            while i < len(left_half) and j < len(right_half):
-                highlights.append([start + k])
-                steps.append(arr.copy())
-                messages.append(f"Merging: Comparing {left_half[i]} (left) with {right_half[j]} (right).")
-                if left_half[i] < right_half[j]:
-                    arr[start + k] = left_half[i]
-                    messages.append(f"Placed {left_half[i]} from left into position {start + k}.")
-                    i += 1
+            start (int): The starting index of the subarray.
+            end (int): The index one past the end of the subarray.
+            depth (int): Current recursion depth.
+        """
+        if stats is not None and depth > stats["max_depth"]:
+            stats["max_depth"] = depth
+        if end - start > 1:
+            mid = start + (end - start) // 2
+            yield from merge_sort_recursive(start, mid, depth + 1)
+            yield from merge_sort_recursive(mid, end, depth + 1)
+            yield from merge(start, mid, end)
+
+    if bottom_up:
+        if stats is not None:
+            stats["max_depth"] = max(stats["max_depth"], 1)
+        n = len(arr)
+        width = 1
+        while width < n:
+            for start in range(0, n - width, 2 * width):
+                yield from merge(start, start + width, min(start + 2 * width, n))
+            width *= 2
+    else:
+        yield from merge_sort_recursive(0, len(arr))
+    yield NOTE, 0, 0, msg.MERGE_SORT_COMPLETED, ()
+
+
+def count_merge_sort(arr: List[int], bottom_up: bool = False) -> Dict[str, int]:
+    """
+    Sorts the input array in place with Merge Sort, without tracing.
+
+    Args:
+        arr (List[int]): The array to sort.
+        bottom_up (bool): Merge runs of doubling width instead of recursing.
+
+    Returns:
+        Dict[str, int]: The operation counts of iter_merge_sort's steps and
+        its "max_depth".
+    """
+    n = len(arr)
+    aux = [0] * (n if bottom_up else n // 2)
+    notes = compares = writes = max_depth = 0
+
+    def merge(start: int, mid: int, end: int):
+        """Merges the sorted runs arr[start:mid] and arr[mid:end]."""
+        nonlocal notes, compares, writes
+        left_length = mid - start
+        aux[:left_length] = arr[start:mid]
+        i, j, k = 0, mid, start
+        while i < left_length and j < end:
+            left, right = aux[i], arr[j]
+            if left < right:
+                arr[k] = left
+                i += 1
+            else:
+                arr[k] = right
+                j += 1
+            k += 1
+        compares += k - start
+        # What remains of the right run is already in place.
+        arr[k:k + left_length - i] = aux[i:left_length]
+        writes += end - start
+        notes += 1
+
+    def merge_sort_recursive(start: int, end: int, depth: int = 1):
+        """Recursively divides and merges arr[start:end]."""
+        nonlocal max_depth
+        if depth > max_depth:
+            max_depth = depth
+        if end - start > 1:
+            mid = start + (end - start) // 2
+            merge_sort_recursive(start, mid, depth + 1)
+            merge_sort_recursive(mid, end, depth + 1)
+            merge(start, mid, end)
+
+    if bottom_up:
+        max_depth = 1
+        width = 1
+        while width < n:
+            for start in range(0, n - width, 2 * width):
+                merge(start, start + width, min(start + 2 * width, n))
+            width *= 2
+    else:
+        merge_sort_recursive(0, n)
+    return _counters(notes + 1, 0, compares, 0, writes, max_depth)
+
+
+def merge_sort(arr: List[int], stream: bool = False, level: str = "full", bottom_up: bool = False,
+               **trace_options) -> SortOutput:
+    """
+    Performs Merge Sort on the input array.
+
+    Args:
+        arr (List[int]): The array to sort.
+        stream (bool): If True, steps are generated lazily as the returned
+            views are filled instead of sorting the whole array up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        bottom_up (bool): Merge iteratively in runs of doubling width instead
+            of recursing.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
+
+    Returns:
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each merge operation.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    stats = {"max_depth": 0}
+    return _run(arr, iter_merge_sort(arr, stats, bottom_up), stream, level, stats,
+                counted=partial(count_merge_sort, arr, bottom_up), **trace_options)
+
+
+def iter_stitched_chunks(arr: List[int], bounds: Sequence[Tuple[int, int]], traces: Sequence[Trace]) -> Iterator[Step]:
+    """
+    Replays the traces of separately sorted chunks onto the whole array, yielding each step.
+
+    Args:
+        arr (List[int]): The whole array, in its initial state. Each chunk
+            ends up sorted in place.
+        bounds (Sequence[Tuple[int, int]]): (start, end) of each chunk.
+        traces (Sequence[Trace]): The trace of each chunk, recorded with
+            indices relative to the chunk.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The chunk steps with
+        global indices, followed by a note for each finished chunk.
+    """
+    for chunk, ((start, end), trace) in enumerate(zip(bounds, traces)):
+        # Step 0 is the chunk's initial state and the last step its completion note.
+        for step in trace.records(1, len(trace) - 1):
+            step = shift_step(step, start)
+            op, a, b = step[:3]
+            if op == SWAP:
+                arr[a], arr[b] = arr[b], arr[a]
+            elif op == WRITE:
+                arr[a] = b
+            yield step
+        yield NOTE, 0, 0, msg.CHUNK_SORTED, (chunk, start, end - 1)
+
+
+def iter_k_way_merge(arr: List[int], bounds: Sequence[Tuple[int, int]]) -> Iterator[Step]:
+    """
+    Merges consecutive sorted chunks of the array in place, yielding each step.
+
+    A binary min-heap of chunks, keyed by their next value, picks the chunk
+    to take from; ties go to the earlier chunk, so the merge is stable.
+    Every heap comparison is recorded as one COMPARE step between the
+    positions of the two chunk heads.
+
+    Args:
+        arr (List[int]): The array; arr[start:end] is sorted for every chunk.
+        bounds (Sequence[Tuple[int, int]]): (start, end) of each chunk,
+            covering the array in order.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
+    yield NOTE, 0, 0, msg.K_WAY_MERGE, (len(bounds),)
+    aux = list(arr)
+    heads = [start for start, end in bounds]
+    ends = [end for start, end in bounds]
+    heap = [chunk for chunk, (start, end) in enumerate(bounds) if start < end]
+
+    def comes_first(x: int, y: int) -> Iterator[Step]:
+        """Returns whether the head of chunk x is merged before the head of chunk y."""
+        value_x, value_y = aux[heads[x]], aux[heads[y]]
+        yield COMPARE, heads[x], heads[y], msg.K_WAY_COMPARE, (value_x, x, value_y, y)
+        return value_x < value_y or (x < y and not value_y < value_x)
+
+    def sift_down(position: int) -> Iterator[Step]:
+        """Moves the chunk at heap position `position` down to its place."""
+        while True:
+            child = 2 * position + 1
+            if child >= len(heap):
+                return
+            if child + 1 < len(heap) and (yield from comes_first(heap[child + 1], heap[child])):
+                child += 1
+            if not (yield from comes_first(heap[child], heap[position])):
+                return
+            heap[position], heap[child] = heap[child], heap[position]
+            position = child
+
+    for position in reversed(range(len(heap) // 2)):
+        yield from sift_down(position)
+    for index in range(len(arr)):
+        chunk = heap[0]
+        arr[index] = aux[heads[chunk]]
+        heads[chunk] += 1
+        yield WRITE, index, arr[index], msg.TAKE_FROM_CHUNK, (arr[index], chunk, index)
+        if heads[chunk] == ends[chunk]:
+            last = heap.pop()
+            if not heap:
+                break
+            heap[0] = last
+        yield from sift_down(0)
+
+
+def count_k_way_merge(arr: List[int], bounds: Sequence[Tuple[int, int]]) -> Dict[str, int]:
+    """
+    Merges consecutive sorted chunks of the array in place, without tracing.
+
+    Args:
+        arr (List[int]): The array; arr[start:end] is sorted for every chunk.
+        bounds (Sequence[Tuple[int, int]]): (start, end) of each chunk,
+            covering the array in order.
+
+    Returns:
+        Dict[str, int]: The operation counts of iter_k_way_merge's steps.
+    """
+    aux = list(arr)
+    heads = [start for start, end in bounds]
+    ends = [end for start, end in bounds]
+    heap = [chunk for chunk, (start, end) in enumerate(bounds) if start < end]
+    compares = 0
+
+    def comes_first(x: int, y: int) -> bool:
+        """Returns whether the head of chunk x is merged before the head of chunk y."""
+        nonlocal compares
+        compares += 1
+        value_x, value_y = aux[heads[x]], aux[heads[y]]
+        return value_x < value_y or (x < y and not value_y < value_x)
+
+    def sift_down(position: int):
+        """Moves the chunk at heap position `position` down to its place."""
+        while True:
+            child = 2 * position + 1
+            if child >= len(heap):
+                return
+            if child + 1 < len(heap) and comes_first(heap[child + 1], heap[child]):
+                child += 1
+            if not comes_first(heap[child], heap[position]):
+                return
+            heap[position], heap[child] = heap[child], heap[position]
+            position = child
+
+    for position in reversed(range(len(heap) // 2)):
+        sift_down(position)
+    for index in range(len(arr)):
+        chunk = heap[0]
+        arr[index] = aux[heads[chunk]]
+        heads[chunk] += 1
+        if heads[chunk] == ends[chunk]:
+            last = heap.pop()
+            if not heap:
+                break
+            heap[0] = last
+        sift_down(0)
+    return _counters(1, compares=compares, writes=len(arr))
+
+
+def parallel_merge_sort(arr: List[int], stream: bool = False, level: str = "full", processes: Optional[int] = None,
+                        bottom_up: bool = False, **trace_options) -> SortOutput:
+    """
+    Performs Merge Sort on the input array with a process pool.
+
+    The array is split into one chunk per process. Workers merge sort their
+    chunk from shared memory and send back only its trace (or counters);
+    the parent stitches the chunk traces into one trace with global indices
+    and then records a k-way merge of the chunks. With level="none" the
+    chunks are merged with heapq.merge instead.
+
+    Args:
+        arr (List[int]): The array to sort.
+        stream (bool): If True, the stitched steps are generated lazily as
+            the returned views are filled. The chunks are always sorted up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        processes (Optional[int]): Number of worker processes and chunks.
+            Defaults to the CPU count.
+        bottom_up (bool): Sort the chunks with bottom-up merge sort.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
+            The workers only use the backend.
+
+    Returns:
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each operation.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    if level not in RECORDING_LEVELS:
+        raise ValueError(f"Unknown recording level {level!r}; expected one of {RECORDING_LEVELS}.")
+    n = len(arr)
+    chunks = max(1, min(processes or os.cpu_count() or 1, n))
+    bounds = [(n * chunk // chunks, n * (chunk + 1) // chunks) for chunk in range(chunks)]
+    worker_options = {"backend": trace_options["backend"]} if "backend" in trace_options else {}
+    sorted_chunks, results = sort_chunks(partial(merge_sort, bottom_up=bottom_up), arr, bounds, processes,
+                                         level, **worker_options)
+
+    if level == "none":
+        arr[:] = heapq.merge(*(sorted_chunks[start:end] for start, end in bounds))
+        return None
+    if level == "counters":
+        arr[:] = sorted_chunks
+        counts = count_k_way_merge(arr, bounds)
+        counts["notes"] += 1
+        for result in results:
+            for name, count in result.items():
+                counts[name] = max(counts[name], count) if name == "max_depth" else counts[name] + count
+        return counts
+
+    steps = chain(iter_stitched_chunks(arr, bounds, results), iter_k_way_merge(arr, bounds),
+                  [(NOTE, 0, 0, msg.PARALLEL_MERGE_SORT_COMPLETED, ())])
+    return _run(arr, steps, stream, level, **trace_options)
+
+
+# Consecutive wins of one run in a Timsort merge before switching to galloping.
+MIN_GALLOP = 7
+
+
+def min_run_length(n: int) -> int:
+    """
+    Computes the Timsort minimum run length for an array of length n.
+
+    The result lies in [32, 64] for n >= 64 and is chosen so that n / minrun
+    is a power of two or slightly below one, keeping the final merges balanced.
+
+    Args:
+        n (int): Length of the array.
+
+    Returns:
+        int: The minimum run length.
+    """
+    extra = 0
+    while n >= 64:
+        extra |= n & 1
+        n >>= 1
+    return n + extra
+
+
+def iter_timsort(arr: List[int], stats: Optional[Dict[str, int]] = None) -> Iterator[Step]:
+    """
+    Sorts the input array in place with Timsort, yielding each step.
+
+    The array is split into natural runs; descending runs are reversed and
+    runs shorter than the minimum run length are extended with binary
+    insertion sort. Runs are pushed on a stack whose lengths are kept
+    growing faster than the Fibonacci numbers by merging, and merges gallop
+    (search exponentially) once one run keeps winning. Every element
+    comparison is recorded as one COMPARE step.
+
+    Merges always buffer the left run and fill the array from the left; the
+    right-to-left merge that Timsort uses when the right run is shorter only
+    saves buffer space and is omitted.
+
+    Args:
+        arr (List[int]): The array to sort.
+        stats (Optional[Dict[str, int]]): If given, "max_depth" is updated
+            with the largest number of pending runs on the stack.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
+    n = len(arr)
+    runs: List[Tuple[int, int]] = []  # (start, length) of the pending runs
+    aux: List[int] = []
+    min_gallop = MIN_GALLOP
+
+    def count_run(start: int) -> Iterator[Step]:
+        """
+        Finds the run starting at `start`, reversing it if it is strictly
+        descending, and returns its length.
+        """
+        end = start + 1
+        if end == n:
+            yield VISIT, start, 0, msg.RUN_FOUND, (start, start)
+            return 1
+        yield COMPARE, end, end - 1, msg.COMPARE, (end, arr[end], end - 1, arr[end - 1])
+        descending = arr[end] < arr[end - 1]
+        end += 1
+        while end < n:
+            yield COMPARE, end, end - 1, msg.COMPARE, (end, arr[end], end - 1, arr[end - 1])
+            if (arr[end] < arr[end - 1]) != descending:
+                break
+            end += 1
+        if descending:
+            yield NOTE, 0, 0, msg.DESCENDING_RUN, (start, end - 1)
+            i, j = start, end - 1
+            while i < j:
+                arr[i], arr[j] = arr[j], arr[i]
+                yield SWAP, i, j, msg.SWAP, (i, arr[i], j, arr[j])
+                i += 1
+                j -= 1
+        yield NOTE, 0, 0, msg.RUN_FOUND, (start, end - 1)
+        return end - start
+
+    def binary_insertion(start: int, end: int, sorted_end: int) -> Iterator[Step]:
+        """
+        Extends the sorted prefix arr[start:sorted_end] to arr[start:end].
+        """
+        for i in range(sorted_end, end):
+            key = arr[i]
+            yield VISIT, i, 0, msg.INSERTING, (i, key)
+            low, high = start, i
+            while low < high:
+                mid = (low + high) // 2
+                yield COMPARE, i, mid, msg.BINARY_SEARCH, (key, mid, arr[mid])
+                if key < arr[mid]:
+                    high = mid
                 else:
-                    arr[start + k] = right_half[j]
-                    messages.append(f"Placed {right_half[j]} from right into position {start + k}.")
+                    low = mid + 1
+            for j in range(i, low, -1):
+                arr[j] = arr[j - 1]
+                yield WRITE, j, arr[j], msg.MOVED, (arr[j], j - 1, j)
+            arr[low] = key
+            yield WRITE, low, key, msg.INSERTED_KEY, (key, low)
+
+    def gallop(key: int, values: List[int], start: int, length: int, after_equal: bool,
+               home: int) -> Iterator[Step]:
+        """
+        Returns how many of values[start:start + length] (sorted) go before
+        `key`: those smaller than it, and also those equal to it when
+        `after_equal` is set. Probes offsets 0, 1, 3, 7, ... and then binary
+        searches the last gap. `home` is the array index highlighted for
+        offset 0.
+        """
+        def goes_before(value: int) -> bool:
+            return not key < value if after_equal else value < key
+
+        last, probe = -1, 0
+        while probe < length:
+            value = values[start + probe]
+            yield COMPARE, home + probe, home + probe, msg.GALLOP_COMPARE, (key, value, home + probe)
+            if not goes_before(value):
+                break
+            last, probe = probe, 2 * probe + 1
+        low, high = last + 1, min(probe, length)
+        while low < high:
+            mid = (low + high) // 2
+            value = values[start + mid]
+            yield COMPARE, home + mid, home + mid, msg.GALLOP_COMPARE, (key, value, home + mid)
+            if goes_before(value):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def merge_low(start_a: int, length_a: int, start_b: int, length_b: int) -> Iterator[Step]:
+        """
+        Merges two adjacent runs, buffering the left one in aux.
+        """
+        nonlocal min_gallop
+        if len(aux) < length_a:
+            aux.extend([0] * (length_a - len(aux)))
+        for offset in range(length_a):
+            aux[offset] = arr[start_a + offset]
+
+        # The write position k never passes the right run's read position j.
+        i, j, k = 0, start_b, start_a
+        end_b = start_b + length_b
+        while i < length_a and j < end_b:
+            wins_a = wins_b = 0
+            while i < length_a and j < end_b and wins_a < min_gallop and wins_b < min_gallop:
+                yield COMPARE, k, k, msg.MERGE_COMPARE, (aux[i], arr[j])
+                if arr[j] < aux[i]:
+                    arr[k] = arr[j]
+                    yield WRITE, k, arr[k], msg.PLACED_RIGHT, (arr[k], k)
                     j += 1
+                    wins_a, wins_b = 0, wins_b + 1
+                else:
+                    arr[k] = aux[i]
+                    yield WRITE, k, arr[k], msg.PLACED_LEFT, (arr[k], k)
+                    i += 1
+                    wins_a, wins_b = wins_a + 1, 0
                 k += 1
 
-            while i < len(left_half):
-                arr[start + k] = left_half[i]
-                highlights.append([start + k])
-                steps.append(arr.copy())
-                messages.append(f"Placed {left_half[i]} from left into position {start + k}.")
+            # One run keeps winning: copy whole stretches found by galloping
+            # until both stretches are shorter than MIN_GALLOP again.
+            min_gallop += 1
+            while i < length_a and j < end_b:
+                min_gallop -= min_gallop > 1
+                yield NOTE, 0, 0, msg.GALLOP_MODE, (min_gallop,)
+                wins_a = yield from gallop(arr[j], aux, i, length_a - i, True, start_a + i)
+                for _ in range(wins_a):
+                    arr[k] = aux[i]
+                    yield WRITE, k, arr[k], msg.PLACED_LEFT, (arr[k], k)
+                    i += 1
+                    k += 1
+                if i == length_a:
+                    break
+                arr[k] = arr[j]
+                yield WRITE, k, arr[k], msg.PLACED_RIGHT, (arr[k], k)
+                j += 1
+                k += 1
+                if j == end_b:
+                    break
+                wins_b = yield from gallop(aux[i], arr, j, end_b - j, False, j)
+                for _ in range(wins_b):
+                    arr[k] = arr[j]
+                    yield WRITE, k, arr[k], msg.PLACED_RIGHT, (arr[k], k)
+                    j += 1
+                    k += 1
+                if j == end_b:
+                    break
+                arr[k] = aux[i]
+                yield WRITE, k, arr[k], msg.PLACED_LEFT, (arr[k], k)
                 i += 1
                 k += 1
+                if wins_a < MIN_GALLOP and wins_b < MIN_GALLOP:
+                    break
+            min_gallop += 1
+
+        # Whatever remains of the right run is already in place.
+        while i < length_a:
+            arr[k] = aux[i]
+            yield WRITE, k, arr[k], msg.PLACED_LEFT, (arr[k], k)
+            i += 1
+            k += 1
+
+    def merge_at(index: int) -> Iterator[Step]:
+        """
+        Merges the pending runs at stack positions index and index + 1.
+        """
+        start_a, length_a = runs[index]
+        start_b, length_b = runs[index + 1]
+        runs[index:index + 2] = [(start_a, length_a + length_b)]
+        end = start_b + length_b
+        yield NOTE, 0, 0, msg.MERGE_RUNS, (start_a, start_b - 1, start_b, end - 1)
+
+        # Elements of the left run not above the right run's first element,
+        # and elements of the right run not below the left run's last one,
+        # already sit in their final place.
+        skipped = yield from gallop(arr[start_b], arr, start_a, length_a, True, start_a)
+        if skipped:
+            yield NOTE, 0, 0, msg.ALREADY_PLACED, (start_a, start_a + skipped - 1)
+        merge_start = start_a + skipped
+        length_a -= skipped
+        if length_a:
+            length_b = yield from gallop(arr[start_b - 1], arr, start_b, length_b, False, start_b)
+            if start_b + length_b < end:
+                yield NOTE, 0, 0, msg.ALREADY_PLACED, (start_b + length_b, end - 1)
+            if length_b:
+                yield from merge_low(merge_start, length_a, start_b, length_b)
+        yield NOTE, 0, 0, msg.MERGED, (start_a, end - 1)
+
+    def merge_collapse() -> Iterator[Step]:
+        """
+        Merges pending runs until, from the top of the stack down, every run
+        is longer than the next two together and than the next one.
+        """
+        while len(runs) > 1:
+            top = len(runs) - 2
+            if ((top > 0 and runs[top - 1][1] <= runs[top][1] + runs[top + 1][1])
+                    or (top > 1 and runs[top - 2][1] <= runs[top - 1][1] + runs[top][1])):
+                if runs[top - 1][1] < runs[top + 1][1]:
+                    top -= 1
+            elif runs[top][1] > runs[top + 1][1]:
+                break
+            yield from merge_at(top)
+
+    min_run = min_run_length(n)
+    yield NOTE, 0, 0, msg.MIN_RUN, (min_run,)
+    start = 0
+    while start < n:
+        length = yield from count_run(start)
+        if length < min_run:
+            forced = min(min_run, n - start)
+            yield from binary_insertion(start, start + forced, start + length)
+            length = forced
+        runs.append((start, length))
+        if stats is not None and len(runs) > stats["max_depth"]:
+            stats["max_depth"] = len(runs)
+        yield NOTE, 0, 0, msg.RUN_PUSHED, (start, start + length - 1, len(runs))
+        yield from merge_collapse()
+        start += length
+
+    while len(runs) > 1:
+        top = len(runs) - 2
+        if top > 0 and runs[top - 1][1] < runs[top + 1][1]:
+            top -= 1
+        yield from merge_at(top)
+    yield NOTE, 0, 0, msg.TIMSORT_COMPLETED, ()
+
+
+def count_timsort(arr: List[int]) -> Dict[str, int]:
+    """
+    Sorts the input array in place with Timsort, without tracing.
 
-            while j < len(right_half):
-                arr[start + k] = right_half[j]
-                highlights.append([start + k])
-                steps.append(arr.copy())
-                messages.append(f"Placed {right_half[j]} from right into position {start + k}.")
+    Args:
+        arr (List[int]): The array to sort.
+
+    Returns:
+        Dict[str, int]: The operation counts of iter_timsort's steps and
+        its "max_depth".
+    """
+    n = len(arr)
+    runs: List[Tuple[int, int]] = []
+    aux: List[int] = []
+    min_gallop = MIN_GALLOP
+    notes = visits = compares = swaps = writes = max_depth = 0
+
+    def count_run(start: int) -> int:
+        """Returns the length of the run at `start`, reversing it if it is strictly descending."""
+        nonlocal notes, visits, compares, swaps
+        end = start + 1
+        if end == n:
+            visits += 1
+            return 1
+        compares += 1
+        descending = arr[end] < arr[end - 1]
+        end += 1
+        while end < n:
+            compares += 1
+            if (arr[end] < arr[end - 1]) != descending:
+                break
+            end += 1
+        if descending:
+            notes += 1
+            arr[start:end] = arr[end - 1:start - 1 if start else None:-1]
+            swaps += (end - start) // 2
+        notes += 1
+        return end - start
+
+    def binary_insertion(start: int, end: int, sorted_end: int):
+        """Extends the sorted prefix arr[start:sorted_end] to arr[start:end]."""
+        nonlocal visits, compares, writes
+        for i in range(sorted_end, end):
+            key = arr[i]
+            low, high = start, i
+            while low < high:
+                mid = (low + high) // 2
+                compares += 1
+                if key < arr[mid]:
+                    high = mid
+                else:
+                    low = mid + 1
+            arr[low + 1:i + 1] = arr[low:i]
+            arr[low] = key
+            writes += i - low + 1
+        visits += end - sorted_end
+
+    def gallop(key: int, values: List[int], start: int, length: int, after_equal: bool) -> int:
+        """Returns how many of values[start:start + length] go before `key`."""
+        nonlocal compares
+        last, probe = -1, 0
+        while probe < length:
+            value = values[start + probe]
+            compares += 1
+            if (key < value) if after_equal else not (value < key):
+                break
+            last, probe = probe, 2 * probe + 1
+        low, high = last + 1, min(probe, length)
+        while low < high:
+            mid = (low + high) // 2
+            value = values[start + mid]
+            compares += 1
+            if (not key < value) if after_equal else (value < key):
+                low = mid + 1
+            else:
+                high = mid
+        return low
+
+    def merge_low(start_a: int, length_a: int, start_b: int, length_b: int):
+        """Merges two adjacent runs, buffering the left one in aux."""
+        nonlocal min_gallop, notes, compares, writes
+        if len(aux) < length_a:
+            aux.extend([0] * (length_a - len(aux)))
+        aux[:length_a] = arr[start_a:start_a + length_a]
+
+        i, j, k = 0, start_b, start_a
+        end_b = start_b + length_b
+        while i < length_a and j < end_b:
+            wins_a = wins_b = 0
+            while i < length_a and j < end_b and wins_a < min_gallop and wins_b < min_gallop:
+                compares += 1
+                if arr[j] < aux[i]:
+                    arr[k] = arr[j]
+                    j += 1
+                    wins_a, wins_b = 0, wins_b + 1
+                else:
+                    arr[k] = aux[i]
+                    i += 1
+                    wins_a, wins_b = wins_a + 1, 0
+                k += 1
+                writes += 1
+
+            min_gallop += 1
+            while i < length_a and j < end_b:
+                min_gallop -= min_gallop > 1
+                notes += 1
+                wins_a = gallop(arr[j], aux, i, length_a - i, True)
+                arr[k:k + wins_a] = aux[i:i + wins_a]
+                i += wins_a
+                k += wins_a
+                writes += wins_a + 1
+                if i == length_a:
+                    writes -= 1
+                    break
+                arr[k] = arr[j]
                 j += 1
                 k += 1
+                if j == end_b:
+                    break
+                wins_b = gallop(aux[i], arr, j, end_b - j, False)
+                arr[k:k + wins_b] = arr[j:j + wins_b]
+                j += wins_b
+                k += wins_b
+                writes += wins_b
+                if j == end_b:
+                    break
+                arr[k] = aux[i]
+                writes += 1
+                i += 1
+                k += 1
+                if wins_a < MIN_GALLOP and wins_b < MIN_GALLOP:
+                    break
+            min_gallop += 1
+
+        arr[k:k + length_a - i] = aux[i:length_a]
+        writes += length_a - i
+
+    def merge_at(index: int):
+        """Merges the pending runs at stack positions index and index + 1."""
+        nonlocal notes
+        start_a, length_a = runs[index]
+        start_b, length_b = runs[index + 1]
+        runs[index:index + 2] = [(start_a, length_a + length_b)]
+        end = start_b + length_b
+        notes += 1
+        skipped = gallop(arr[start_b], arr, start_a, length_a, True)
+        if skipped:
+            notes += 1
+        merge_start = start_a + skipped
+        length_a -= skipped
+        if length_a:
+            length_b = gallop(arr[start_b - 1], arr, start_b, length_b, False)
+            if start_b + length_b < end:
+                notes += 1
+            if length_b:
+                merge_low(merge_start, length_a, start_b, length_b)
+        notes += 1
+
+    def merge_collapse():
+        """Merges pending runs until the stack invariants hold again."""
+        while len(runs) > 1:
+            top = len(runs) - 2
+            if ((top > 0 and runs[top - 1][1] <= runs[top][1] + runs[top + 1][1])
+                    or (top > 1 and runs[top - 2][1] <= runs[top - 1][1] + runs[top][1])):
+                if runs[top - 1][1] < runs[top + 1][1]:
+                    top -= 1
+            elif runs[top][1] > runs[top + 1][1]:
+                break
+            merge_at(top)
+
+    min_run = min_run_length(n)
+    notes += 1
+    start = 0
+    while start < n:
+        length = count_run(start)
+        if length < min_run:
+            forced = min(min_run, n - start)
+            binary_insertion(start, start + forced, start + length)
+            length = forced
+        runs.append((start, length))
+        if len(runs) > max_depth:
+            max_depth = len(runs)
+        notes += 1
+        merge_collapse()
+        start += length
+
+    while len(runs) > 1:
+        top = len(runs) - 2
+        if top > 0 and runs[top - 1][1] < runs[top + 1][1]:
+            top -= 1
+        merge_at(top)
+    return _counters(notes + 1, visits, compares, swaps, writes, max_depth)
+
+
+def timsort(arr: List[int], stream: bool = False, level: str = "full", **trace_options) -> SortOutput:
+    """
+    Performs Timsort on the input array.
+
+    Args:
+        arr (List[int]): The array to sort.
+        stream (bool): If True, steps are generated lazily as the returned
+            views are filled instead of sorting the whole array up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
 
-            messages.append(f"Merged subarrays into positions {start} to {start + k - 1}.")
+    Returns:
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each operation.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    stats = {"max_depth": 0}
+    return _run(arr, iter_timsort(arr, stats), stream, level, stats, counted=partial(count_timsort, arr),
+                **trace_options)
 
-    merge_sort_recursive(arr, 0)
-    messages.append("Merge Sort completed.")
-    return steps, highlights, messages
 
+# Gap sequences supported by shell_sort.
+GAP_SEQUENCES = ("shell", "knuth", "sedgewick", "tokuda", "ciura")
 
-def shell_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int]], List[str]]:
+# Ciura's experimentally found gaps; shell_gaps extends them by a factor of 2.25.
+CIURA_GAPS = (1, 4, 10, 23, 57, 132, 301, 701, 1750)
+
+
+def shell_gaps(n: int, sequence: str = "shell") -> List[int]:
     """
-    Performs Shell Sort on the input array.
+    Computes the gaps Shell Sort uses for an array of length n.
 
     Args:
-        arr (List[int]): The array to sort.
+        n (int): Length of the array.
+        sequence (str): One of GAP_SEQUENCES:
+            - "shell": n // 2, n // 4, ..., 1 (Shell, 1959; O(n^2) worst case).
+            - "knuth": 1, 4, 13, 40, ... up to n / 3 (Knuth, 1973; O(n^1.5)).
+            - "sedgewick": 1, 8, 23, 77, 281, ... (4^k + 3 * 2^(k-1) + 1; O(n^(4/3))).
+            - "tokuda": 1, 4, 9, 20, 46, 103, ... (Tokuda, 1992).
+            - "ciura": 1, 4, 10, 23, 57, 132, 301, 701, 1750, then * 2.25.
 
     Returns:
-        Tuple[List[List[int]], List[List[int]], List[str]]:
-            - steps: List of array states after each gap insertion.
-            - highlights: List of indices to highlight at each step.
-            - messages: List of descriptive messages for each step.
+        List[int]: The gaps in decreasing order, ending with 1 (empty for n < 2).
     """
-    steps = []
-    highlights = []
-    messages = []
-    steps.append(arr.copy())
-    highlights.append([])
-    messages.append("Initial array")
+    if sequence not in GAP_SEQUENCES:
+        raise ValueError(f"Unknown gap sequence {sequence!r}; expected one of {GAP_SEQUENCES}.")
+    if sequence == "shell":
+        gaps = []
+        gap = n // 2
+        while gap > 0:
+            gaps.append(gap)
+            gap //= 2
+        return gaps
+    if n < 2:
+        return []
+
+    if sequence == "knuth":
+        gaps = [1]
+        while 3 * gaps[-1] + 1 <= max(1, n // 3):
+            gaps.append(3 * gaps[-1] + 1)
+    elif sequence == "sedgewick":
+        gaps = [1]
+        k = 1
+        while 4 ** k + 3 * 2 ** (k - 1) + 1 < n:
+            gaps.append(4 ** k + 3 * 2 ** (k - 1) + 1)
+            k += 1
+    elif sequence == "tokuda":
+        gaps = [1]
+        k = 2
+        while True:
+            # ceil((9^k - 4^k) / (5 * 4^(k-1))) in integers.
+            gap = -((4 ** k - 9 ** k) // (5 * 4 ** (k - 1)))
+            if gap >= n:
+                break
+            gaps.append(gap)
+            k += 1
+    else:
+        gaps = [gap for gap in CIURA_GAPS if gap < n]
+        if len(gaps) == len(CIURA_GAPS):
+            while int(gaps[-1] * 2.25) < n:
+                gaps.append(int(gaps[-1] * 2.25))
+    return gaps[::-1]
+
+
+def iter_shell_sort(arr: List[int], gaps: str = "shell") -> Iterator[Step]:
+    """
+    Sorts the input array in place with Shell Sort, yielding each step.
+
+    Args:
+        arr (List[int]): The array to sort.
+        gaps (str): The gap sequence, one of GAP_SEQUENCES (see shell_gaps).
 
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
     n = len(arr)
-    gap = n // 2
+    for gap in shell_gaps(n, gaps):
+        yield NOTE, 0, 0, msg.GAP_SIZE, (gap,)
+        for i in range(gap, n):
+            temp = arr[i]
+            j = i
+            yield COMPARE, j - gap, j, msg.COMPARE, (j - gap, arr[j - gap], j, temp)
+            while j >= gap and arr[j - gap] > temp:
+                arr[j] = arr[j - gap]
+                yield WRITE, j, arr[j], msg.MOVED, (arr[j - gap], j - gap, j)
+                j -= gap
+            arr[j] = temp
+            yield WRITE, j, temp, msg.INSERTED_VALUE, (temp, j)
+    yield NOTE, 0, 0, msg.SHELL_SORT_COMPLETED, ()
+
+
+def count_shell_sort(arr: List[int], gaps: str = "shell") -> Dict[str, int]:
+    """
+    Sorts the input array in place with Shell Sort, without tracing.
 
-    while gap > 0:
-        messages.append(f"Using gap size {gap}.")
+    Args:
+        arr (List[int]): The array to sort.
+        gaps (str): The gap sequence, one of GAP_SEQUENCES.
+
+    Returns:
+        Dict[str, int]: The operation counts of iter_shell_sort's steps.
+    """
+    n = len(arr)
+    notes = compares = writes = 0
+    for gap in shell_gaps(n, gaps):
+        notes += 1
+        compares += n - gap
         for i in range(gap, n):
             temp = arr[i]
             j = i
-            messages.append(f"Comparing index {j - gap} (value {arr[j - gap]}) with index {j} (value {temp}).")
             while j >= gap and arr[j - gap] > temp:
-                highlights.append([j - gap, j])
                 arr[j] = arr[j - gap]
-                steps.append(arr.copy())
-                messages.append(f"Moved value {arr[j - gap]} from index {j - gap} to index {j}.")
                 j -= gap
             arr[j] = temp
-            steps.append(arr.copy())
-            highlights.append([j])
-            messages.append(f"Inserted value {temp} at index {j}.")
-        gap //= 2
-    messages.append("Shell Sort completed.")
-    return steps, highlights, messages
+            writes += (i - j) // gap + 1
+    return _counters(notes + 1, 0, compares, 0, writes)
 
 
-def counting_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int]], List[str]]:
+def shell_sort(arr: List[int], stream: bool = False, level: str = "full", gaps: str = "shell",
+               **trace_options) -> SortOutput:
     """
-    Performs Counting Sort on the input array.
+    Performs Shell Sort on the input array.
 
     Args:
         arr (List[int]): The array to sort.
+        stream (bool): If True, steps are generated lazily as the returned
+            views are filled instead of sorting the whole array up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        gaps (str): Gap sequence: "shell" (halving), "knuth", "sedgewick",
+            "tokuda" or "ciura".
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
 
     Returns:
-        Tuple[List[List[int]], List[List[int]], List[str]]:
-            - steps: List of array states after counting and placing elements.
-            - highlights: List of indices to highlight at each step.
-            - messages: List of descriptive messages for each step.
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each gap insertion.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
     """
-    steps = []
-    highlights = []
-    messages = []
-    steps.append(arr.copy())
-    highlights.append([])
-    messages.append("Initial array")
+    return _run(arr, iter_shell_sort(arr, gaps), stream, level, counted=partial(count_shell_sort, arr, gaps),
+                **trace_options)
 
+
+def iter_counting_sort(arr: List[int]) -> Iterator[Step]:
+    """
+    Sorts the input array in place with Counting Sort, yielding each step.
+
+    Args:
+        arr (List[int]): The array to sort.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
     if not arr:
-        messages.append("Empty array. Nothing to sort.")
-        return steps, highlights, messages
+        yield NOTE, 0, 0, msg.EMPTY_ARRAY, ()
+        return
 
     max_val = max(arr)
     min_val = min(arr)
@@ -411,135 +1996,730 @@ def counting_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int]], Lis
     count = [0] * range_of_elements
     output = [0] * len(arr)
 
-    for number in arr:
+    for i, number in enumerate(arr):
         count[number - min_val] += 1
-        highlights.append([number - min_val])
-        steps.append(count.copy())
-        messages.append(f"Counting number {number}. Current count: {count[number - min_val]}.")
+        yield VISIT, i, 0, msg.COUNTING_NUMBER, (number, count[number - min_val])
 
     for i in range(1, len(count)):
         count[i] += count[i - 1]
-        highlights.append([i])
-        steps.append(count.copy())
-        messages.append(f"Updating count for value {i + min_val -1}: {count[i]}.")
+        yield NOTE, 0, 0, msg.UPDATE_COUNT, (i + min_val, count[i])
 
-    for number in reversed(arr):
+    for i in range(len(arr) - 1, -1, -1):
+        number = arr[i]
         output[count[number - min_val] - 1] = number
         count[number - min_val] -= 1
-        highlights.append([number - min_val])
-        steps.append(count.copy())
-        messages.append(f"Placing number {number} at position {count[number - min_val]}.")
+        yield VISIT, i, 0, msg.PLACING_NUMBER, (number, count[number - min_val])
 
     for i in range(len(arr)):
         arr[i] = output[i]
-        highlights.append([i])
-        steps.append(arr.copy())
-        messages.append(f"Setting arr[{i}] to {arr[i]}.")
+        yield WRITE, i, arr[i], msg.SETTING, (i, arr[i])
 
-    messages.append("Counting Sort completed.")
-    return steps, highlights, messages
+    yield NOTE, 0, 0, msg.COUNTING_SORT_COMPLETED, ()
 
 
-def radix_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int]], List[str]]:
+def count_counting_sort(arr: List[int]) -> Dict[str, int]:
     """
-    Performs Radix Sort on the input array.
+    Sorts the input array in place with Counting Sort, without tracing.
 
     Args:
         arr (List[int]): The array to sort.
 
     Returns:
-        Tuple[List[List[int]], List[List[int]], List[str]]:
-            - steps: List of array states after each digit placement.
-            - highlights: List of indices to highlight at each step.
-            - messages: List of descriptive messages for each step.
+        Dict[str, int]: The operation counts of iter_counting_sort's steps.
     """
-    steps = []
-    highlights = []
-    messages = []
-    steps.append(arr.copy())
-    highlights.append([])
-    messages.append("Initial array")
-
     if not arr:
-        messages.append("Empty array. Nothing to sort.")
-        return steps, highlights, messages
+        return _counters(1)
+    min_val = min(arr)
+    count = [0] * (max(arr) - min_val + 1)
+    for number in arr:
+        count[number - min_val] += 1
+    for i in range(1, len(count)):
+        count[i] += count[i - 1]
+    output = [0] * len(arr)
+    for number in reversed(arr):
+        count[number - min_val] -= 1
+        output[count[number - min_val]] = number
+    arr[:] = output
+    # Each value is visited when counted and when placed; every prefix sum is a note.
+    return _counters(len(count), 2 * len(arr), 0, 0, len(arr))
 
-    max_val = max(arr)
-    exp = 1  
 
-    while max_val // exp > 0:
-        messages.append(f"Sorting based on digit at exponent {exp}.")
-        count = [0] * 10
-        output = [0] * len(arr)
+def counting_sort(arr: List[int], stream: bool = False, level: str = "full", **trace_options) -> SortOutput:
+    """
+    Performs Counting Sort on the input array.
+
+    Args:
+        arr (List[int]): The array to sort.
+        stream (bool): If True, steps are generated lazily as the returned
+            views are filled instead of sorting the whole array up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
+
+    Returns:
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after counting and placing elements.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    return _run(arr, iter_counting_sort(arr), stream, level, counted=partial(count_counting_sort, arr),
+                **trace_options)
+
+
+# Digit orders supported by radix_sort.
+RADIX_ORDERS = ("lsd", "msd")
+
 
-        for number in arr:
-            index = (number // exp) % 10
+def iter_radix_sort(arr: List[int], base: int = 10, order: str = "lsd") -> Iterator[Step]:
+    """
+    Sorts the input array in place with Radix Sort, yielding each step.
+
+    Negative values are handled by offsetting every key by the minimum, so
+    digits are always taken from non-negative keys. Digits of power-of-two
+    bases such as 256 or 65536 are extracted with shifts and masks.
+
+    Args:
+        arr (List[int]): The array to sort.
+        base (int): The radix, at least 2. Larger bases take fewer passes
+            over the array but use a larger count table.
+        order (str): One of RADIX_ORDERS. "lsd" sorts the whole array by
+            each digit from the least significant one up; "msd" sorts by the
+            most significant digit first and then each bucket by the next
+            digit, skipping buckets with fewer than two elements.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
+    if base < 2:
+        raise ValueError(f"Radix sort needs a base of at least 2, got {base}.")
+    if order not in RADIX_ORDERS:
+        raise ValueError(f"Unknown radix sort order {order!r}; expected one of {RADIX_ORDERS}.")
+    if not arr:
+        yield NOTE, 0, 0, msg.EMPTY_ARRAY, ()
+        return
+
+    offset = min(0, min(arr))
+    if offset:
+        yield NOTE, 0, 0, msg.KEY_OFFSET, (-offset,)
+    max_key = max(arr) - offset
+    digits = 0
+    while max_key >= base ** digits:
+        digits += 1
+
+    def digit_of(position: int) -> Callable[[int], int]:
+        """Returns a function extracting digit `position` of a value's key."""
+        if base & (base - 1) == 0:
+            shift = (base.bit_length() - 1) * position
+            mask = base - 1
+            return lambda value: ((value - offset) >> shift) & mask
+        exp = base ** position
+        return lambda value: (value - offset) // exp % base
+
+    def counting_pass(low: int, high: int, position: int) -> Iterator[Step]:
+        """
+        Stably sorts arr[low:high] by one digit and returns the (start, end)
+        offsets of the non-empty buckets in digit order.
+
+        Only the digits that occur are counted and summed, so a small MSD
+        bucket costs no more with base 65536 than with base 10.
+        """
+        digit = digit_of(position)
+        count = Counter()
+        output = [0] * (high - low)
+
+        for i in range(low, high):
+            index = digit(arr[i])
             count[index] += 1
-            highlights.append([index])
-            steps.append(count.copy())
-            messages.append(f"Counting digit {index}.")
-
-        for i in range(1, 10):
-            count[i] += count[i - 1]
-            highlights.append([i])
-            steps.append(count.copy())
-            messages.append(f"Updating count for digit {i}: {count[i]}.")
-
-        for i in range(len(arr)-1, -1, -1):
-            index = (arr[i] // exp) % 10
+            yield VISIT, i, 0, msg.COUNTING_DIGIT, (index,)
+
+        digits_present = sorted(count)
+        total = 0
+        for index in digits_present:
+            total += count[index]
+            if total > count[index]:
+                count[index] = total
+                yield NOTE, 0, 0, msg.UPDATE_DIGIT_COUNT, (index, total)
+
+        for i in range(high - 1, low - 1, -1):
+            index = digit(arr[i])
             output[count[index] - 1] = arr[i]
             count[index] -= 1
-            highlights.append([index])
-            steps.append(count.copy())
-            messages.append(f"Placing number {arr[i]} at position {count[index]}.")
+            yield VISIT, i, 0, msg.PLACING_NUMBER, (arr[i], low + count[index])
+
+        for i in range(low, high):
+            arr[i] = output[i - low]
+            yield WRITE, i, arr[i], msg.SETTING, (i, arr[i])
+
+        # After placing, count[d] is where the bucket of digit d starts.
+        starts = [count[index] for index in digits_present]
+        return list(zip(starts, starts[1:] + [high - low]))
+
+    if order == "lsd":
+        for position in range(digits):
+            if base == 10:
+                yield NOTE, 0, 0, msg.DIGIT_PASS, (10 ** position,)
+            else:
+                yield NOTE, 0, 0, msg.DIGIT_PASS_BASE, (position, base)
+            yield from counting_pass(0, len(arr), position)
+    else:
+        # (low, high, digit position) of the buckets still to sort.
+        stack = [(0, len(arr), digits - 1)]
+        while stack:
+            low, high, position = stack.pop()
+            if high - low < 2 or position < 0:
+                continue
+            yield NOTE, 0, 0, msg.MSD_BUCKET, (low, high - 1, position, base)
+            buckets = yield from counting_pass(low, high, position)
+            stack.extend((low + start, low + end, position - 1) for start, end in reversed(buckets)
+                         if end - start > 1)
+    yield NOTE, 0, 0, msg.RADIX_SORT_COMPLETED, ()
+
+
+def count_radix_sort(arr: List[int], base: int = 10, order: str = "lsd") -> Dict[str, int]:
+    """
+    Sorts the input array in place with Radix Sort, without tracing.
 
-        for i in range(len(arr)):
-            arr[i] = output[i]
-            highlights.append([i])
-            steps.append(arr.copy())
-            messages.append(f"Setting arr[{i}] to {arr[i]}.")
+    Args:
+        arr (List[int]): The array to sort.
+        base (int): The radix, at least 2.
+        order (str): One of RADIX_ORDERS.
 
-        exp *= 10
-    messages.append("Radix Sort completed.")
-    return steps, highlights, messages
+    Returns:
+        Dict[str, int]: The operation counts of iter_radix_sort's steps.
+    """
+    if base < 2:
+        raise ValueError(f"Radix sort needs a base of at least 2, got {base}.")
+    if order not in RADIX_ORDERS:
+        raise ValueError(f"Unknown radix sort order {order!r}; expected one of {RADIX_ORDERS}.")
+    if not arr:
+        return _counters(1)
+
+    offset = min(0, min(arr))
+    notes = 1 if offset else 0
+    visits = writes = 0
+    max_key = max(arr) - offset
+    digits = 0
+    while max_key >= base ** digits:
+        digits += 1
+
+    def counting_pass(low: int, high: int, position: int) -> List[Tuple[int, int]]:
+        """Stably sorts arr[low:high] by one digit and returns the bucket offsets."""
+        nonlocal notes, visits, writes
+        if base & (base - 1) == 0:
+            shift, mask = (base.bit_length() - 1) * position, base - 1
+            keys = [((value - offset) >> shift) & mask for value in arr[low:high]]
+        else:
+            exp = base ** position
+            keys = [(value - offset) // exp % base for value in arr[low:high]]
+        count = Counter(keys)
+        digits_present = sorted(count)
+        total = 0
+        for index in digits_present:
+            total += count[index]
+            if total > count[index]:
+                count[index] = total
+                notes += 1
+        output = [0] * (high - low)
+        for i in range(high - low - 1, -1, -1):
+            index = keys[i]
+            count[index] -= 1
+            output[count[index]] = arr[low + i]
+        arr[low:high] = output
+        visits += 2 * (high - low)
+        writes += high - low
+        starts = [count[index] for index in digits_present]
+        return list(zip(starts, starts[1:] + [high - low]))
+
+    if order == "lsd":
+        for position in range(digits):
+            notes += 1
+            counting_pass(0, len(arr), position)
+    else:
+        stack = [(0, len(arr), digits - 1)]
+        while stack:
+            low, high, position = stack.pop()
+            if high - low < 2 or position < 0:
+                continue
+            notes += 1
+            buckets = counting_pass(low, high, position)
+            stack.extend((low + start, low + end, position - 1) for start, end in reversed(buckets)
+                         if end - start > 1)
+    return _counters(notes + 1, visits, 0, 0, writes)
+
+
+def radix_sort(arr: List[int], stream: bool = False, level: str = "full", base: int = 10, order: str = "lsd",
+               **trace_options) -> SortOutput:
+    """
+    Performs Radix Sort on the input array.
 
+    Args:
+        arr (List[int]): The array to sort. Negative values are supported.
+        stream (bool): If True, steps are generated lazily as the returned
+            views are filled instead of sorting the whole array up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        base (int): The radix, e.g. 10, 256 or 65536.
+        order (str): "lsd" (least significant digit first) or "msd".
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
 
-def cocktail_shaker_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int]], List[str]]:
+    Returns:
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each digit placement.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
     """
-    Performs Cocktail Shaker Sort on the input array.
+    return _run(arr, iter_radix_sort(arr, base, order), stream, level,
+                counted=partial(count_radix_sort, arr, base, order), **trace_options)
+
+
+# A phase of a vectorized sort: its message template and arguments, and the
+# whole array after the phase, or None if the phase does not move values.
+Phase = Tuple[int, Tuple[int, ...], Optional["np.ndarray"]]
+
+
+def _require_numpy(name: str):
+    """Raises ImportError if NumPy, needed by the vectorized sorts, is missing."""
+    if np is None:
+        raise ImportError(f"{name} requires NumPy.")
+
+
+def _timed(timings: Optional[Dict[str, float]], phase: str, start: float):
+    """Adds the seconds since `start` to timings[phase], if timings are collected."""
+    if timings is not None:
+        timings[phase] = timings.get(phase, 0.0) + time.perf_counter() - start
+
+
+def iter_numpy_counting_phases(values: "np.ndarray", timings: Optional[Dict[str, float]] = None) -> Iterator[Phase]:
+    """
+    Counting Sort with NumPy, yielding one entry per phase.
+
+    Args:
+        values (ndarray): The int64 values to sort. They are not modified.
+        timings (Optional[Dict[str, float]]): If given, the seconds spent in
+            the "histogram", "prefix" and "scatter" phases are added to it.
+
+    Yields:
+        Phase: The histogram (np.bincount), prefix sum (np.cumsum) and
+        scatter phases. The scatter writes, at the start of every used
+        bucket, how much larger its value is than the previous bucket's,
+        and a running sum fills each bucket with its value.
+    """
+    if not len(values):
+        yield msg.EMPTY_ARRAY, (), None
+        return
+    start = time.perf_counter()
+    min_val = int(values.min())
+    count = np.bincount(values - min_val)
+    _timed(timings, "histogram", start)
+    yield msg.VALUE_HISTOGRAM, (len(values), len(count), int(np.count_nonzero(count))), None
+
+    start = time.perf_counter()
+    starts = np.cumsum(count) - count
+    _timed(timings, "prefix", start)
+    yield msg.VALUE_PREFIX_SUM, (int(starts[-1]),), None
+
+    start = time.perf_counter()
+    used = np.flatnonzero(count)
+    output = np.zeros(len(values), dtype=values.dtype)
+    output[starts[used]] = np.diff(used, prepend=0)
+    output = np.cumsum(output, out=output)
+    output += min_val
+    _timed(timings, "scatter", start)
+    yield msg.VALUE_SCATTER, (len(values),), output
+
+
+def iter_numpy_radix_phases(values: "np.ndarray", base: int = 256,
+                            timings: Optional[Dict[str, float]] = None) -> Iterator[Phase]:
+    """
+    LSD Radix Sort with NumPy, yielding one entry per phase.
+
+    Keys are offset by the minimum when it is negative, as in radix_sort.
+    Each pass works like parallel_radix_sort with the array cut into
+    about len(values) / base chunks: one np.bincount counts the digits of
+    every chunk, a cumulative sum over digits and then chunks gives where
+    each chunk's values with each digit start, and the scatter walks the
+    chunks side by side, one column at a time, moving every value to its
+    chunk's next slot for its digit with fancy indexing. Passes whose
+    histogram has a single used bucket are skipped.
+
+    Args:
+        values (ndarray): The int64 values to sort. They are not modified.
+        base (int): The radix, at least 2; powers of two use shifts and masks.
+        timings (Optional[Dict[str, float]]): If given, the seconds spent in
+            the "histogram", "prefix" and "scatter" phases are added to it.
+
+    Yields:
+        Phase: For each digit, the histogram phase and, unless all values
+        share the digit, the prefix sum and scatter phases.
+    """
+    if base < 2:
+        raise ValueError(f"Radix sort needs a base of at least 2, got {base}.")
+    if not len(values):
+        yield msg.EMPTY_ARRAY, (), None
+        return
+    offset = min(0, int(values.min()))
+    if offset:
+        yield msg.KEY_OFFSET, (-offset,), None
+    keys = values - offset
+    max_key = int(keys.max())
+    n = len(values)
+    # About one slot per value in the chunk-by-digit table, and one scatter
+    # iteration per chunk column.
+    chunks = max(1, n // base)
+    width = -(-n // chunks)
+    padding = chunks * width - n
+    row_offsets = np.arange(chunks, dtype=np.int64)[:, None] * (base + 1)
+    index_type = np.int32 if n < 2 ** 31 else np.int64
+    power_of_two = base & (base - 1) == 0
+    position = 0
+    while max_key >= base ** position:
+        start = time.perf_counter()
+        if power_of_two:
+            digits = (keys >> ((base.bit_length() - 1) * position)) & (base - 1)
+        else:
+            digits = keys // base ** position % base
+        # The padding of the last chunk gets the extra digit `base`, which
+        # sorts after every real one and is never written out.
+        grid = np.concatenate((digits, np.full(padding, base, dtype=digits.dtype))).reshape(chunks, width)
+        # Cell of each value in the flattened chunk-by-digit table.
+        cells = grid + row_offsets
+        table = np.bincount(cells.ravel(), minlength=chunks * (base + 1)).reshape(chunks, base + 1)
+        count = table[:, :base].sum(axis=0)
+        used = int(np.count_nonzero(count))
+        _timed(timings, "histogram", start)
+        yield msg.DIGIT_HISTOGRAM, (position, base, used), None
+
+        if used == 1:
+            yield msg.DIGIT_SKIPPED, (position,), None
+            position += 1
+            continue
+
+        start = time.perf_counter()
+        starts = np.cumsum(count) - count
+        slots = np.cumsum(table, axis=0, dtype=index_type)
+        slots -= table
+        slots[:, :base] += starts
+        slots = slots.ravel()
+        _timed(timings, "prefix", start)
+        yield msg.DIGIT_PREFIX_SUM, (position, int(starts[np.flatnonzero(count)[-1]])), None
+
+        start = time.perf_counter()
+        targets = np.empty((width, chunks), dtype=index_type)
+        for column, cell in enumerate(cells.T):
+            targets[column] = slots[cell]
+            slots[cell] += 1
+        targets = targets.T.ravel()[:n]
+        scattered = np.empty_like(values)
+        scattered[targets] = values
+        values = scattered
+        scattered = np.empty_like(keys)
+        scattered[targets] = keys
+        keys = scattered
+        _timed(timings, "scatter", start)
+        yield msg.DIGIT_SCATTER, (n, position), values
+        position += 1
+
+
+def iter_phase_steps(arr: List[int], phases: Iterable[Phase], completed: int) -> Iterator[Step]:
+    """
+    Turns the phases of a vectorized sort into trace steps.
+
+    Each phase is one note. A phase that moves values is followed by one
+    write for every index whose value changed, so the trace replays like
+    any other; the notes are what "Next Pass" navigates between.
+
+    Args:
+        arr (List[int]): The array being sorted; it is updated as the steps are yielded.
+        phases (Iterable[Phase]): The phases of the sort.
+        completed (int): Message template id of the final note.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
+    current = None
+    for message, args, values in phases:
+        yield NOTE, 0, 0, message, args
+        if values is None:
+            continue
+        if current is None:
+            current = np.array(arr, dtype=values.dtype)
+        changed = np.flatnonzero(values != current)
+        for i, value in zip(changed.tolist(), values[changed].tolist()):
+            arr[i] = value
+            yield WRITE, i, value, msg.SETTING, (i, value)
+        current = values
+    yield NOTE, 0, 0, completed, ()
+
+
+def _run_phases(arr: List[int], phases: Iterator[Phase], completed: int, stream: bool, level: str,
+                timings: Optional[Dict[str, float]], **trace_options) -> SortOutput:
+    """
+    Drives the phases of a vectorized sort at the requested recording level.
+
+    "none" and "counters" never leave NumPy: the counters are those of the
+    trace iter_phase_steps would record, computed per phase.
+
+    Args:
+        arr (List[int]): The array to sort.
+        phases (Iterator[Phase]): The phases, computed on a copy of the array.
+        completed (int): Message template id of the final note.
+        stream (bool): Consume the phases lazily (only with "full").
+        level (str): One of RECORDING_LEVELS.
+        timings (Optional[Dict[str, float]]): If given, also receives the
+            "convert" seconds spent moving the array between list and NumPy.
+        **trace_options: Keyword arguments for _run.
+
+    Returns:
+        Union[SortResult, Dict[str, int], None]: As for _run.
+    """
+    if level not in RECORDING_LEVELS:
+        raise ValueError(f"Unknown recording level {level!r}; expected one of {RECORDING_LEVELS}.")
+    if level == "full":
+        return _run(arr, iter_phase_steps(arr, phases, completed), stream, level, **trace_options)
+    if stream:
+        raise ValueError("Only the 'full' recording level can be streamed.")
+
+    counts = {name: 0 for name in OP_NAMES.values()}
+    current = None
+    for message, args, values in phases:
+        counts["notes"] += 1
+        if values is not None:
+            if level == "counters":
+                if current is None:
+                    current = np.array(arr, dtype=values.dtype)
+                counts["writes"] += int(np.count_nonzero(values != current))
+            current = values
+    counts["notes"] += 1
+    if current is not None:
+        start = time.perf_counter()
+        arr[:] = current.tolist()
+        _timed(timings, "convert", start)
+    if level == "none":
+        return None
+    counts["max_depth"] = 0
+    return counts
+
+
+def numpy_counting_sort(arr: List[int], stream: bool = False, level: str = "full",
+                        timings: Optional[Dict[str, float]] = None, **trace_options) -> SortOutput:
+    """
+    Performs Counting Sort on the input array with NumPy.
+
+    The histogram, prefix sum and scatter run as whole-array NumPy
+    operations, so tens of millions of keys sort in seconds. The trace has
+    one note per phase and the writes of the final placement.
+
+    Args:
+        arr (List[int]): The array to sort. Values must fit in 64 bits and
+            their range must fit in memory as a count table.
+        stream (bool): If True, the phases are run lazily as the returned
+            views are filled.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        timings (Optional[Dict[str, float]]): If given, the seconds spent in
+            each phase ("convert", "histogram", "prefix", "scatter") are added to it.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
+
+    Returns:
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each operation.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    _require_numpy("numpy_counting_sort")
+    start = time.perf_counter()
+    values = np.array(arr, dtype=np.int64)
+    _timed(timings, "convert", start)
+    return _run_phases(arr, iter_numpy_counting_phases(values, timings), msg.COUNTING_SORT_COMPLETED,
+                       stream, level, timings, **trace_options)
+
+
+def numpy_radix_sort(arr: List[int], stream: bool = False, level: str = "full", base: int = 256,
+                     timings: Optional[Dict[str, float]] = None, **trace_options) -> SortOutput:
+    """
+    Performs an LSD Radix Sort on the input array with NumPy.
+
+    Every digit pass is a histogram, a prefix sum and a scatter over the
+    whole array in NumPy. The trace has one note per phase and the writes
+    of each pass.
+
+    Args:
+        arr (List[int]): The array to sort. Negative values are supported;
+            values must fit in 64 bits.
+        stream (bool): If True, the passes are run lazily as the returned
+            views are filled.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        base (int): The radix, e.g. 256 or 65536.
+        timings (Optional[Dict[str, float]]): If given, the seconds spent in
+            each phase ("convert", "histogram", "prefix", "scatter") are added to it.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
+
+    Returns:
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each operation.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    _require_numpy("numpy_radix_sort")
+    start = time.perf_counter()
+    values = np.array(arr, dtype=np.int64)
+    _timed(timings, "convert", start)
+    return _run_phases(arr, iter_numpy_radix_phases(values, base, timings), msg.RADIX_SORT_COMPLETED,
+                       stream, level, timings, **trace_options)
+
+
+def iter_parallel_radix_sort(arr: List[int], base: int, bounds: Sequence[Tuple[int, int]],
+                             processes: Optional[int] = None,
+                             timings: Optional[Dict[str, float]] = None) -> Iterator[Step]:
+    """
+    Sorts the input array with a parallel LSD radix sort, yielding each step.
+
+    The digit counting and scattering run in worker processes (see
+    tracepool.iter_radix_passes), so a pass is recorded as a note per
+    worker histogram, a note for the scatter, and the writes that copy the
+    pass's result into the array.
+
+    Args:
+        arr (List[int]): The array to sort.
+        base (int): The radix, a power of two.
+        bounds (Sequence[Tuple[int, int]]): (start, end) of each worker's chunk.
+        processes (Optional[int]): Number of worker processes.
+        timings (Optional[Dict[str, float]]): Receives the time of each phase.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
+    """
+    if not arr:
+        yield NOTE, 0, 0, msg.EMPTY_ARRAY, ()
+        return
+    if min(arr) < 0:
+        yield NOTE, 0, 0, msg.KEY_OFFSET, (-min(arr),)
+    for position, passes, histograms, read in iter_radix_passes(arr, base, bounds, processes, timings):
+        yield NOTE, 0, 0, msg.DIGIT_PASS_BASE, (position, base)
+        for worker, ((start, end), histogram) in enumerate(zip(bounds, histograms)):
+            yield NOTE, 0, 0, msg.WORKER_HISTOGRAM, (worker, start, end - 1, len(histogram) - histogram.count(0))
+        yield NOTE, 0, 0, msg.SCATTER_OFFSETS, (len(bounds),)
+        for i, value in enumerate(read()):
+            arr[i] = value
+            yield WRITE, i, value, msg.SETTING, (i, value)
+    yield NOTE, 0, 0, msg.PARALLEL_RADIX_SORT_COMPLETED, ()
+
+
+def count_parallel_radix_sort(arr: List[int], base: int, bounds: Sequence[Tuple[int, int]],
+                              processes: Optional[int] = None,
+                              timings: Optional[Dict[str, float]] = None) -> Dict[str, int]:
+    """
+    Sorts the input array with a parallel LSD radix sort, without tracing.
 
     Args:
         arr (List[int]): The array to sort.
+        base (int): The radix, a power of two.
+        bounds (Sequence[Tuple[int, int]]): (start, end) of each worker's chunk.
+        processes (Optional[int]): Number of worker processes.
+        timings (Optional[Dict[str, float]]): Receives the time of each phase.
 
     Returns:
-        Tuple[List[List[int]], List[List[int]], List[str]]:
-            - steps: List of array states after each swap.
-            - highlights: List of indices to highlight at each step.
-            - messages: List of descriptive messages for each step.
+        Dict[str, int]: The operation counts of iter_parallel_radix_sort's steps.
+    """
+    if not arr:
+        return _counters(1)
+    notes = 2 if min(arr) < 0 else 1
+    writes = 0
+    for position, passes, histograms, read in iter_radix_passes(arr, base, bounds, processes, timings):
+        arr[:] = read()
+        notes += len(bounds) + 2
+        writes += len(arr)
+    return _counters(notes, writes=writes)
+
+
+def parallel_radix_sort(arr: List[int], stream: bool = False, level: str = "full", processes: Optional[int] = None,
+                        base: int = 256, timings: Optional[Dict[str, float]] = None, **trace_options) -> SortOutput:
+    """
+    Performs an LSD Radix Sort on the input array with a process pool.
+
+    The values live in two shared memory buffers. In every digit pass each
+    worker builds the digit histogram of its chunk, the parent computes
+    from all histograms where each worker writes each digit, and the
+    workers scatter their chunks into the other buffer in parallel.
+
+    Args:
+        arr (List[int]): The array to sort. Negative values are supported.
+        stream (bool): If True, passes are run lazily as the returned views
+            are filled; the pool stays up until the trace is complete.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        processes (Optional[int]): Number of worker processes and chunks.
+            Defaults to the CPU count.
+        base (int): The radix, a power of two such as 256 or 65536.
+        timings (Optional[Dict[str, float]]): If given, the seconds spent in
+            each phase (tracepool.RADIX_PHASES) are added to it.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
+
+    Returns:
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each operation.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    n = len(arr)
+    chunks = max(1, min(processes or os.cpu_count() or 1, n))
+    bounds = [(n * chunk // chunks, n * (chunk + 1) // chunks) for chunk in range(chunks)]
+    if level == "none":
+        for position, passes, histograms, read in iter_radix_passes(arr, base, bounds, processes, timings):
+            if position == passes - 1:
+                arr[:] = read()
+        return None
+    return _run(arr, iter_parallel_radix_sort(arr, base, bounds, processes, timings), stream, level,
+                counted=partial(count_parallel_radix_sort, arr, base, bounds, processes, timings), **trace_options)
+
+
+def iter_cocktail_shaker_sort(arr: List[int]) -> Iterator[Step]:
+    """
+    Sorts the input array in place with Cocktail Shaker Sort, yielding each step.
+
+    Args:
+        arr (List[int]): The array to sort.
+
+    Yields:
+        Tuple[int, int, int, int, Tuple[int, ...]]: The operation code, its
+        two operands, the message template id and the template arguments,
+        yielded after the operation is applied.
     """
-    steps = []
-    highlights = []
-    messages = []
     n = len(arr)
     swapped = True
     start = 0
     end = n - 1
-    steps.append(arr.copy())
-    highlights.append([])
-    messages.append("Initial array")
 
     while swapped:
         swapped = False
         for i in range(start, end):
-            highlights.append([i, i + 1])
-            steps.append(arr.copy())
-            messages.append(f"Comparing index {i} (value {arr[i]}) with index {i + 1} (value {arr[i + 1]}).")
+            yield COMPARE, i, i + 1, msg.COMPARE, (i, arr[i], i + 1, arr[i + 1])
             if arr[i] > arr[i + 1]:
                 arr[i], arr[i + 1] = arr[i + 1], arr[i]
                 swapped = True
-                steps.append(arr.copy())
-                highlights.append([i, i + 1])
-                messages.append(f"Swapped index {i} (value {arr[i]}) with index {i + 1} (value {arr[i + 1]}).")
+                yield SWAP, i, i + 1, msg.SWAP, (i, arr[i], i + 1, arr[i + 1])
         if not swapped:
             break
         swapped = False
@@ -547,16 +2727,149 @@ def cocktail_shaker_sort(arr: List[int]) -> Tuple[List[List[int]], List[List[int
 
         # Traverse the array from right to left
         for i in range(end - 1, start - 1, -1):
-            highlights.append([i, i + 1])
-            steps.append(arr.copy())
-            messages.append(f"Comparing index {i} (value {arr[i]}) with index {i + 1} (value {arr[i + 1]}).")
+            yield COMPARE, i, i + 1, msg.COMPARE, (i, arr[i], i + 1, arr[i + 1])
             if arr[i] > arr[i + 1]:
                 arr[i], arr[i + 1] = arr[i + 1], arr[i]
                 swapped = True
-                steps.append(arr.copy())
-                highlights.append([i, i + 1])
-                messages.append(f"Swapped index {i} (value {arr[i]}) with index {i + 1} (value {arr[i + 1]}).")
+                yield SWAP, i, i + 1, msg.SWAP, (i, arr[i], i + 1, arr[i + 1])
         start += 1
 
-    messages.append("Cocktail Shaker Sort completed.")
-    return steps, highlights, messages
+    yield NOTE, 0, 0, msg.COCKTAIL_SHAKER_SORT_COMPLETED, ()
+
+
+def count_cocktail_shaker_sort(arr: List[int]) -> Dict[str, int]:
+    """
+    Sorts the input array in place with Cocktail Shaker Sort, without tracing.
+
+    Args:
+        arr (List[int]): The array to sort.
+
+    Returns:
+        Dict[str, int]: The operation counts of iter_cocktail_shaker_sort's steps.
+    """
+    compares = swaps = 0
+    swapped = True
+    start = 0
+    end = len(arr) - 1
+
+    while swapped:
+        swapped = False
+        compares += max(0, end - start)
+        for i in range(start, end):
+            if arr[i] > arr[i + 1]:
+                arr[i], arr[i + 1] = arr[i + 1], arr[i]
+                swaps += 1
+                swapped = True
+        if not swapped:
+            break
+        swapped = False
+        end -= 1
+
+        compares += max(0, end - start)
+        for i in range(end - 1, start - 1, -1):
+            if arr[i] > arr[i + 1]:
+                arr[i], arr[i + 1] = arr[i + 1], arr[i]
+                swaps += 1
+                swapped = True
+        start += 1
+    return _counters(1, 0, compares, swaps)
+
+
+def cocktail_shaker_sort(arr: List[int], stream: bool = False, level: str = "full", **trace_options) -> SortOutput:
+    """
+    Performs Cocktail Shaker Sort on the input array.
+
+    Args:
+        arr (List[int]): The array to sort.
+        stream (bool): If True, steps are generated lazily as the returned
+            views are filled instead of sorting the whole array up front.
+        level (str): Recording level: "full" returns the trace views below,
+            "counters" only a dict of operation counts and "max_depth",
+            "none" only sorts and returns None.
+        **trace_options: Keyword arguments for traces.Trace, e.g.
+            backend="numpy" or keyframe_interval, or path="trace.bin" to
+            write the trace to a memory-mapped file (see tracefile.py).
+
+    Returns:
+        Tuple[Sequence[List[int]], Sequence[List[int]], Sequence[str]]:
+            - steps: Array state after each swap.
+            - highlights: Indices to highlight at each step.
+            - messages: Descriptive message for each step.
+    """
+    return _run(arr, iter_cocktail_shaker_sort(arr), stream, level,
+                counted=partial(count_cocktail_shaker_sort, arr), **trace_options)
+
+
+SORTING_ALGORITHMS: Dict[str, Callable[..., SortResult]] = {
+    "Selection Sort": selection_sort,
+    "Bubble Sort": bubble_sort,
+    "Insertion Sort": insertion_sort,
+    "Heap Sort": heap_sort,
+    "Quick Sort": quick_sort,
+    "Merge Sort": merge_sort,
+    "Timsort": timsort,
+    "Shell Sort": shell_sort,
+    "Counting Sort": counting_sort,
+    "Radix Sort": radix_sort,
+    "Cocktail Shaker Sort": cocktail_shaker_sort,
+}
+
+# Sorting functions that run on a process pool. They are not part of the
+# default selections, but resolve_algorithm accepts them.
+PARALLEL_ALGORITHMS: Dict[str, Callable[..., SortResult]] = {
+    "Parallel Merge Sort": parallel_merge_sort,
+    "Parallel Radix Sort": parallel_radix_sort,
+}
+
+# Sorting functions vectorized with NumPy, accepted by resolve_algorithm
+# and benchmarked by default when NumPy is installed.
+VECTORIZED_ALGORITHMS: Dict[str, Callable[..., SortResult]] = {
+    "NumPy Counting Sort": numpy_counting_sort,
+    "NumPy Radix Sort": numpy_radix_sort,
+}
+
+
+def _parse_option(value: str):
+    """Converts an option value from a spec to an int or bool where possible."""
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    try:
+        return int(value)
+    except ValueError:
+        return value
+
+
+def resolve_algorithm(spec: str) -> Tuple[str, Callable[..., SortOutput]]:
+    """
+    Looks up a sorting function from a command line spec.
+
+    A spec is a function name, optionally followed by keyword options for
+    it, e.g. "quick_sort" or "quick_sort:pivot=ninther,partition=three-way".
+    Integer and true/false option values are converted.
+
+    Args:
+        spec (str): The algorithm spec.
+
+    Returns:
+        Tuple[str, Callable[..., SortOutput]]: The display name, e.g.
+        "Quick Sort (pivot=ninther)", and the sorting function with the
+        options bound.
+
+    Raises:
+        ValueError: If the function is unknown or an option is malformed.
+    """
+    name, _, options_text = spec.partition(":")
+    functions = {func.__name__: (display, func)
+                 for display, func in {**SORTING_ALGORITHMS, **PARALLEL_ALGORITHMS, **VECTORIZED_ALGORITHMS}.items()}
+    if name not in functions:
+        raise ValueError(f"Unknown sorting algorithm {name!r}; expected one of {', '.join(functions)}.")
+    display, func = functions[name]
+    if not options_text:
+        return display, func
+    options = {}
+    for item in options_text.split(","):
+        key, separator, value = item.partition("=")
+        if not separator:
+            raise ValueError(f"Malformed option {item!r} in {spec!r}; expected key=value.")
+        options[key.strip()] = _parse_option(value.strip())
+    return f"{display} ({options_text})", partial(func, **options)
@@ -0,0 +1,333 @@
+import argparse
+import gc
+import json
+import math
+import platform
+import random
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from algorithms import (GAP_SEQUENCES, RECORDING_LEVELS, SORTING_ALGORITHMS, VECTORIZED_ALGORITHMS, np,
+                        parallel_radix_sort, resolve_algorithm)
+from tracepool import RADIX_PHASES
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+
+# Configurations benchmarked by default in addition to every algorithm's defaults.
+DEFAULT_VARIANTS = [f"shell_sort:gaps={sequence}" for sequence in GAP_SEQUENCES if sequence != "shell"]
+if np is not None:
+    DEFAULT_VARIANTS += [func.__name__ for func in VECTORIZED_ALGORITHMS.values()]
+
+
+def random_input(size: int, rng: random.Random) -> List[int]:
+    """Uniformly random values in [1, size]."""
+    return [rng.randint(1, size) for _ in range(size)]
+
+
+def sorted_input(size: int, rng: random.Random) -> List[int]:
+    """Already sorted values 1..size."""
+    return list(range(1, size + 1))
+
+
+def reversed_input(size: int, rng: random.Random) -> List[int]:
+    """Values size..1 in descending order."""
+    return list(range(size, 0, -1))
+
+
+def few_unique_input(size: int, rng: random.Random) -> List[int]:
+    """Random values drawn from only ten distinct keys."""
+    return [rng.randint(1, 10) for _ in range(size)]
+
+
+def nearly_sorted_input(size: int, rng: random.Random) -> List[int]:
+    """Sorted values with about 5% of the positions swapped at random."""
+    arr = list(range(1, size + 1))
+    for _ in range(max(1, size // 20)):
+        i, j = rng.randrange(size), rng.randrange(size)
+        arr[i], arr[j] = arr[j], arr[i]
+    return arr
+
+
+DISTRIBUTIONS: Dict[str, Callable[[int, random.Random], List[int]]] = {
+    "random": random_input,
+    "sorted": sorted_input,
+    "reversed": reversed_input,
+    "few-unique": few_unique_input,
+    "nearly-sorted": nearly_sorted_input,
+}
+
+
+def make_input(distribution: str, size: int, seed: int = 0) -> List[int]:
+    """
+    Builds a reproducible benchmark input.
+
+    Args:
+        distribution (str): A key of DISTRIBUTIONS.
+        size (int): Length of the array.
+        seed (int): Seed for the random generator.
+
+    Returns:
+        List[int]: The input array.
+    """
+    return DISTRIBUTIONS[distribution](size, random.Random(f"{seed}:{distribution}:{size}"))
+
+
+def measure(sort_func: Callable, array: List[int], repeat: int = 1, memory: bool = True,
+            level: str = "full") -> Dict:
+    """
+    Runs one sorting function on one input and collects its metrics.
+
+    Wall time is the best of `repeat` runs without tracemalloc. Peak memory is
+    taken from a separate run under tracemalloc, which slows execution down.
+
+    Args:
+        sort_func (Callable): A sorting function from algorithms.py.
+        array (List[int]): The input array; it is copied before every run.
+        repeat (int): Number of timed runs.
+        memory (bool): Whether to measure peak memory.
+        level (str): Recording level passed to the sorting function.
+
+    Returns:
+        Dict: seconds and peak_bytes, plus per-operation counts for the
+        "counters" and "full" levels and the trace length for "full".
+    """
+    seconds = math.inf
+    for _ in range(repeat):
+        arr = list(array)
+        gc.collect()
+        start = time.perf_counter()
+        output = sort_func(arr, level=level)
+        seconds = min(seconds, time.perf_counter() - start)
+    if arr != sorted(array):
+        raise AssertionError(f"{getattr(sort_func, 'func', sort_func).__name__} did not sort its input.")
+
+    result = {"seconds": round(seconds, 6), "level": level}
+    if level == "full":
+        steps = output[0]
+        result["steps"] = len(steps)
+        result.update(steps.trace.op_counts())
+    elif level == "counters":
+        result.update(output)
+    del output
+
+    if memory:
+        arr = list(array)
+        gc.collect()
+        tracemalloc.start()
+        try:
+            output = sort_func(arr, level=level)
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def run_benchmarks(algorithms: List[str], sizes: List[int], distributions: List[str], seed: int = 0,
+                   repeat: int = 1, memory: bool = True, time_limit: float = 10.0,
+                   level: str = "full", verbose: bool = False) -> List[Dict]:
+    """
+    Sweeps every algorithm over every distribution and size.
+
+    Sizes are run in increasing order. Once the projected time of the next
+    size exceeds `time_limit`, that size and all larger ones are recorded as
+    skipped for the (algorithm, distribution) pair. The projection assumes
+    quadratic growth until two sizes have been measured, and then uses the
+    observed growth rate.
+
+    Args:
+        algorithms (List[str]): Algorithm specs for algorithms.resolve_algorithm, e.g.
+            "bubble_sort" or "quick_sort:pivot=median-of-three".
+        sizes (List[int]): Input sizes.
+        distributions (List[str]): Keys of DISTRIBUTIONS.
+        seed (int): Seed for input generation.
+        repeat (int): Number of timed runs per measurement.
+        memory (bool): Whether to measure peak memory.
+        time_limit (float): Projected seconds above which larger sizes are skipped.
+        level (str): Recording level passed to the sorting functions.
+        verbose (bool): Print each result as it is produced.
+
+    Returns:
+        List[Dict]: One record per (algorithm, distribution, size).
+    """
+    results = []
+    for name in algorithms:
+        sort_func = resolve_algorithm(name)[1]
+        for distribution in distributions:
+            previous = []
+            skip_reason = None
+            for size in sorted(sizes):
+                record = {"algorithm": name, "distribution": distribution, "size": size}
+                if skip_reason is None and previous:
+                    (n1, t1), (n2, t2) = ([(0, 0)] + previous)[-2:]
+                    exponent = 2.0
+                    if n1 and t1 > 0 and t2 > 0:
+                        exponent = min(2.0, max(1.0, math.log(t2 / t1) / math.log(n2 / n1)))
+                    if t2 * (size / n2) ** exponent > time_limit:
+                        skip_reason = f"projected to exceed {time_limit:g}s"
+                if skip_reason is not None:
+                    record["status"] = "skipped"
+                    record["reason"] = skip_reason
+                else:
+                    try:
+                        record.update(measure(sort_func, make_input(distribution, size, seed), repeat, memory, level))
+                        record["status"] = "ok"
+                        previous.append((size, record["seconds"]))
+                    except (RecursionError, MemoryError) as exc:
+                        record["status"] = "error"
+                        record["reason"] = type(exc).__name__
+                        skip_reason = f"failed at size {size}"
+                results.append(record)
+                if verbose:
+                    print(format_record(record), flush=True)
+    return results
+
+
+def run_scaling(sizes: List[int], processes: List[int], distribution: str = "random", seed: int = 0,
+                base: int = 256, verbose: bool = False) -> List[Dict]:
+    """
+    Times parallel_radix_sort phase by phase for every size and worker count.
+
+    Args:
+        sizes (List[int]): Input sizes.
+        processes (List[int]): Worker counts; speedups are relative to the first.
+        distribution (str): A key of DISTRIBUTIONS.
+        seed (int): Seed for input generation.
+        base (int): Radix of the sort, a power of two.
+        verbose (bool): Print each result as it is produced.
+
+    Returns:
+        List[Dict]: One record per (size, processes) with the total seconds,
+        the speedup and the seconds of each of tracepool.RADIX_PHASES.
+    """
+    results = []
+    for size in sorted(sizes):
+        array = make_input(distribution, size, seed)
+        baseline = None
+        for count in processes:
+            arr = list(array)
+            timings = {}
+            gc.collect()
+            start = time.perf_counter()
+            parallel_radix_sort(arr, level="none", processes=count, base=base, timings=timings)
+            seconds = time.perf_counter() - start
+            if arr != sorted(array):
+                raise AssertionError("parallel_radix_sort did not sort its input.")
+            baseline = baseline or seconds
+            record = {"algorithm": f"parallel_radix_sort:base={base}", "distribution": distribution,
+                      "size": size, "processes": count, "seconds": round(seconds, 6),
+                      "speedup": round(baseline / seconds, 3)}
+            record.update({f"{phase}_seconds": round(timings[phase], 6) for phase in RADIX_PHASES})
+            results.append(record)
+            if verbose:
+                print(format_scaling_record(record), flush=True)
+    return results
+
+
+def format_scaling_record(record: Dict) -> str:
+    """Formats one scaling record as a table row."""
+    phases = " ".join(f"{phase} {record[phase + '_seconds']:8.4f}s" for phase in RADIX_PHASES)
+    return (f"{record['size']:>9} x{record['processes']:<3} {record['seconds']:10.4f}s "
+            f"{record['speedup']:6.2f}x  {phases}")
+
+
+def format_record(record: Dict) -> str:
+    """Formats one benchmark record as a table row."""
+    head = f"{record['algorithm']:<22} {record['distribution']:<14} {record['size']:>7}"
+    if record["status"] != "ok":
+        return f"{head}  {record['status']}: {record['reason']}"
+    line = f"{head} {record['seconds']:10.4f}s"
+    if "steps" in record:
+        line += f" {record['steps']:>11} steps"
+    if "compares" in record:
+        line += f" {record['compares']:>10} cmp {record['swaps']:>10} swp {record['writes']:>10} wr"
+    if "peak_bytes" in record:
+        line += f" {record['peak_bytes'] / 2 ** 20:9.2f} MiB"
+    return line
+
+
+def compare_results(old: Dict, new: Dict) -> List[str]:
+    """
+    Lines comparing two benchmark result files, one per shared measurement.
+
+    Args:
+        old (Dict): Baseline results as written by main().
+        new (Dict): New results as written by main().
+
+    Returns:
+        List[str]: Time ratios (new / old), and step ratios where both runs
+        recorded full traces, for measurements present in both.
+    """
+    def key(record):
+        return record["algorithm"], record["distribution"], record["size"]
+
+    baseline = {key(record): record for record in old["results"] if record["status"] == "ok"}
+    lines = []
+    for record in new["results"]:
+        before = baseline.get(key(record))
+        if before is None or record["status"] != "ok":
+            continue
+        time_ratio = record["seconds"] / before["seconds"] if before["seconds"] else math.inf
+        line = f"{record['algorithm']:<22} {record['distribution']:<14} {record['size']:>7} time x{time_ratio:6.2f}"
+        if "steps" in record and before.get("steps"):
+            line += f"  steps x{record['steps'] / before['steps']:6.2f}"
+        lines.append(line)
+    return lines
+
+
+def main():
+    """
+    Command line entry point: runs the benchmark sweep or compares two result files.
+    """
+    functions = [func.__name__ for func in SORTING_ALGORITHMS.values()] + DEFAULT_VARIANTS
+    parser = argparse.ArgumentParser(description="Benchmark the sorting algorithms and their traces.")
+    parser.add_argument("--algorithms", nargs="+", default=functions,
+                        help="Function names from algorithms.py, optionally with options, e.g. quick_sort:pivot=random.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--distributions", nargs="+", default=list(DISTRIBUTIONS), choices=list(DISTRIBUTIONS))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1, help="Timed runs per measurement; the best is kept.")
+    parser.add_argument("--time-limit", type=float, default=10.0, help="Skip sizes projected to take longer (seconds).")
+    parser.add_argument("--level", default="full", choices=RECORDING_LEVELS,
+                        help="Recording level: full traces, operation counters only, or none.")
+    parser.add_argument("--no-memory", action="store_true", help="Skip the tracemalloc peak memory run.")
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="Compare two JSON result files.")
+    parser.add_argument("--scaling", nargs="+", type=int, metavar="PROCESSES",
+                        help="Instead of the sweep, time the phases of parallel_radix_sort for each worker count.")
+    parser.add_argument("--base", type=int, default=256, help="Radix of the --scaling sort, a power of two.")
+    args = parser.parse_args()
+    for spec in args.algorithms:
+        try:
+            resolve_algorithm(spec)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    if args.compare:
+        with open(args.compare[0]) as old, open(args.compare[1]) as new:
+            for line in compare_results(json.load(old), json.load(new)):
+                print(line)
+        return
+
+    if args.scaling:
+        results = [record for distribution in args.distributions
+                   for record in run_scaling(args.sizes, args.scaling, distribution, seed=args.seed,
+                                             base=args.base, verbose=True)]
+    else:
+        results = run_benchmarks(args.algorithms, args.sizes, args.distributions, seed=args.seed,
+                                 repeat=args.repeat, memory=not args.no_memory,
+                                 time_limit=args.time_limit, level=args.level, verbose=True)
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,75 +1,105 @@
+import argparse
+import math
 import random
-from multiprocessing import Process
-from algorithms import (
-    selection_sort,
-    bubble_sort,
-    insertion_sort,
-    heap_sort,
-    quick_sort,
-    merge_sort,
-    shell_sort,
-    counting_sort,
-    radix_sort,
-    cocktail_shaker_sort
-)
-from visualizer import (
-    visualize_selection_sort,
-    visualize_bubble_sort,
-    visualize_insertion_sort,
-    visualize_heap_sort,
-    visualize_quick_sort,
-    visualize_merge_sort,
-    visualize_shell_sort,
-    visualize_counting_sort,
-    visualize_radix_sort,
-    visualize_cocktail_shaker_sort
-)
-
-
-def run_visualization(sort_func, visualize_func, array):
-    """
-    Runs the sorting algorithm and its visualization.
-
-    Args:
-        sort_func (Callable): The sorting function to execute.
-        visualize_func (Callable): The visualization function to display the sorting process.
-        array (List[int]): The array to sort.
-    """
-    steps, highlights, messages = sort_func(array.copy())
-    visualize_func(steps, highlights, messages)
+from concurrent.futures import ProcessPoolExecutor
+from algorithms import SORTING_ALGORITHMS, resolve_algorithm
+from race import COST_MODELS, COST_UNITS, cumulative_costs, measure_seconds
+from tracecache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, TraceCache, cacheable
+from tracepool import generate_traces
+from visualizer import visualize_dashboard
 
 
 def main():
     """
     Main function to execute sorting algorithms and their visualizations.
-    """
-    array_size = 20 
-    array = [random.randint(1, 100) for _ in range(array_size)]
-    print("Original array:", array)
 
-    sorting_algorithms = [
-        ("Selection Sort", selection_sort, visualize_selection_sort),
-        ("Bubble Sort", bubble_sort, visualize_bubble_sort),
-        ("Insertion Sort", insertion_sort, visualize_insertion_sort),
-        ("Heap Sort", heap_sort, visualize_heap_sort),
-        ("Quick Sort", quick_sort, visualize_quick_sort),
-        ("Merge Sort", merge_sort, visualize_merge_sort),
-        ("Shell Sort", shell_sort, visualize_shell_sort),
-        ("Counting Sort", counting_sort, visualize_counting_sort),
-        ("Radix Sort", radix_sort, visualize_radix_sort),
-        ("Cocktail Shaker Sort", cocktail_shaker_sort, visualize_cocktail_shaker_sort)
-    ]
+    All selected algorithms sort the same array and are shown side by side
+    in a single window. With --race, they are replayed against a shared
+    clock counting the chosen cost, so that they advance at their relative speed.
 
-    processes = []
+    Traces are kept in an on-disk cache, so running again on the same input
+    (see --seed) with unchanged algorithms reads them back instead of sorting.
+    Without --race, traces missing from the cache are streamed to the window
+    while worker processes record them into the cache.
+    """
+    functions = [sort_func.__name__ for sort_func in SORTING_ALGORITHMS.values()]
+    parser = argparse.ArgumentParser(description="Visualize sorting algorithms side by side.")
+    parser.add_argument("--algorithms", nargs="+", default=functions,
+                        help="Function names from algorithms.py, optionally with options, e.g. quick_sort:pivot=ninther.")
+    parser.add_argument("--size", type=int, default=20, help="Length of the random input array.")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Seed of the random input array, so that later runs can reuse the cached traces.")
+    parser.add_argument("--race", choices=COST_MODELS, default=None,
+                        help="Race the algorithms on a clock counting steps, comparisons, writes or measured time.")
+    parser.add_argument("--duration", type=float, default=30.0,
+                        help="In a race, seconds the slowest algorithm takes at the initial speed.")
+    parser.add_argument("--processes", type=int, default=None,
+                        help="Worker processes recording the traces. Defaults to the CPU count.")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR, help="Directory of the trace cache.")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // 2 ** 20,
+                        help="Size bound of the trace cache in MiB; least recently used traces are evicted.")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Neither read nor write cached traces; without a race, traces are then streamed.")
+    args = parser.parse_args()
+    try:
+        selected = [resolve_algorithm(spec) for spec in args.algorithms]
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    array_size = args.size
+    rng = random.Random(args.seed)
+    array = [rng.randint(1, 100) for _ in range(array_size)]
+    print("Original array:", array)
 
-    for name, sort_func, visualize_func in sorting_algorithms:
-        print(f"\nPerforming {name}...")
-        p = Process(target=run_visualization, args=(sort_func, visualize_func, array))
-        p.start()
-        processes.append(p)
+    cache = None if args.no_cache else TraceCache(args.cache_dir, args.cache_size * 2 ** 20)
+    runs = []
+    costs = []
+    recorder = None
+    recordings = []
+    if args.race is None:
+        for name, sort_func in selected:
+            trace = cache.get(sort_func, array) if cache else None
+            if trace is not None:
+                runs.append((name, *trace.views()))
+                continue
+            print(f"\nPerforming {name}...")
+            steps, highlights, messages = sort_func(array.copy(), stream=True)
+            runs.append((name, steps, highlights, messages))
+            if cache is not None and cacheable(sort_func):
+                # The window replays the streamed trace; a worker records its
+                # own copy into the cache, so the window opens without waiting.
+                if recorder is None:
+                    recorder = ProcessPoolExecutor(max_workers=args.processes)
+                recordings.append(recorder.submit(cache.store, sort_func, array))
+    else:
+        # A race needs the cost of every step up front, so the traces
+        # missing from the cache are recorded in full, in parallel, before
+        # the window opens.
+        traces = [cache.get(sort_func, array) if cache else None for name, sort_func in selected]
+        missing = [index for index, trace in enumerate(traces) if trace is None]
+        if missing:
+            print(f"\nPerforming {', '.join(selected[index][0] for index in missing)}...")
+            recorded = generate_traces([selected[index][1] for index in missing], array, processes=args.processes)
+            for index, trace in zip(missing, recorded):
+                traces[index] = trace
+                if cache is not None:
+                    cache.put(selected[index][1], array, trace)
+        for (name, sort_func), trace in zip(selected, traces):
+            seconds = measure_seconds(sort_func, array) if args.race == "time" else 0.0
+            costs.append(cumulative_costs(trace, args.race, seconds))
+            print(f"{name} costs {costs[-1][-1]:g} {COST_UNITS[args.race].lower()}.")
+            runs.append((name, *trace.views()))
 
-    for p in processes:
-        p.join()
+    if args.race is None:
+        visualize_dashboard(runs)
+        if recorder is not None:
+            print("Saving the traces to the cache...")
+            with recorder:
+                for recording in recordings:
+                    recording.result()
+    else:
+        speed = max(1, math.ceil(max(cost[-1] for cost in costs) / args.duration))
+        visualize_dashboard(runs, costs=costs, speed=speed, unit=COST_UNITS[args.race])
 
 
 if __name__ == "__main__":
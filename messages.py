@@ -0,0 +1,227 @@
+from typing import Dict, Sequence, Tuple
+
+# Message template ids. Traces store one id plus integer arguments per step
+# and only format the text when a step is displayed, so ids must stay stable.
+INITIAL_ARRAY = 0
+EMPTY_ARRAY = 1
+COMPARE = 2
+SWAP = 3
+SELECT_MINIMUM = 4
+NEW_MINIMUM = 5
+NO_SWAP = 6
+START_PASS = 7
+PASS_SORTED = 8
+INSERTING = 9
+COMPARE_KEY = 10
+MOVED = 11
+INSERTED_KEY = 12
+COMPARE_LEFT_CHILD = 13
+COMPARE_RIGHT_CHILD = 14
+NEW_LARGEST = 15
+CHOOSE_PIVOT = 16
+COMPARE_PIVOT = 17
+SWAP_PIVOT = 18
+MERGE_COMPARE = 19
+PLACED_LEFT = 20
+PLACED_RIGHT = 21
+MERGED = 22
+GAP_SIZE = 23
+INSERTED_VALUE = 24
+COUNTING_NUMBER = 25
+UPDATE_COUNT = 26
+PLACING_NUMBER = 27
+SETTING = 28
+DIGIT_PASS = 29
+COUNTING_DIGIT = 30
+UPDATE_DIGIT_COUNT = 31
+SELECTION_SORT_COMPLETED = 32
+BUBBLE_SORT_COMPLETED = 33
+INSERTION_SORT_COMPLETED = 34
+HEAP_SORT_COMPLETED = 35
+QUICK_SORT_COMPLETED = 36
+MERGE_SORT_COMPLETED = 37
+SHELL_SORT_COMPLETED = 38
+COUNTING_SORT_COMPLETED = 39
+RADIX_SORT_COMPLETED = 40
+COCKTAIL_SHAKER_SORT_COMPLETED = 41
+MEDIAN_OF_THREE = 42
+RANDOM_PIVOT = 43
+COMPARE_PIVOT_VALUE = 44
+EQUAL_TO_PIVOT = 45
+MIN_RUN = 46
+RUN_FOUND = 47
+DESCENDING_RUN = 48
+BINARY_SEARCH = 49
+RUN_PUSHED = 50
+MERGE_RUNS = 51
+ALREADY_PLACED = 52
+GALLOP_MODE = 53
+GALLOP_COMPARE = 54
+TIMSORT_COMPLETED = 55
+KEY_OFFSET = 56
+DIGIT_PASS_BASE = 57
+MSD_BUCKET = 58
+CHUNK_SORTED = 59
+K_WAY_MERGE = 60
+K_WAY_COMPARE = 61
+TAKE_FROM_CHUNK = 62
+PARALLEL_MERGE_SORT_COMPLETED = 63
+WORKER_HISTOGRAM = 64
+SCATTER_OFFSETS = 65
+PARALLEL_RADIX_SORT_COMPLETED = 66
+VALUE_HISTOGRAM = 67
+VALUE_PREFIX_SUM = 68
+VALUE_SCATTER = 69
+DIGIT_HISTOGRAM = 70
+DIGIT_PREFIX_SUM = 71
+DIGIT_SCATTER = 72
+DIGIT_SKIPPED = 73
+
+TEMPLATES: Dict[int, str] = {
+    INITIAL_ARRAY: "Initial array",
+    EMPTY_ARRAY: "Empty array. Nothing to sort.",
+    COMPARE: "Comparing index {0} (value {1}) with index {2} (value {3}).",
+    SWAP: "Swapped index {0} (value {1}) with index {2} (value {3}).",
+    SELECT_MINIMUM: "Selecting index {0} as the initial minimum.",
+    NEW_MINIMUM: "New minimum found at index {0} (value {1}).",
+    NO_SWAP: "No swap needed.",
+    START_PASS: "Starting pass {0}.",
+    PASS_SORTED: "No swaps in this pass. Array is sorted.",
+    INSERTING: "Inserting element at index {0} (value {1}).",
+    COMPARE_KEY: "Comparing key (value {0}) with index {1} (value {2}).",
+    MOVED: "Moved value {0} from index {1} to index {2}.",
+    INSERTED_KEY: "Inserted key (value {0}) at index {1}.",
+    COMPARE_LEFT_CHILD: "Comparing index {0} (value {1}) with left child index {2} (value {3}).",
+    COMPARE_RIGHT_CHILD: "Comparing index {0} (value {1}) with right child index {2} (value {3}).",
+    NEW_LARGEST: "New largest found at index {0} (value {1}).",
+    CHOOSE_PIVOT: "Choosing pivot at index {0} (value {1}).",
+    COMPARE_PIVOT: "Comparing index {0} (value {1}) with pivot index {2} (value {3}).",
+    SWAP_PIVOT: "Swapped pivot index {0} (value {1}) with index {2} (value {3}).",
+    MERGE_COMPARE: "Merging: Comparing {0} (left) with {1} (right).",
+    PLACED_LEFT: "Placed {0} from left into position {1}.",
+    PLACED_RIGHT: "Placed {0} from right into position {1}.",
+    MERGED: "Merged subarrays into positions {0} to {1}.",
+    GAP_SIZE: "Using gap size {0}.",
+    INSERTED_VALUE: "Inserted value {0} at index {1}.",
+    COUNTING_NUMBER: "Counting number {0}. Current count: {1}.",
+    UPDATE_COUNT: "Updating count for value {0}: {1}.",
+    PLACING_NUMBER: "Placing number {0} at position {1}.",
+    SETTING: "Setting arr[{0}] to {1}.",
+    DIGIT_PASS: "Sorting based on digit at exponent {0}.",
+    COUNTING_DIGIT: "Counting digit {0}.",
+    UPDATE_DIGIT_COUNT: "Updating count for digit {0}: {1}.",
+    SELECTION_SORT_COMPLETED: "Selection Sort completed.",
+    BUBBLE_SORT_COMPLETED: "Bubble Sort completed.",
+    INSERTION_SORT_COMPLETED: "Insertion Sort completed.",
+    HEAP_SORT_COMPLETED: "Heap Sort completed.",
+    QUICK_SORT_COMPLETED: "Quick Sort completed.",
+    MERGE_SORT_COMPLETED: "Merge Sort completed.",
+    SHELL_SORT_COMPLETED: "Shell Sort completed.",
+    COUNTING_SORT_COMPLETED: "Counting Sort completed.",
+    RADIX_SORT_COMPLETED: "Radix Sort completed.",
+    COCKTAIL_SHAKER_SORT_COMPLETED: "Cocktail Shaker Sort completed.",
+    MEDIAN_OF_THREE: "Median of indices {0}, {1} and {2} is index {3}.",
+    RANDOM_PIVOT: "Picked index {0} (value {1}) at random.",
+    COMPARE_PIVOT_VALUE: "Comparing index {0} (value {1}) with pivot value {2}.",
+    EQUAL_TO_PIVOT: "Indices {0} to {1} hold the pivot value {2}.",
+    MIN_RUN: "Minimum run length is {0}.",
+    RUN_FOUND: "Found a sorted run at indices {0} to {1}.",
+    DESCENDING_RUN: "Reversing the descending run at indices {0} to {1}.",
+    BINARY_SEARCH: "Binary search: comparing {0} with index {1} (value {2}).",
+    RUN_PUSHED: "Pushed the run at indices {0} to {1}; {2} runs pending.",
+    MERGE_RUNS: "Merging runs at indices {0} to {1} and {2} to {3}.",
+    ALREADY_PLACED: "Indices {0} to {1} are already in place.",
+    GALLOP_MODE: "Galloping (threshold {0}).",
+    GALLOP_COMPARE: "Galloping: comparing {0} with {1} (index {2}).",
+    TIMSORT_COMPLETED: "Timsort completed.",
+    KEY_OFFSET: "Adding {0} to every key so that no key is negative.",
+    DIGIT_PASS_BASE: "Sorting by digit {0} in base {1}.",
+    MSD_BUCKET: "Sorting indices {0} to {1} by digit {2} in base {3}.",
+    CHUNK_SORTED: "Worker {0} sorted indices {1} to {2}.",
+    K_WAY_MERGE: "Merging {0} sorted chunks.",
+    K_WAY_COMPARE: "K-way merge: comparing {0} (chunk {1}) with {2} (chunk {3}).",
+    TAKE_FROM_CHUNK: "Placed {0} from chunk {1} at index {2}.",
+    PARALLEL_MERGE_SORT_COMPLETED: "Parallel Merge Sort completed.",
+    WORKER_HISTOGRAM: "Worker {0} counted the digits of indices {1} to {2}: {3} distinct.",
+    SCATTER_OFFSETS: "Computed where each of {0} workers writes each digit; workers scattered their values.",
+    PARALLEL_RADIX_SORT_COMPLETED: "Parallel Radix Sort completed.",
+    VALUE_HISTOGRAM: "Counted {0} values into {1} buckets, {2} of them used.",
+    VALUE_PREFIX_SUM: "Computed where every bucket starts; the last one starts at index {0}.",
+    VALUE_SCATTER: "Placed all {0} values at their bucket positions.",
+    DIGIT_HISTOGRAM: "Counted digit {0} in base {1}: {2} buckets used.",
+    DIGIT_PREFIX_SUM: "Computed where every digit {0} bucket starts; the last used one starts at index {1}.",
+    DIGIT_SCATTER: "Moved all {0} values to their digit {1} buckets.",
+    DIGIT_SKIPPED: "Every value has the same digit {0}; nothing to move.",
+}
+
+# Positions of the template arguments that are array indices, so that steps
+# recorded on a slice of the array can be moved to their global position.
+INDEX_ARGS: Dict[int, Tuple[int, ...]] = {
+    COMPARE: (0, 2),
+    SWAP: (0, 2),
+    SELECT_MINIMUM: (0,),
+    NEW_MINIMUM: (0,),
+    INSERTING: (0,),
+    COMPARE_KEY: (1,),
+    MOVED: (1, 2),
+    INSERTED_KEY: (1,),
+    COMPARE_LEFT_CHILD: (0, 2),
+    COMPARE_RIGHT_CHILD: (0, 2),
+    NEW_LARGEST: (0,),
+    CHOOSE_PIVOT: (0,),
+    COMPARE_PIVOT: (0, 2),
+    SWAP_PIVOT: (0, 2),
+    PLACED_LEFT: (1,),
+    PLACED_RIGHT: (1,),
+    MERGED: (0, 1),
+    INSERTED_VALUE: (1,),
+    PLACING_NUMBER: (1,),
+    SETTING: (0,),
+    MEDIAN_OF_THREE: (0, 1, 2, 3),
+    RANDOM_PIVOT: (0,),
+    COMPARE_PIVOT_VALUE: (0,),
+    EQUAL_TO_PIVOT: (0, 1),
+    RUN_FOUND: (0, 1),
+    DESCENDING_RUN: (0, 1),
+    BINARY_SEARCH: (1,),
+    RUN_PUSHED: (0, 1),
+    MERGE_RUNS: (0, 1, 2, 3),
+    ALREADY_PLACED: (0, 1),
+    GALLOP_COMPARE: (2,),
+    MSD_BUCKET: (0, 1),
+    CHUNK_SORTED: (1, 2),
+    TAKE_FROM_CHUNK: (2,),
+    WORKER_HISTOGRAM: (1, 2),
+}
+
+# Templates that open a new pass of an algorithm's outer loop, used by the
+# visualizer's "Next Pass" navigation.
+PASS_MESSAGES = (
+    START_PASS,
+    SELECT_MINIMUM,
+    INSERTING,
+    CHOOSE_PIVOT,
+    MERGED,
+    RUN_FOUND,
+    MERGE_RUNS,
+    GAP_SIZE,
+    DIGIT_PASS,
+    DIGIT_PASS_BASE,
+    MSD_BUCKET,
+    K_WAY_MERGE,
+    DIGIT_HISTOGRAM,
+)
+
+
+def format_message(template: int, args: Sequence[int]) -> str:
+    """
+    Renders a message template with its arguments.
+
+    Args:
+        template (int): The message template id.
+        args (Sequence[int]): The integer arguments of the template.
+
+    Returns:
+        str: The formatted message.
+    """
+    return TEMPLATES[template].format(*args)
@@ -0,0 +1,209 @@
+import math
+from typing import List
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
+
+BAR_COLOR = to_rgba('red')
+HIGHLIGHT_COLOR = to_rgba('blue')
+
+
+def create_figure():
+    """
+    Creates a Matplotlib figure with two subplots:
+    - Top subplot for the bar chart.
+    - Bottom subplot for descriptive messages.
+
+    Returns:
+        Tuple[Figure, Axes, Axes, Text]:
+            - fig: The Matplotlib figure object.
+            - ax_bar: The Axes for the bar chart.
+            - ax_text: The Axes for the messages.
+            - message_text: The Text object for displaying messages.
+    """
+    fig = Figure(figsize=(6, 4))
+    ax_bar, ax_text = fig.subplots(2, 1)
+    fig.tight_layout(pad=3.0)
+
+    # Bar chart configuration
+    ax_bar.set_title("Sorting Visualization", fontsize=14)
+    ax_bar.set_xlabel("Index", fontsize=10)
+    ax_bar.set_ylabel("Value", fontsize=10)
+    ax_bar.set_xlim(0, 1) 
+    ax_bar.set_ylim(0, 1) 
+    ax_bar.grid(True, which='both', linestyle='--', linewidth=0.5)
+
+    # Text box configuration
+    ax_text.axis('off')  
+    message_text = ax_text.text(0.5, 0.5, "", fontsize=10, ha='center', va='center', wrap=True, animated=True)
+
+    return fig, ax_bar, ax_text, message_text
+
+
+def create_dashboard_figure(count: int, columns: int):
+    """
+    Creates a Matplotlib figure with a grid of panels, each made of a bar
+    chart above a message area, for showing several algorithms at once.
+
+    Args:
+        count (int): Number of panels.
+        columns (int): Number of panels per row.
+
+    Returns:
+        Tuple[Figure, List[Tuple[Axes, Axes, Text]]]:
+            - fig: The Matplotlib figure object.
+            - panels: The bar chart Axes, message Axes and message Text of each panel.
+    """
+    rows = math.ceil(count / columns)
+    fig = Figure(figsize=(3.2 * columns, 3.0 * rows))
+    grid = fig.add_gridspec(rows, columns, left=0.04, right=0.98, bottom=0.03, top=0.95, hspace=0.35, wspace=0.2)
+    panels = []
+    for k in range(count):
+        cell = grid[k // columns, k % columns].subgridspec(2, 1, height_ratios=[4, 1], hspace=0.1)
+        ax_bar = fig.add_subplot(cell[0])
+        ax_text = fig.add_subplot(cell[1])
+        ax_text.axis('off')
+        # Long messages are clipped to the panel, where the blitter restores the background.
+        message_text = ax_text.text(0.5, 0.5, "", fontsize=7, ha='center', va='center', wrap=True,
+                                    animated=True, clip_on=True)
+        panels.append((ax_bar, ax_text, message_text))
+    return fig, panels
+
+
+def initialize_bars(ax_bar, array: List[int]):
+    """
+    Initializes the bar chart with the initial array.
+
+    Bars are animated artists: full canvas draws leave them out so that the
+    static background can be cached and the bars blitted on top of it.
+
+    Args:
+        ax_bar (Axes): The Axes object for the bar chart.
+        array (List[int]): The array to visualize.
+
+    Returns:
+        BarContainer: The bar container object.
+    """
+    ax_bar.clear()
+    ax_bar.set_title("Sorting Visualization", fontsize=14)
+    ax_bar.set_xlabel("Index", fontsize=10)
+    ax_bar.set_ylabel("Value", fontsize=10)
+    ax_bar.set_xlim(0, max(1, len(array)))
+    # Negative values, which radix sort accepts, get bars below zero.
+    low = min(0, min(array, default=0)) * 1.1
+    high = max(0, max(array, default=0)) * 1.1
+    ax_bar.set_ylim(low, high if high > low else 1)
+    ax_bar.grid(True, which='both', linestyle='--', linewidth=0.5)
+    bars = ax_bar.bar(range(len(array)), array, align="edge", color=BAR_COLOR,
+                      linewidth=0, antialiased=False, animated=True)
+    return bars
+
+
+def update_visualization(bars, array: List[int], highlights: List[int], message_text, message: str) -> List[int]:
+    """
+    Updates the bar chart and the descriptive message.
+
+    Only bars whose height or highlight differs from what they currently
+    show are touched.
+
+    Args:
+        bars (BarContainer): The bar container object.
+        array (List[int]): The current state of the array.
+        highlights (List[int]): Indices to highlight in the current step.
+        message_text (Text): The Text object for displaying messages.
+        message (str): The descriptive message for the current step.
+
+    Returns:
+        List[int]: Indices of the bars that changed.
+    """
+    highlighted = set(highlights)
+    changed = []
+    for idx, (bar, val) in enumerate(zip(bars, array)):
+        color = HIGHLIGHT_COLOR if idx in highlighted else BAR_COLOR
+        if bar.get_height() != val or bar.get_facecolor() != color:
+            bar.set_height(val)
+            bar.set_color(color)
+            changed.append(idx)
+
+    message_text.set_text(message)
+    return changed
+
+
+class BarBlitter:
+    """
+    Blits changed bars and the message onto a cached static background.
+
+    The background (axes, grid, labels and title) is captured after every
+    full canvas draw, one region per bar slot plus one for the message, so a
+    step only restores and redraws the slots of the bars that changed.
+    """
+
+    def __init__(self, canvas, ax_bar, bars, message_text):
+        """
+        Hooks the blitter into the canvas draw cycle.
+
+        Args:
+            canvas (FigureCanvasAgg): The canvas the figure is drawn on.
+            ax_bar (Axes): The Axes for the bar chart.
+            bars (BarContainer): The bar container object.
+            message_text (Text): The Text object for displaying messages.
+        """
+        self.canvas = canvas
+        self.ax_bar = ax_bar
+        self.bars = bars
+        self.message_text = message_text
+        self._slots = []
+        self._backgrounds = []
+        self._text_bbox = None
+        self._text_background = None
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        """
+        Captures the freshly drawn background and paints the animated artists on it.
+        """
+        canvas, ax_bar = self.canvas, self.ax_bar
+        # Slot i spans data x in [i - 0.1, i + 0.9), which contains bar i
+        # ([i, i + 0.8]) and never overlaps the neighbouring slots.
+        y0, y1 = ax_bar.get_ylim()
+        edges = [ax_bar.transData.transform((i - 0.1, y0)) for i in range(len(self.bars) + 1)]
+        top = math.ceil(ax_bar.transData.transform((0, y1))[1])
+        bottom = math.floor(edges[0][1])
+        self._slots = [
+            Bbox.from_extents(round(edges[i][0]), bottom, round(edges[i + 1][0]), top)
+            for i in range(len(self.bars))
+        ]
+        self._backgrounds = [canvas.copy_from_bbox(slot) for slot in self._slots]
+        # Pad the message region so that pixels on its edges (clipped text
+        # is rasterised slightly beyond the axes) are restored as well.
+        ax_text = self.message_text.axes
+        self._text_bbox = Bbox.intersection(ax_text.bbox.padded(2), ax_text.figure.bbox)
+        self._text_background = canvas.copy_from_bbox(self._text_bbox)
+        for bar in self.bars:
+            ax_bar.draw_artist(bar)
+        self.message_text.axes.draw_artist(self.message_text)
+
+    def blit(self, changed: List[int]):
+        """
+        Redraws the given bars and the message without a full canvas draw.
+
+        Args:
+            changed (List[int]): Indices of the bars that changed.
+        """
+        if not self._backgrounds:
+            self.canvas.draw()
+            return
+        canvas, ax_bar, bars = self.canvas, self.ax_bar, self.bars
+        for idx in changed:
+            canvas.restore_region(self._backgrounds[idx])
+        # Neighbours may spill a pixel into a restored slot, so redraw them too.
+        redraw = sorted({j for idx in changed for j in (idx - 1, idx, idx + 1) if 0 <= j < len(bars)})
+        for idx in redraw:
+            ax_bar.draw_artist(bars[idx])
+        if changed:
+            canvas.blit(Bbox.union([self._slots[idx] for idx in redraw]))
+
+        ax_text = self.message_text.axes
+        canvas.restore_region(self._text_background)
+        ax_text.draw_artist(self.message_text)
+        canvas.blit(self._text_bbox)
@@ -0,0 +1,87 @@
+import gc
+import math
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Callable, Dict, List, Sequence
+
+from traces import COMPARE, SWAP, WRITE
+
+# Cost of each operation under the cost models of a race. A swap writes two
+# array slots. Operations missing from a model are free.
+COST_WEIGHTS: Dict[str, Dict[int, int]] = {
+    "compares": {COMPARE: 1},
+    "writes": {SWAP: 2, WRITE: 1},
+}
+
+# "steps" counts every recorded step and "time" spreads the measured sorting
+# time of an algorithm evenly over its steps.
+COST_MODELS = ("steps", "compares", "writes", "time")
+
+# Unit of the race clock for each cost model, as shown next to the speed control.
+COST_UNITS = {"steps": "Steps", "compares": "Compares", "writes": "Writes", "time": "µs"}
+
+
+def measure_seconds(sort_func: Callable, array: List[int], repeat: int = 3) -> float:
+    """
+    Times a sorting function without recording anything.
+
+    The "none" level runs each algorithm's untraced loop where it has one,
+    so the time does not include building steps.
+
+    Args:
+        sort_func (Callable): A sorting function from algorithms.py.
+        array (List[int]): The input array; it is copied before every run.
+        repeat (int): Number of runs; the fastest is kept.
+
+    Returns:
+        float: The best wall time in seconds.
+    """
+    best = math.inf
+    for _ in range(repeat):
+        arr = list(array)
+        gc.collect()
+        start = time.perf_counter()
+        sort_func(arr, level="none")
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def cumulative_costs(trace, model: str, seconds: float = 0.0) -> Sequence[float]:
+    """
+    Computes the race clock reading at which each step of a trace is reached.
+
+    Args:
+        trace (Trace | TraceFile): A complete trace.
+        model (str): One of COST_MODELS.
+        seconds (float): Measured sorting time, used by the "time" model.
+
+    Returns:
+        Sequence[float]: Non-decreasing cost of the steps up to and including
+        each step. The first step (the initial array) costs nothing.
+    """
+    if model not in COST_MODELS:
+        raise ValueError(f"Unknown cost model {model!r}; expected one of {COST_MODELS}.")
+    codes = trace.op_codes()
+    if model == "steps":
+        return range(len(codes))
+    if model == "time":
+        per_step = seconds * 1e6 / max(1, len(codes) - 1)
+        return [index * per_step for index in range(len(codes))]
+    weights = COST_WEIGHTS[model]
+    table = [weights.get(op, 0) for op in range(max(codes, default=0) + 1)]
+    return list(accumulate(map(table.__getitem__, codes)))
+
+
+def step_at(costs: Sequence[float], clock: float) -> int:
+    """
+    Returns the last step reached when the race clock shows `clock`.
+
+    Args:
+        costs (Sequence[float]): Cumulative costs from cumulative_costs.
+        clock (float): The race clock.
+
+    Returns:
+        int: The index of the last step whose cumulative cost is at most `clock`.
+    """
+    return max(0, bisect_right(costs, clock) - 1)
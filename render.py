@@ -0,0 +1,236 @@
+import argparse
+import os
+import random
+import shutil
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+from matplotlib import rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from PIL import Image
+
+from algorithms import SORTING_ALGORITHMS
+from plotting import BarBlitter, create_figure, initialize_bars, update_visualization
+
+
+class GifWriter:
+    """
+    Collects frames and writes them as an animated GIF when closed.
+
+    Pillow can only write a GIF from all of its frames at once, so the
+    frames are kept in memory until then; render_trace caps them at
+    max_frames by raising the stride.
+    """
+
+    # About 240 kB per quantized 600x400 frame at the default dpi.
+    max_frames = 1000
+
+    def __init__(self, path: str, fps: int):
+        self.path = path
+        self.duration = max(1, round(1000 / fps))
+        self.frames = []
+
+    def write(self, image: Image.Image):
+        """Adds one frame, quantized to a 256-colour palette."""
+        self.frames.append(image.convert('P', palette=Image.Palette.ADAPTIVE))
+
+    def close(self):
+        """Writes the collected frames to the GIF file."""
+        if self.frames:
+            self.frames[0].save(self.path, save_all=True, append_images=self.frames[1:],
+                                duration=self.duration, loop=0)
+
+
+class VideoWriter:
+    """
+    Streams raw frames to an ffmpeg process encoding a video file.
+    """
+
+    max_frames = None
+
+    def __init__(self, path: str, fps: int):
+        self.path = path
+        self.fps = fps
+        self.process = None
+
+    def write(self, image: Image.Image):
+        """Sends one frame to ffmpeg, starting it on the first frame."""
+        if self.process is None:
+            ffmpeg = shutil.which(rcParams['animation.ffmpeg_path'])
+            if ffmpeg is None:
+                raise RuntimeError(f"ffmpeg not found (animation.ffmpeg_path = {rcParams['animation.ffmpeg_path']!r}).")
+            width, height = image.size
+            self.process = subprocess.Popen(
+                [ffmpeg, '-y', '-loglevel', 'error',
+                 '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(self.fps), '-i', 'pipe:',
+                 '-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', self.path],
+                stdin=subprocess.PIPE,
+            )
+        self.process.stdin.write(image.tobytes())
+
+    def close(self):
+        """Waits for ffmpeg to finish encoding."""
+        if self.process is not None:
+            self.process.stdin.close()
+            if self.process.wait() != 0:
+                raise RuntimeError(f"ffmpeg failed to write {self.path}.")
+
+
+class PngWriter:
+    """
+    Writes every frame as a numbered PNG file into a directory.
+    """
+
+    max_frames = None
+
+    def __init__(self, path: str, fps: int):
+        self.path = path
+        self.count = 0
+        os.makedirs(path, exist_ok=True)
+
+    def write(self, image: Image.Image):
+        """Saves one frame as the next numbered PNG."""
+        image.save(os.path.join(self.path, f"frame_{self.count:06d}.png"))
+        self.count += 1
+
+    def close(self):
+        """Nothing to flush; every frame is already on disk."""
+
+
+def open_writer(path: str, fps: int):
+    """
+    Picks a frame writer from the output path.
+
+    Args:
+        path (str): A .gif or video (.mp4, .webm, ...) file, or a directory for PNG frames.
+        fps (int): Frames per second of the animation.
+
+    Returns:
+        GifWriter | VideoWriter | PngWriter: The frame writer.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.gif':
+        return GifWriter(path, fps)
+    if extension:
+        return VideoWriter(path, fps)
+    return PngWriter(path, fps)
+
+
+def render_trace(steps: Sequence[List[int]], highlights: Sequence[List[int]], messages: Sequence[str], path: str,
+                 algorithm_name: str = "Sorting", fps: int = 30, stride: int = 1,
+                 max_frames: Optional[int] = None, dpi: int = 100) -> int:
+    """
+    Renders a sorting trace to disk with the Agg backend, without any display.
+
+    Args:
+        steps (Sequence[List[int]]): Array state after each operation.
+        highlights (Sequence[List[int]]): Indices to highlight at each step.
+        messages (Sequence[str]): Descriptive message for each step.
+        path (str): Output .gif, video file, or directory for PNG frames.
+        algorithm_name (str): The name shown in the chart title.
+        fps (int): Frames per second of the animation.
+        stride (int): Render every stride-th step.
+        max_frames (Optional[int]): If set, the stride is raised so that at
+            most this many frames are rendered. GIFs are always capped at
+            GifWriter.max_frames, since their frames are held in memory.
+        dpi (int): Resolution of the 6x4 inch figure.
+
+    Returns:
+        int: The number of frames written.
+    """
+    writer = open_writer(path, fps)
+    if writer.max_frames is not None:
+        max_frames = writer.max_frames if max_frames is None else min(max_frames, writer.max_frames)
+    if max_frames is not None and len(steps) > max_frames:
+        stride = max(stride, -(-len(steps) // max_frames))
+    indices = list(range(0, len(steps), stride))
+    if indices[-1] != len(steps) - 1:
+        indices.append(len(steps) - 1)
+
+    fig, ax_bar, ax_text, message_text = create_figure()
+    fig.set_dpi(dpi)
+    canvas = FigureCanvasAgg(fig)
+    bars = initialize_bars(ax_bar, steps[0])
+    ax_bar.set_title(f"{algorithm_name} Visualization", fontsize=14)
+    blitter = BarBlitter(canvas, ax_bar, bars, message_text)
+
+    try:
+        for count, index in enumerate(indices):
+            changed = update_visualization(bars, steps[index], highlights[index], message_text, messages[index])
+            if count == 0:
+                canvas.draw()
+            else:
+                blitter.blit(changed)
+            width, height = canvas.get_width_height(physical=True)
+            writer.write(Image.frombuffer('RGBA', (width, height), canvas.buffer_rgba(), 'raw', 'RGBA', 0, 1))
+    finally:
+        writer.close()
+    return len(indices)
+
+
+def render_job(job: Tuple[Callable, List[int], str], **options) -> int:
+    """
+    Sorts one input and renders its trace. Runs inside a worker process.
+
+    Args:
+        job (Tuple[Callable, List[int], str]): The sorting function from
+            algorithms.py, the input array and the output path.
+        **options: Keyword arguments passed on to render_trace.
+
+    Returns:
+        int: The number of frames written.
+    """
+    sort_func, array, path = job
+    steps, highlights, messages = sort_func(list(array))
+    name = getattr(sort_func, 'func', sort_func).__name__
+    options.setdefault('algorithm_name', name.replace('_', ' ').title())
+    return render_trace(steps, highlights, messages, path, **options)
+
+
+def render_batch(jobs: Iterable[Tuple[Callable, List[int], str]], processes: Optional[int] = None, **options) -> List[int]:
+    """
+    Renders many (sort function, array, output path) jobs across a process pool.
+
+    Args:
+        jobs (Iterable[Tuple[Callable, List[int], str]]): The jobs to render.
+        processes (Optional[int]): Number of worker processes. Defaults to the CPU count.
+        **options: Keyword arguments passed on to render_trace.
+
+    Returns:
+        List[int]: The number of frames written for each job, in job order.
+    """
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(partial(render_job, **options), jobs))
+
+
+def main():
+    """
+    Renders every sorting algorithm on random inputs into an output directory.
+    """
+    parser = argparse.ArgumentParser(description="Render sorting traces to GIF, video or PNG frames without a display.")
+    parser.add_argument("output", help="Directory the animations are written to.")
+    parser.add_argument("--inputs", type=int, default=1, help="Number of random input arrays.")
+    parser.add_argument("--size", type=int, default=20, help="Length of each input array.")
+    parser.add_argument("--format", default="gif", help="gif, a video extension such as mp4, or png for frame directories.")
+    parser.add_argument("--fps", type=int, default=30)
+    parser.add_argument("--max-frames", type=int, default=None)
+    parser.add_argument("--processes", type=int, default=None)
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    extension = "" if args.format == "png" else f".{args.format}"
+    jobs = []
+    for n in range(args.inputs):
+        array = [random.randint(1, 100) for _ in range(args.size)]
+        for sort_func in SORTING_ALGORITHMS.values():
+            jobs.append((sort_func, array, os.path.join(args.output, f"{sort_func.__name__}_{n:04d}{extension}")))
+
+    frames = render_batch(jobs, processes=args.processes, fps=args.fps, max_frames=args.max_frames)
+    for (_, _, path), count in zip(jobs, frames):
+        print(f"{path}: {count} frames")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import random
+
+import pytest
+
+from algorithms import (GAP_SEQUENCES, PARTITION_SCHEMES, PIVOT_STRATEGIES, RADIX_ORDERS, iter_heap_sort,
+                        iter_merge_sort, iter_quick_sort, iter_timsort, resolve_algorithm)
+
+SPECS = [
+    "selection_sort",
+    "bubble_sort",
+    "insertion_sort",
+    "heap_sort",
+    "merge_sort",
+    "merge_sort:bottom_up=true",
+    "timsort",
+    "counting_sort",
+    "cocktail_shaker_sort",
+    *(f"quick_sort:pivot={pivot},partition={partition},smaller_first={smaller_first},seed=7"
+      for pivot in PIVOT_STRATEGIES for partition in PARTITION_SCHEMES for smaller_first in ("false", "true")),
+    *(f"shell_sort:gaps={gaps}" for gaps in GAP_SEQUENCES),
+    *(f"radix_sort:base={base},order={order}" for base in (2, 10, 16) for order in RADIX_ORDERS),
+]
+
+
+def make_inputs():
+    rng = random.Random(11)
+    runs = []
+    for k in range(8):
+        run = sorted(rng.randint(0, 1000) for _ in range(rng.randint(1, 70)))
+        runs += run if k % 2 else run[::-1]
+    return [
+        [],
+        [3],
+        [2, 1],
+        [4, 4, 4, 4],
+        list(range(40)),
+        list(range(40, 0, -1)),
+        [rng.randint(-50, 50) for _ in range(150)],
+        [rng.randint(0, 4) for _ in range(90)],
+        runs,
+    ]
+
+
+@pytest.mark.parametrize("spec", SPECS)
+def test_counters_match_trace(spec):
+    _, sort = resolve_algorithm(spec)
+    for arr in make_inputs():
+        counted, traced = list(arr), list(arr)
+        assert sort(list(arr), level="none") is None
+        counters = sort(counted, level="counters")
+        steps, _, _ = sort(traced)
+        recorded = steps.trace.op_counts()
+        # The trace starts with a note showing the initial array.
+        recorded["notes"] -= 1
+        assert counted == traced == sorted(arr)
+        assert {name: counters[name] for name in recorded} == recorded
+
+
+@pytest.mark.parametrize("sort, steps", [
+    ("heap_sort", lambda arr, stats: iter_heap_sort(arr, stats)),
+    ("merge_sort", lambda arr, stats: iter_merge_sort(arr, stats)),
+    ("merge_sort:bottom_up=true", lambda arr, stats: iter_merge_sort(arr, stats, True)),
+    ("timsort", lambda arr, stats: iter_timsort(arr, stats)),
+    ("quick_sort:pivot=random,seed=3", lambda arr, stats: iter_quick_sort(arr, stats, pivot="random", seed=3)),
+    ("quick_sort:partition=dual-pivot", lambda arr, stats: iter_quick_sort(arr, stats, partition="dual-pivot")),
+])
+def test_counters_match_generator_depth(sort, steps):
+    _, sort = resolve_algorithm(sort)
+    for arr in make_inputs():
+        stats = {"max_depth": 0}
+        for _ in steps(list(arr), stats):
+            pass
+        assert sort(list(arr), level="counters")["max_depth"] == stats["max_depth"]
+
+
+@pytest.mark.parametrize("spec", ["parallel_merge_sort:processes=2", "parallel_radix_sort:processes=2,base=16"])
+def test_parallel_counters_match_trace(spec):
+    _, sort = resolve_algorithm(spec)
+    for arr in make_inputs():
+        counted, traced = list(arr), list(arr)
+        counters = sort(counted, level="counters")
+        steps, _, _ = sort(traced)
+        recorded = steps.trace.op_counts()
+        recorded["notes"] -= 1
+        assert counted == traced == sorted(arr)
+        assert {name: counters[name] for name in recorded} == recorded
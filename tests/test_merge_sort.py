@@ -0,0 +1,40 @@
+import math
+import random
+
+import pytest
+
+import messages
+from algorithms import merge_sort
+
+
+def merged_ranges(steps):
+    trace = steps.trace
+    for index in range(len(steps)):
+        template, args = trace.message_args(index)
+        if template == messages.MERGED:
+            yield index, args[0], args[1]
+
+
+@pytest.mark.parametrize("bottom_up", [False, True])
+@pytest.mark.parametrize("n", [0, 1, 2, 7, 64, 100])
+def test_every_merge_leaves_its_range_sorted(bottom_up, n):
+    arr = random.Random(n).choices(range(-20, 21), k=n)
+    steps, _, _ = merge_sort(list(arr), bottom_up=bottom_up)
+    for index, start, end in merged_ranges(steps):
+        merged = steps[index][start:end + 1]
+        assert merged == sorted(merged)
+    assert steps[-1] == sorted(arr)
+
+
+@pytest.mark.parametrize("bottom_up", [False, True])
+def test_each_level_writes_the_array_once(bottom_up):
+    arr = list(range(64, 0, -1))
+    counters = merge_sort(arr, level="counters", bottom_up=bottom_up)
+    assert arr == list(range(1, 65))
+    assert counters["writes"] == 64 * 6
+    assert counters["swaps"] == 0
+
+
+def test_recursion_depth():
+    assert merge_sort(list(range(100)), level="counters")["max_depth"] == math.ceil(math.log2(100)) + 1
+    assert merge_sort(list(range(100)), level="counters", bottom_up=True)["max_depth"] == 1
@@ -0,0 +1,49 @@
+import string
+
+import pytest
+
+import messages
+from algorithms import SORTING_ALGORITHMS, bubble_sort, radix_sort
+
+
+def placeholders(template):
+    return {int(field) for _, field, _, _ in string.Formatter().parse(template) if field is not None}
+
+
+def test_template_ids_are_unique_and_complete():
+    ids = [value for name, value in vars(messages).items() if name.isupper() and isinstance(value, int)]
+    assert len(ids) == len(set(ids))
+    assert set(ids) == set(messages.TEMPLATES)
+
+
+def test_index_args_name_existing_placeholders():
+    for template, positions in messages.INDEX_ARGS.items():
+        assert set(positions) <= placeholders(messages.TEMPLATES[template])
+
+
+@pytest.mark.parametrize("sort_func", list(SORTING_ALGORITHMS.values()))
+def test_every_step_formats_with_its_arguments(sort_func):
+    steps, _, texts = sort_func([5, -1, 4, 4, 0, 9, 2])
+    trace = steps.trace
+    for index in range(len(steps)):
+        template, args = trace.message_args(index)
+        assert placeholders(messages.TEMPLATES[template]) == set(range(len(args)))
+        assert texts[index] == messages.format_message(template, args)
+
+
+def test_messages_show_the_values_at_each_step():
+    _, _, texts = bubble_sort([2, 1])
+    assert list(texts) == [
+        "Initial array",
+        "Starting pass 1.",
+        "Comparing index 0 (value 2) with index 1 (value 1).",
+        "Swapped index 0 (value 1) with index 1 (value 2).",
+        "Starting pass 2.",
+        "No swaps in this pass. Array is sorted.",
+        "Bubble Sort completed.",
+    ]
+
+
+def test_messages_are_formatted_when_read():
+    _, _, texts = radix_sort([-3, 2])
+    assert texts[1] == "Adding 3 to every key so that no key is negative."
@@ -0,0 +1,58 @@
+import random
+
+import pytest
+
+from algorithms import numpy_counting_sort, numpy_radix_sort
+import messages as msg
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("base", [2, 10, 256, 65536])
+@pytest.mark.parametrize("n", [1, 2, 7, 300, 2000])
+def test_numpy_radix_sort_sorts(base, n):
+    rng = random.Random(n * base)
+    arr = [rng.randint(-10 ** 9, 10 ** 9) for _ in range(n)]
+    expected = sorted(arr)
+    steps, _, _ = numpy_radix_sort(list(arr), base=base)
+    assert steps[-1] == expected
+    numpy_radix_sort(arr, level="none", base=base)
+    assert arr == expected
+
+
+@pytest.mark.parametrize("n", [1, 5, 1000])
+def test_numpy_counting_sort_sorts(n):
+    rng = random.Random(n)
+    arr = [rng.randint(-50, 50) for _ in range(n)]
+    expected = sorted(arr)
+    steps, _, _ = numpy_counting_sort(list(arr))
+    assert steps[-1] == expected
+    numpy_counting_sort(arr, level="none")
+    assert arr == expected
+
+
+def test_radix_phases_and_timings():
+    timings = {}
+    steps, _, _ = numpy_radix_sort([300, 5, 1, 256], base=256, timings=timings)
+    templates = [steps.trace.message_args(i)[0] for i in range(len(steps))]
+    notes = [t for t in templates if t != msg.SETTING]
+    assert notes == [msg.INITIAL_ARRAY,
+                     msg.DIGIT_HISTOGRAM, msg.DIGIT_PREFIX_SUM, msg.DIGIT_SCATTER,
+                     msg.DIGIT_HISTOGRAM, msg.DIGIT_PREFIX_SUM, msg.DIGIT_SCATTER,
+                     msg.RADIX_SORT_COMPLETED]
+    assert set(timings) == {"convert", "histogram", "prefix", "scatter"}
+
+
+def test_radix_skips_shared_digits():
+    steps, _, messages = numpy_radix_sort([7, 7, 7])
+    assert [steps.trace.message_args(i)[0] for i in range(len(steps))] == [
+        msg.INITIAL_ARRAY, msg.DIGIT_HISTOGRAM, msg.DIGIT_SKIPPED, msg.RADIX_SORT_COMPLETED]
+
+
+def test_counters_match_trace():
+    arr = [9, 3, 3, 1, 12, 0]
+    steps, _, _ = numpy_radix_sort(list(arr), base=4)
+    counters = numpy_radix_sort(list(arr), level="counters", base=4)
+    recorded = steps.trace.op_counts()
+    recorded["notes"] -= 1  # The trace opens with the initial array.
+    assert {name: counters[name] for name in recorded} == recorded
@@ -0,0 +1,91 @@
+import random
+
+import pytest
+
+import messages
+from algorithms import merge_sort, parallel_merge_sort, parallel_radix_sort
+
+ARRAY = random.Random(21).choices(range(-300, 301), k=250)
+
+
+def messages_with_args(steps, template):
+    trace = steps.trace
+    for index in range(len(steps)):
+        found, args = trace.message_args(index)
+        if found == template:
+            yield index, args
+
+
+@pytest.mark.parametrize("processes", [1, 2, 3])
+@pytest.mark.parametrize("bottom_up", [False, True])
+def test_parallel_merge_sort_stitches_sorted_chunks(processes, bottom_up):
+    steps, _, _ = parallel_merge_sort(list(ARRAY), processes=processes, bottom_up=bottom_up)
+    chunks = list(messages_with_args(steps, messages.CHUNK_SORTED))
+    assert [args[0] for _, args in chunks] == list(range(processes))
+    # Chunks are contiguous, cover the array and are sorted once recorded.
+    assert chunks[0][1][1] == 0 and chunks[-1][1][2] == len(ARRAY) - 1
+    for (_, previous), (_, following) in zip(chunks, chunks[1:]):
+        assert following[1] == previous[2] + 1
+    for index, (_, start, end) in chunks:
+        assert steps[index][start:end + 1] == sorted(ARRAY[start:end + 1])
+    assert [args for _, args in messages_with_args(steps, messages.K_WAY_MERGE)] == [(processes,)]
+    assert steps[-1] == sorted(ARRAY)
+
+
+def test_parallel_merge_sort_counts_chunk_work():
+    counters = parallel_merge_sort(list(ARRAY), level="counters", processes=2)
+    half = len(ARRAY) // 2
+    chunk_writes = sum(merge_sort(ARRAY[start:end], level="counters")["writes"]
+                       for start, end in ((0, half), (half, len(ARRAY))))
+    # The k-way merge writes every element once more.
+    assert counters["writes"] == chunk_writes + len(ARRAY)
+
+
+@pytest.mark.parametrize("arr", [[], [1], [2, 1]])
+def test_parallel_merge_sort_more_processes_than_values(arr):
+    steps, _, _ = parallel_merge_sort(list(arr), processes=4)
+    assert steps[-1] == sorted(arr)
+    result = list(arr)
+    assert parallel_merge_sort(result, level="none", processes=4) is None
+    assert result == sorted(arr)
+
+
+def test_parallel_merge_sort_streams():
+    expected = [list(view) for view in parallel_merge_sort(list(ARRAY), processes=2)]
+    views = parallel_merge_sort(list(ARRAY), stream=True, processes=2)
+    views[0].trace.fill()
+    assert [list(view) for view in views] == expected
+
+
+@pytest.mark.parametrize("processes", [1, 2, 3])
+@pytest.mark.parametrize("base", [2, 16, 256, 65536])
+def test_parallel_radix_sort_sorts(processes, base):
+    arr = list(ARRAY)
+    assert parallel_radix_sort(arr, level="none", processes=processes, base=base) is None
+    assert arr == sorted(ARRAY)
+
+
+def test_parallel_radix_sort_records_worker_histograms():
+    steps, _, texts = parallel_radix_sort(list(ARRAY), processes=2, base=16)
+    passes = list(messages_with_args(steps, messages.DIGIT_PASS_BASE))
+    histograms = list(messages_with_args(steps, messages.WORKER_HISTOGRAM))
+    # Offset keys stay below 16 ** 3.
+    assert [args for _, args in passes] == [(0, 16), (1, 16), (2, 16)]
+    assert [args[0] for _, args in histograms] == [0, 1] * len(passes)
+    assert texts[1] == f"Adding {-min(ARRAY)} to every key so that no key is negative."
+    assert steps[-1] == sorted(ARRAY)
+
+
+def test_parallel_radix_sort_wide_keys():
+    wide = random.Random(22).choices(range(-2 ** 40, 2 ** 40 + 1), k=200)
+    result = list(wide)
+    counters = parallel_radix_sort(result, level="counters", processes=2, base=256)
+    assert result == sorted(wide)
+    # Offset keys need 41 bits, six base-256 digits, and every pass writes each value.
+    assert counters["writes"] == len(wide) * 6
+
+
+@pytest.mark.parametrize("base", [1, 10])
+def test_parallel_radix_sort_rejects_bases(base):
+    with pytest.raises(ValueError):
+        parallel_radix_sort([3, 1, 2], processes=2, base=base)
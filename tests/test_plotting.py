@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from plotting import create_figure, initialize_bars
+
+
+@pytest.mark.parametrize("array, bottom, top", [
+    ([1, 5, 3], 0, 5),
+    ([-5, -3, -1], -5, 0),
+    ([-2, 4], -2, 4),
+    ([0, 0], 0, 0),
+    ([], 0, 0),
+])
+def test_value_axis_covers_every_bar(array, bottom, top):
+    _, ax_bar, _, _ = create_figure()
+    initialize_bars(ax_bar, array)
+    low, high = ax_bar.get_ylim()
+    assert low <= bottom and top <= high and low < high
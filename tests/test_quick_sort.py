@@ -0,0 +1,71 @@
+import math
+import random
+import sys
+
+import pytest
+
+from algorithms import PARTITION_SCHEMES, PIVOT_STRATEGIES, iter_quick_sort, quick_sort
+
+
+def test_sorted_input_deeper_than_recursion_limit():
+    n = sys.getrecursionlimit() + 500
+    arr = list(range(n))
+    counters = quick_sort(arr, level="counters")
+    assert arr == list(range(n))
+    assert counters["max_depth"] == n
+
+
+@pytest.mark.parametrize("arr", [list(range(300)), list(range(300, 0, -1))])
+def test_pending_stack_stays_small(arr):
+    steps = iter_quick_sort(arr)
+    peak = 0
+    for _ in steps:
+        peak = max(peak, len(steps.gi_frame.f_locals["stack"]))
+    assert arr == sorted(arr)
+    assert peak <= 2
+
+
+QUICK_INPUTS = [
+    [],
+    [1],
+    [2, 2, 2, 2, 2, 2, 2, 2, 2],
+    list(range(100)),
+    list(range(100, 0, -1)),
+    random.Random(4).choices(range(-9, 10), k=120),
+    random.Random(8).choices(range(-1000, 1001), k=120),
+]
+
+
+@pytest.mark.parametrize("pivot", PIVOT_STRATEGIES)
+@pytest.mark.parametrize("partition", PARTITION_SCHEMES)
+def test_every_pivot_and_partition_sorts(pivot, partition):
+    for arr in QUICK_INPUTS:
+        for smaller_first in (False, True):
+            result = list(arr)
+            quick_sort(result, level="none", smaller_first=smaller_first, pivot=pivot, partition=partition, seed=2)
+            assert result == sorted(arr)
+
+
+def test_random_pivot_follows_seed():
+    arr = random.Random(6).choices(range(51), k=80)
+    first = quick_sort(list(arr), pivot="random", seed=9)[2]
+    second = quick_sort(list(arr), pivot="random", seed=9)[2]
+    assert list(first) == list(second)
+
+
+@pytest.mark.parametrize("pivot", ["median-of-three", "ninther"])
+def test_median_pivots_keep_sorted_input_shallow(pivot):
+    counters = quick_sort(list(range(2000)), level="counters", pivot=pivot)
+    assert counters["max_depth"] <= 2 * math.log2(2000)
+
+
+def test_three_way_partition_finishes_equal_keys_in_one_pass():
+    counters = quick_sort([7] * 500, level="counters", partition="three-way")
+    assert counters["compares"] == 500
+    assert counters["max_depth"] == 2
+
+
+@pytest.mark.parametrize("options", [{"pivot": "middle"}, {"partition": "hoare"}])
+def test_rejects_unknown_options(options):
+    with pytest.raises(ValueError):
+        quick_sort([3, 1, 2], **options)
@@ -0,0 +1,55 @@
+import random
+
+import pytest
+
+import messages
+from algorithms import RADIX_ORDERS, radix_sort
+
+MIXED = random.Random(20).choices(range(-10 ** 6, 10 ** 6 + 1), k=400)
+
+
+def templates(steps):
+    return [steps.trace.message_args(index)[0] for index in range(len(steps))]
+
+
+@pytest.mark.parametrize("order", RADIX_ORDERS)
+@pytest.mark.parametrize("base", [2, 3, 10, 16, 256, 1000, 65536])
+def test_sorts_negative_and_positive_keys(base, order):
+    arr = list(MIXED)
+    assert radix_sort(arr, level="none", base=base, order=order) is None
+    assert arr == sorted(MIXED)
+
+
+@pytest.mark.parametrize("arr", [[], [0], [-5], [-2 ** 62, 2 ** 62, 0, -1], [-3, -3, -7, -1]])
+@pytest.mark.parametrize("order", RADIX_ORDERS)
+def test_edge_cases(arr, order):
+    steps, _, _ = radix_sort(list(arr), base=16, order=order)
+    assert steps[-1] == sorted(arr)
+
+
+@pytest.mark.parametrize("base, passes", [(2, 10), (10, 3), (16, 3), (1024, 1)])
+def test_lsd_runs_one_pass_per_digit(base, passes):
+    steps, _, _ = radix_sort([999, 0, 512, 7], base=base)
+    # Base 10 keeps the original "digit at exponent" message.
+    recorded = templates(steps)
+    assert recorded.count(messages.DIGIT_PASS) + recorded.count(messages.DIGIT_PASS_BASE) == passes
+
+
+def test_negative_keys_are_offset_once():
+    steps, _, texts = radix_sort([4, -9, 0, -2])
+    assert templates(steps).count(messages.KEY_OFFSET) == 1
+    assert texts[1] == "Adding 9 to every key so that no key is negative."
+    assert steps[-1] == [-9, -2, 0, 4]
+
+
+def test_msd_skips_single_element_buckets():
+    # Distinct leading digits leave every bucket with one key after the first pass.
+    steps, _, _ = radix_sort([300, 100, 200, 0], base=10, order="msd")
+    assert templates(steps).count(messages.MSD_BUCKET) == 1
+    assert steps[-1] == [0, 100, 200, 300]
+
+
+@pytest.mark.parametrize("options", [{"base": 1}, {"order": "middle"}])
+def test_rejects_invalid_options(options):
+    with pytest.raises(ValueError):
+        radix_sort([2, 1], **options)
@@ -0,0 +1,42 @@
+import random
+
+import pytest
+
+import messages
+from algorithms import GAP_SEQUENCES, shell_gaps, shell_sort
+
+
+def test_known_gap_prefixes():
+    assert shell_gaps(100, "shell") == [50, 25, 12, 6, 3, 1]
+    assert shell_gaps(1000, "knuth") == [121, 40, 13, 4, 1]
+    assert shell_gaps(1000, "sedgewick") == [281, 77, 23, 8, 1]
+    assert shell_gaps(1000, "tokuda") == [525, 233, 103, 46, 20, 9, 4, 1]
+    assert shell_gaps(1000, "ciura") == [701, 301, 132, 57, 23, 10, 4, 1]
+    assert shell_gaps(10000, "ciura")[:2] == [8858, 3937]
+
+
+@pytest.mark.parametrize("gaps", GAP_SEQUENCES)
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 10, 1000, 10000])
+def test_gaps_decrease_to_one(gaps, n):
+    sequence = shell_gaps(n, gaps)
+    if n < 2:
+        assert sequence == []
+        return
+    assert sequence[-1] == 1
+    assert all(larger > smaller for larger, smaller in zip(sequence, sequence[1:]))
+    assert sequence[0] < n
+
+
+@pytest.mark.parametrize("gaps", GAP_SEQUENCES)
+def test_every_sequence_sorts(gaps):
+    arr = random.Random(12).choices(range(-100, 101), k=300)
+    steps, _, _ = shell_sort(list(arr), gaps=gaps)
+    used = [args[0] for template, args in map(steps.trace.message_args, range(len(steps)))
+            if template == messages.GAP_SIZE]
+    assert used == shell_gaps(len(arr), gaps)
+    assert steps[-1] == sorted(arr)
+
+
+def test_rejects_unknown_sequence():
+    with pytest.raises(ValueError):
+        shell_gaps(10, "pratt")
@@ -0,0 +1,33 @@
+import pytest
+
+from algorithms import SORTING_ALGORITHMS, bubble_sort
+
+ARRAY = [9, -3, 7, 7, 0, 12, 5, -8, 1, 4, 3, 2]
+
+
+@pytest.mark.parametrize("sort_func", list(SORTING_ALGORITHMS.values()))
+def test_streamed_views_match_eager_views(sort_func):
+    expected = [list(view) for view in sort_func(list(ARRAY))]
+    views = sort_func(list(ARRAY), stream=True)
+    trace = views[0].trace
+    trace.fill()
+    assert trace.complete
+    assert [list(view) for view in views] == expected
+
+
+def test_steps_are_generated_on_demand():
+    arr = list(ARRAY)
+    steps, _, messages = bubble_sort(arr, stream=True)
+    trace = steps.trace
+    assert len(steps) == 1 and not trace.complete
+    assert arr == ARRAY
+    assert trace.fill(5) == 6
+    assert len(messages) == 6 and not trace.complete
+    trace.fill()
+    assert arr == sorted(ARRAY)
+    assert steps[-1] == sorted(ARRAY)
+
+
+def test_only_full_level_streams():
+    with pytest.raises(ValueError):
+        bubble_sort(list(ARRAY), stream=True, level="counters")
@@ -0,0 +1,75 @@
+import math
+import random
+
+import pytest
+
+import messages
+from algorithms import min_run_length, timsort
+
+
+def run_input(seed, runs=12):
+    rng = random.Random(seed)
+    arr = []
+    for k in range(runs):
+        run = sorted(rng.randint(-500, 500) for _ in range(rng.randint(1, 150)))
+        arr += run if k % 2 else run[::-1]
+    return arr
+
+
+@pytest.mark.parametrize("n", [0, 1, 31, 63, 64, 65, 127, 1000, 2 ** 16, 2 ** 16 + 1])
+def test_min_run_length(n):
+    min_run = min_run_length(n)
+    if n < 64:
+        assert min_run == n
+    else:
+        assert 32 <= min_run <= 64
+        # n / min_run is a power of two or just below one.
+        power = 2 ** math.ceil(math.log2(n / min_run))
+        assert power / 2 < n / min_run <= power
+
+
+@pytest.mark.parametrize("arr", [run_input(1), run_input(2), random.Random(3).choices(range(10), k=500)])
+def test_pushed_runs_are_sorted(arr):
+    steps, _, _ = timsort(list(arr))
+    trace = steps.trace
+    for index in range(len(steps)):
+        template, args = trace.message_args(index)
+        if template == messages.RUN_PUSHED:
+            run = steps[index][args[0]:args[1] + 1]
+            assert run == sorted(run)
+    assert steps[-1] == sorted(arr)
+
+
+def test_sorted_input_is_one_run():
+    counters = timsort(list(range(1000)), level="counters")
+    assert counters["compares"] == 999
+    assert counters["writes"] == counters["swaps"] == 0
+    assert counters["max_depth"] == 1
+
+
+def test_descending_input_is_reversed_in_place():
+    arr = list(range(1000, 0, -1))
+    counters = timsort(arr, level="counters")
+    assert arr == list(range(1, 1001))
+    assert counters["swaps"] == 500
+    assert counters["writes"] == 0
+
+
+@pytest.mark.parametrize("arr", [[3, 3, 2, 2, 1, 1] * 20, run_input(5), list(range(90, 0, -1)) + [5] * 40])
+def test_only_strictly_descending_runs_are_reversed(arr):
+    steps, _, _ = timsort(list(arr))
+    trace = steps.trace
+    for index in range(len(steps)):
+        template, args = trace.message_args(index)
+        if template == messages.DESCENDING_RUN:
+            run = steps[index - 1][args[0]:args[1] + 1]
+            assert all(left > right for left, right in zip(run, run[1:]))
+    assert steps[-1] == sorted(arr)
+
+
+def test_pending_runs_stay_logarithmic():
+    arr = run_input(4, runs=200)
+    counters = timsort(arr, level="counters")
+    assert arr == sorted(arr)
+    # The stack invariants make run lengths grow at least like Fibonacci numbers.
+    assert counters["max_depth"] <= math.log(len(arr), (1 + 5 ** 0.5) / 2) + 2
@@ -0,0 +1,41 @@
+import pytest
+
+from algorithms import bubble_sort, iter_timsort, merge_sort, timsort
+from tracefile import TraceFile, write_trace
+
+
+@pytest.mark.parametrize("name", ["trace.bin", "trace.trz"])
+@pytest.mark.parametrize("sort_func", [bubble_sort, merge_sort])
+def test_path_ignores_backend(tmp_path, sort_func, name):
+    expected, _, _ = sort_func([5, 3, 1, 4, 2])
+    steps, highlights, messages = sort_func([5, 3, 1, 4, 2], path=str(tmp_path / name), backend="numpy")
+    assert list(steps) == list(expected)
+    assert steps[-1] == [1, 2, 3, 4, 5]
+
+
+@pytest.mark.parametrize("arr", [[], [6, -1, 6, 3, 0, 11, -7, 2], [2 ** 40, 5, -2 ** 33, 2 ** 40 - 1]])
+@pytest.mark.parametrize("keyframe_interval", [1, 4, None])
+def test_trace_file_round_trip(tmp_path, arr, keyframe_interval):
+    path = str(tmp_path / "trace.bin")
+    expected, _, _ = timsort(list(arr), keyframe_interval=keyframe_interval)
+    # The writer observes the array the generator sorts, as Trace does.
+    observed = list(arr)
+    written = write_trace(path, observed, iter_timsort(observed), keyframe_interval)
+    with TraceFile(path) as trace:
+        assert trace.width == (8 if arr and max(map(abs, arr)) >= 2 ** 31 else 4)
+        assert len(trace) == len(expected) == written
+        assert list(trace.records()) == list(expected.trace.records())
+        assert trace.op_counts() == expected.trace.op_counts()
+        steps, highlights, messages = trace.views()
+        # Read backwards so that states are rebuilt from keyframes, not the cache.
+        for index in reversed(range(len(trace))):
+            assert steps[index] == expected[index]
+        assert list(highlights) == [expected.trace.highlight(i) for i in range(len(expected))]
+        assert list(messages) == [expected.trace.message(i) for i in range(len(expected))]
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "trace.bin"
+    path.write_bytes(b"not a trace file at all")
+    with pytest.raises(ValueError):
+        TraceFile(str(path))
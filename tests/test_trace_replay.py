@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from algorithms import heap_sort, merge_sort, quick_sort
+from traces import Trace, highlight_indices, replay
+
+
+def naive_states(initial, records):
+    state = list(initial)
+    states = []
+    for op, a, b, _, _ in records:
+        replay(state, [(op, a, b)])
+        states.append(list(state))
+    return states
+
+
+@pytest.mark.parametrize("sort_func", [heap_sort, merge_sort, quick_sort])
+@pytest.mark.parametrize("keyframe_interval", [1, 3, 64])
+def test_states_match_naive_replay(sort_func, keyframe_interval):
+    arr = random.Random(5).choices(range(-20, 21), k=60)
+    steps, highlights, _ = sort_func(list(arr), keyframe_interval=keyframe_interval)
+    records = list(steps.trace.records())
+    expected = naive_states(arr, records)
+    assert len(steps) == len(expected)
+    # Random access exercises keyframe lookup and the cached forward replay.
+    order = list(range(len(steps)))
+    random.Random(1).shuffle(order)
+    for index in order:
+        assert steps[index] == expected[index]
+    assert list(highlights) == [highlight_indices(op, a, b) for op, a, b, _, _ in records]
+    assert steps[-1] == sorted(arr)
+
+
+def test_keyframe_interval_does_not_change_states():
+    arr = list(range(30, 0, -1))
+    dense, _, _ = quick_sort(list(arr), keyframe_interval=2)
+    sparse, _, _ = quick_sort(list(arr))
+    assert list(dense) == list(sparse)
+
+
+def test_rejects_non_positive_keyframe_interval():
+    with pytest.raises(ValueError):
+        Trace([1, 2, 3], keyframe_interval=0)
@@ -0,0 +1,33 @@
+import os
+
+from algorithms import resolve_algorithm
+from tracecache import TraceCache, cacheable, trace_key
+
+
+def test_unseeded_random_pivot_is_not_cached(tmp_path):
+    cache = TraceCache(str(tmp_path))
+    _, sort_func = resolve_algorithm("quick_sort:pivot=random")
+    trace = cache.record(sort_func, [3, 1, 2])
+    assert trace.state(len(trace) - 1) == [1, 2, 3]
+    assert not cacheable(sort_func)
+    assert cache.get(sort_func, [3, 1, 2]) is None
+    assert len(cache) == 0
+
+
+def test_seeded_random_pivot_is_cached(tmp_path):
+    cache = TraceCache(str(tmp_path))
+    _, sort_func = resolve_algorithm("quick_sort:pivot=random,seed=1")
+    cache.record(sort_func, [3, 1, 2]).close()
+    assert len(cache) == 1
+    assert cache.get(sort_func, [3, 1, 2]) is not None
+
+
+def test_parallel_sorts_key_on_process_count(monkeypatch):
+    _, default = resolve_algorithm("parallel_merge_sort")
+    _, two = resolve_algorithm("parallel_merge_sort:processes=2")
+    _, three = resolve_algorithm("parallel_merge_sort:processes=3")
+    assert trace_key(two, [3, 1, 2]) != trace_key(three, [3, 1, 2])
+    monkeypatch.setattr(os, "cpu_count", lambda: 2)
+    assert trace_key(default, [3, 1, 2]) == trace_key(two, [3, 1, 2])
+    monkeypatch.setattr(os, "cpu_count", lambda: 3)
+    assert trace_key(default, [3, 1, 2]) == trace_key(three, [3, 1, 2])
@@ -0,0 +1,31 @@
+import pytest
+
+from algorithms import SORTING_ALGORITHMS, radix_sort
+from traces import WRITE
+
+np = pytest.importorskip("numpy")
+
+
+def test_numpy_backend_keeps_wide_message_args():
+    _, _, messages = radix_sort([-2 ** 31, 5], backend="numpy")
+    assert list(messages) == list(radix_sort([-2 ** 31, 5])[2])
+    assert "2147483648" in messages[1] and "-2147483648" not in messages[1]
+
+
+# Values past 32 bits stay close together so counting sort's table stays small.
+@pytest.mark.parametrize("sort_func", list(SORTING_ALGORITHMS.values()))
+@pytest.mark.parametrize("arr", [[], [7, -2, 7, 0, 31, -15, 4, 3], [2 ** 33 + 5, 2 ** 33, 2 ** 33 + 9, 2 ** 33 - 4],
+                                 [-2 ** 33, -2 ** 33 + 7, -2 ** 33 - 3]])
+def test_numpy_backend_matches_array_backend(sort_func, arr):
+    expected = sort_func(list(arr), keyframe_interval=3)
+    views = sort_func(list(arr), keyframe_interval=3, backend="numpy")
+    assert [list(view) for view in views] == [list(view) for view in expected]
+    assert views[0].trace.op_codes() == expected[0].trace.op_codes()
+    assert list(views[0].trace.records()) == list(expected[0].trace.records())
+
+
+def test_numpy_backend_keeps_wide_written_values():
+    steps, _, _ = radix_sort([2 ** 40, 3, 1], backend="numpy")
+    ops, _, values = steps.trace.columns()
+    assert values.dtype == np.int64
+    assert values[ops == WRITE].max() == 2 ** 40
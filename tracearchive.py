@@ -0,0 +1,685 @@
+import lzma
+import struct
+import sys
+import zlib
+from array import array
+from collections import OrderedDict
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from messages import INITIAL_ARRAY, format_message
+from traces import (DEFAULT_KEYFRAME_INTERVAL, NOTE, OP_NAMES, SWAP, WRITE, Step, TraceView, first_match,
+                    highlight_indices, replay)
+from tracefile import MAGIC as TRACE_FILE_MAGIC, MAX_ARGS, TraceFile
+
+try:
+    import numpy as np
+except ImportError:  # NumPy only speeds up varint coding and is needed for TraceArchive.columns.
+    np = None
+
+# A trace archive starts with a fixed header, followed by independently
+# compressed chunks of `keyframe_interval` steps, a chunk index and a footer
+# locating the index. Each chunk holds a keyframe (the array after the
+# chunk's first step) and the chunk's steps stored column by column: op codes,
+# argument counts and message ids as fixed-width bytes, then operands,
+# written values, arguments and keyframe values as zigzag varints. The second
+# operand of a WRITE is a value rather than an index, so it goes to its own
+# column, and the index columns and keyframe values are delta-encoded. Any
+# step is decoded by decompressing the one chunk holding it.
+#
+# Most message arguments repeat an operand of their step or the value found
+# at an operand after the step, so each argument is stored as a one-byte
+# reference to one of those (ARG_SOURCES) and only the others are stored as
+# literals. Reading the arguments therefore replays the chunk from its keyframe.
+MAGIC = b"ALGOTRCZ"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sBB6xqq")  # magic, format version, codec, array length, keyframe interval
+CHUNK_HEADER = struct.Struct("<qqqqq")  # steps, and bytes of keyframe, first and second operands, written values
+INDEX_ENTRY = struct.Struct("<qq")  # file offset and compressed size of a chunk
+FOOTER = struct.Struct("<qqq8s")  # index offset, chunk count, step count, magic
+
+# Argument references, in the order of their tag; LITERAL_ARG is the tag of
+# an argument stored as is.
+ARG_SOURCES = ("a", "b", "value at a", "value at b")
+LITERAL_ARG = len(ARG_SOURCES)
+
+# Compression codecs, in the order of their id in the header.
+CODECS = ("zlib", "lzma")
+
+# File name suffix that makes a sorting function's path option write an archive.
+ARCHIVE_SUFFIX = ".trz"
+
+# Number of decoded chunks a TraceArchive keeps in memory.
+DEFAULT_CACHED_CHUNKS = 4
+
+_MASK64 = 2 ** 64 - 1
+
+
+def _compress(data: bytes, codec: str) -> bytes:
+    """Compresses a chunk payload with one of CODECS."""
+    return zlib.compress(data, 6) if codec == "zlib" else lzma.compress(data)
+
+
+def _decompress(data: bytes, codec: str) -> bytes:
+    """Decompresses a chunk payload compressed with one of CODECS."""
+    return zlib.decompress(data) if codec == "zlib" else lzma.decompress(data)
+
+
+def encode_varints(values: array, delta: bool = False) -> bytes:
+    """
+    Encodes signed 64-bit integers as zigzag varints.
+
+    Zigzag maps small magnitudes of either sign to small unsigned numbers,
+    which are then written 7 bits per byte, low bits first, with the high
+    bit set on every byte but the last.
+
+    Args:
+        values (array): The values, as an array.array of typecode 'q'.
+        delta (bool): If True, each value is stored as its difference from
+            the previous one (the first from zero), wrapping modulo 2**64.
+
+    Returns:
+        bytes: The encoded values.
+    """
+    if np is not None:
+        signed = np.frombuffer(values, dtype=np.int64)
+        if sys.byteorder == "big":
+            signed = signed.byteswap()
+        if delta:
+            signed = np.diff(signed, prepend=np.int64(0))
+        zigzag = ((signed << 1) ^ (signed >> 63)).view(np.uint64)
+        lengths = np.ones(len(zigzag), dtype=np.int64)
+        for k in range(1, 10):
+            lengths += zigzag >= (np.uint64(1) << np.uint64(7 * k))
+        ends = np.cumsum(lengths)
+        out = np.empty(int(ends[-1]) if len(ends) else 0, dtype=np.uint8)
+        starts = ends - lengths
+        for k in range(int(lengths.max(initial=0))):
+            mask = lengths > k
+            chunk = ((zigzag[mask] >> np.uint64(7 * k)) & np.uint64(0x7F)).astype(np.uint8)
+            chunk[lengths[mask] > k + 1] |= 0x80
+            out[starts[mask] + k] = chunk
+        return out.tobytes()
+
+    out = bytearray()
+    previous = 0
+    for value in values:
+        if delta:
+            value, previous = ((value - previous + 2 ** 63) & _MASK64) - 2 ** 63, value
+        value = ((value << 1) ^ (value >> 63)) & _MASK64
+        while value > 0x7F:
+            out.append(value & 0x7F | 0x80)
+            value >>= 7
+        out.append(value)
+    return bytes(out)
+
+
+def decode_varints(data: bytes, delta: bool = False) -> List[int]:
+    """
+    Decodes values written by encode_varints.
+
+    Args:
+        data (bytes): The encoded values.
+        delta (bool): Whether the values were delta-encoded.
+
+    Returns:
+        List[int]: The values.
+    """
+    if np is not None:
+        raw = np.frombuffer(data, dtype=np.uint8)
+        ends = np.flatnonzero(raw < 0x80)
+        starts = np.concatenate(([0], ends[:-1] + 1)).astype(np.int64)
+        lengths = ends - starts + 1
+        zigzag = np.zeros(len(ends), dtype=np.uint64)
+        for k in range(int(lengths.max(initial=0))):
+            mask = lengths > k
+            zigzag[mask] |= (raw[starts[mask] + k] & 0x7F).astype(np.uint64) << np.uint64(7 * k)
+        signed = (zigzag >> np.uint64(1)).view(np.int64) ^ -(zigzag & np.uint64(1)).view(np.int64)
+        if delta:
+            signed = np.cumsum(signed)
+        return signed.tolist()
+
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+        else:
+            values.append((value >> 1) ^ -(value & 1))
+            value = shift = 0
+    if delta:
+        values = [((value + 2 ** 63) & _MASK64) - 2 ** 63 for value in accumulate(values)]
+    return values
+
+
+def _fixed_column(data: bytes, typecode: str) -> array:
+    """Reads a little-endian fixed-width column into an array."""
+    column = array(typecode)
+    column.frombytes(data)
+    if sys.byteorder == "big":
+        column.byteswap()
+    return column
+
+
+class Chunk:
+    """
+    The decoded columns of one archive chunk.
+
+    The message arguments are only resolved when first needed, since that
+    replays the whole chunk.
+    """
+
+    def __init__(self, payload: bytes):
+        """
+        Decodes a decompressed chunk payload.
+
+        Args:
+            payload (bytes): The chunk as written by ArchiveWriter, decompressed.
+        """
+        payload = memoryview(payload)
+        steps, *sizes = CHUNK_HEADER.unpack_from(payload)
+        keyframe_bytes, a_bytes, b_bytes, value_bytes = sizes
+        bounds = list(accumulate((CHUNK_HEADER.size, keyframe_bytes, steps, steps, 2 * steps, a_bytes, b_bytes,
+                                  value_bytes)))
+        keyframe, ops, counts, messages, a, b, values = (payload[start:end] for start, end in zip(bounds, bounds[1:]))
+        self.keyframe = decode_varints(keyframe, delta=True)
+        self.ops = _fixed_column(ops, 'b')
+        self.messages = _fixed_column(messages, 'H')
+        self.a = decode_varints(a, delta=True)
+        indices = iter(decode_varints(b, delta=True))
+        values = iter(decode_varints(values))
+        self.b = [next(values) if op == WRITE else next(indices) for op in self.ops]
+        self.arg_offsets = [0, *accumulate(bytes(counts))]
+        self._tags = bytes(payload[bounds[-1]:bounds[-1] + self.arg_offsets[-1]])
+        self._literals = payload[bounds[-1] + self.arg_offsets[-1]:]
+        self._args: Optional[List[int]] = None
+
+    @property
+    def args(self) -> List[int]:
+        """The message arguments of all steps, in order; see arg_offsets."""
+        if self._args is None:
+            literals = iter(decode_varints(self._literals))
+            tags = iter(self._tags)
+            state = list(self.keyframe)
+            args = []
+            append = args.append
+            for position, (op, a, b, first, last) in enumerate(zip(self.ops, self.a, self.b, self.arg_offsets,
+                                                                   self.arg_offsets[1:])):
+                if position:  # The keyframe is the state after the first step.
+                    if op == SWAP:
+                        state[a], state[b] = state[b], state[a]
+                    elif op == WRITE:
+                        state[a] = b
+                for _ in range(last - first):
+                    tag = next(tags)
+                    if tag == 0:
+                        append(a)
+                    elif tag == 1:
+                        append(b)
+                    elif tag == 2:
+                        append(state[a])
+                    elif tag == 3:
+                        append(state[b])
+                    else:
+                        append(next(literals))
+            self._args = args
+        return self._args
+
+
+class ArchiveWriter:
+    """
+    Writes a trace step by step to a compressed trace archive.
+
+    Steps are buffered in memory one chunk at a time; each full chunk is
+    encoded, compressed and appended to the file, and the chunk index is
+    written when the archive is closed. The writer replays the steps on its
+    own copy of the array, which provides the keyframes and the values that
+    message arguments are matched against.
+    """
+
+    def __init__(self, path: str, arr: List[int], keyframe_interval: Optional[int] = None, codec: str = "zlib"):
+        """
+        Creates the archive and records the initial state of `arr` as its first step.
+
+        Args:
+            path (str): Destination file; it is overwritten.
+            arr (List[int]): The initial array. It is copied.
+            keyframe_interval (Optional[int]): Number of steps per chunk, each
+                starting with a keyframe. Defaults to the larger of
+                DEFAULT_KEYFRAME_INTERVAL and len(arr). Larger chunks compress
+                better but take longer to decode on a seek.
+            codec (str): One of CODECS. "lzma" gives smaller files, "zlib"
+                is faster to write and read.
+        """
+        if keyframe_interval is None:
+            keyframe_interval = max(DEFAULT_KEYFRAME_INTERVAL, len(arr))
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        if codec not in CODECS:
+            raise ValueError(f"Unknown codec {codec!r}; expected one of {CODECS}.")
+        self.keyframe_interval = keyframe_interval
+        self.codec = codec
+        self._state = list(arr)
+        self._count = 0
+        self._index = []
+        self._start_chunk()
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, FORMAT_VERSION, CODECS.index(codec), len(arr), keyframe_interval))
+        self.record(NOTE, 0, 0, INITIAL_ARRAY)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _start_chunk(self):
+        """Empties the buffers of the current chunk."""
+        self._keyframe = array('q')
+        self._ops = array('b')
+        self._counts = array('B')
+        self._messages = array('H')
+        self._a = array('q')
+        self._b = array('q')
+        self._values = array('q')
+        self._tags = bytearray()
+        self._literals = array('q')
+
+    def _flush_chunk(self):
+        """Encodes, compresses and appends the buffered chunk."""
+        keyframe = encode_varints(self._keyframe, delta=True)
+        a = encode_varints(self._a, delta=True)
+        b = encode_varints(self._b, delta=True)
+        values = encode_varints(self._values)
+        messages = self._messages
+        if sys.byteorder == "big":
+            messages = array('H', messages)
+            messages.byteswap()
+        payload = b"".join((CHUNK_HEADER.pack(len(self._ops), len(keyframe), len(a), len(b), len(values)),
+                            keyframe, self._ops.tobytes(), self._counts.tobytes(), messages.tobytes(), a, b, values,
+                            self._tags, encode_varints(self._literals)))
+        data = _compress(payload, self.codec)
+        self._index.append((self._file.tell(), len(data)))
+        self._file.write(data)
+        self._start_chunk()
+
+    def record(self, op: int, a: int, b: int, message: int, args: Tuple[int, ...] = ()):
+        """
+        Appends one step, starting a new chunk with a keyframe at every chunk boundary.
+
+        Args:
+            op (int): The operation code.
+            a (int): First operand.
+            b (int): Second operand.
+            message (int): The message template id for the step.
+            args (Tuple[int, ...]): The message template arguments.
+        """
+        if len(args) > MAX_ARGS:
+            raise ValueError(f"Trace archives hold at most {MAX_ARGS} message arguments, got {len(args)}.")
+        state = self._state
+        if op == SWAP:
+            state[a], state[b] = state[b], state[a]
+        elif op == WRITE:
+            state[a] = b
+        if self._count % self.keyframe_interval == 0:
+            if self._count:
+                self._flush_chunk()
+            self._keyframe.extend(state)
+        self._ops.append(op)
+        self._counts.append(len(args))
+        self._messages.append(message)
+        self._a.append(a)
+        if op == WRITE:
+            self._values.append(b)
+        else:
+            self._b.append(b)
+        for arg in args:
+            if arg == a:
+                self._tags.append(0)
+            elif arg == b:
+                self._tags.append(1)
+            elif 0 <= a < len(state) and state[a] == arg:
+                self._tags.append(2)
+            elif 0 <= b < len(state) and state[b] == arg:
+                self._tags.append(3)
+            else:
+                self._tags.append(LITERAL_ARG)
+                self._literals.append(arg)
+        self._count += 1
+
+    def close(self):
+        """Writes the last chunk, the chunk index and the footer, and closes the file."""
+        if self._file.closed:
+            return
+        try:
+            if self._ops:
+                self._flush_chunk()
+            offset = self._file.tell()
+            for entry in self._index:
+                self._file.write(INDEX_ENTRY.pack(*entry))
+            self._file.write(FOOTER.pack(offset, len(self._index), self._count, MAGIC))
+        finally:
+            self._file.close()
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_archive(path: str, arr: List[int], steps: Iterable[Step], keyframe_interval: Optional[int] = None,
+                  codec: str = "zlib") -> int:
+    """
+    Runs a sorting generator to completion, writing its trace to a compressed archive.
+
+    Args:
+        path (str): Destination file.
+        arr (List[int]): The array sorted by the generator.
+        steps (Iterable[Step]): The sorting generator, e.g. algorithms.iter_quick_sort(arr).
+        keyframe_interval (Optional[int]): Number of steps per chunk.
+        codec (str): One of CODECS.
+
+    Returns:
+        int: The number of steps written.
+    """
+    with ArchiveWriter(path, arr, keyframe_interval, codec) as writer:
+        record = writer.record
+        for op, a, b, message, args in steps:
+            record(op, a, b, message, args)
+        return len(writer)
+
+
+def compress_trace(trace, path: str, keyframe_interval: Optional[int] = None, codec: str = "zlib") -> int:
+    """
+    Copies a recorded trace into a compressed archive, e.g. to shrink a trace file.
+
+    Args:
+        trace (Trace | TraceFile | TraceArchive): The trace to copy.
+        path (str): Destination file. It must differ from the trace's own file.
+        keyframe_interval (Optional[int]): Number of steps per chunk.
+        codec (str): One of CODECS.
+
+    Returns:
+        int: The number of steps written.
+    """
+    return write_archive(path, trace.state(0), trace.records(1), keyframe_interval, codec)
+
+
+class TraceArchive:
+    """
+    Read-only view of a trace archive written by ArchiveWriter.
+
+    Only the chunks holding the requested steps are read and decompressed,
+    and the most recently used ones are kept decoded, so playback and seeks
+    stay fast on archives much larger than memory once decompressed. It
+    offers the same read API as traces.Trace.
+    """
+
+    def __init__(self, path: str, cached_chunks: int = DEFAULT_CACHED_CHUNKS):
+        """
+        Opens an archive and reads its chunk index.
+
+        Args:
+            path (str): The archive.
+            cached_chunks (int): Number of decoded chunks kept in memory.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            header = self._file.read(HEADER.size)
+            if len(header) < HEADER.size or header[:len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a trace archive.")
+            _, version, codec, size, interval = HEADER.unpack(header)
+            if version != FORMAT_VERSION:
+                raise ValueError(f"{path} is a version {version} trace archive; only version "
+                                 f"{FORMAT_VERSION} can be read.")
+            if codec >= len(CODECS):
+                raise ValueError(f"{path} uses an unknown codec {codec}.")
+            end = self._file.seek(0, 2)
+            if end < HEADER.size + FOOTER.size:
+                raise ValueError(f"{path} is an incomplete trace archive.")
+            self._file.seek(end - FOOTER.size)
+            offset, chunks, length, magic = FOOTER.unpack(self._file.read(FOOTER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is an incomplete trace archive.")
+            self._file.seek(offset)
+            self._index = list(INDEX_ENTRY.iter_unpack(self._file.read(chunks * INDEX_ENTRY.size)))
+        except BaseException:
+            self._file.close()
+            raise
+        self.version = version
+        self.codec = CODECS[codec]
+        self.size = size
+        self.keyframe_interval = interval
+        self._length = length
+        self._cached_chunks = max(1, cached_chunks)
+        self._chunks: "OrderedDict[int, Chunk]" = OrderedDict()
+        self._cache_index = -1
+        self._cache_state = None
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def complete(self) -> bool:
+        """Always True; an archive holds every step already."""
+        return True
+
+    def fill(self, index: Optional[int] = None) -> int:
+        """Returns the number of steps; kept for compatibility with Trace.fill."""
+        return self._length
+
+    def _chunk(self, number: int) -> Chunk:
+        """
+        Returns the decoded columns of a chunk, reading and decompressing it if it is not cached.
+
+        Args:
+            number (int): The chunk number; step `index` is in chunk index // keyframe_interval.
+
+        Returns:
+            Chunk: The chunk's keyframe and step columns.
+        """
+        chunk = self._chunks.get(number)
+        if chunk is not None:
+            self._chunks.move_to_end(number)
+            return chunk
+
+        offset, size = self._index[number]
+        self._file.seek(offset)
+        chunk = Chunk(_decompress(self._file.read(size), self.codec))
+        self._chunks[number] = chunk
+        if len(self._chunks) > self._cached_chunks:
+            self._chunks.popitem(last=False)
+        return chunk
+
+    def _locate(self, index: int) -> Tuple[Chunk, int]:
+        """Returns the chunk holding step `index` and the step's position in it."""
+        if not 0 <= index < self._length:
+            raise IndexError("trace index out of range")
+        number, position = divmod(index, self.keyframe_interval)
+        return self._chunk(number), position
+
+    def state(self, index: int) -> List[int]:
+        """
+        Reconstructs the array after the given step.
+
+        Args:
+            index (int): The step index.
+
+        Returns:
+            List[int]: A fresh copy of the array state at that step.
+        """
+        chunk, position = self._locate(index)
+        first = index - position
+        cached = self._cache_index
+        if self._cache_state is not None and first <= cached <= index:
+            state = self._cache_state
+            start = cached - first + 1
+        else:
+            state = list(chunk.keyframe)
+            start = 1
+
+        stop = position + 1
+        replay(state, zip(chunk.ops[start:stop], chunk.a[start:stop], chunk.b[start:stop]))
+
+        self._cache_index = index
+        self._cache_state = state
+        return list(state)
+
+    def step(self, index: int) -> Step:
+        """
+        Returns the recorded operation of the given step.
+
+        Args:
+            index (int): The step index.
+
+        Returns:
+            Tuple[int, int, int, int, Tuple[int, ...]]: The operation code,
+            its two operands, the message template id and its arguments.
+        """
+        chunk, position = self._locate(index)
+        args = chunk.args[chunk.arg_offsets[position]:chunk.arg_offsets[position + 1]]
+        return chunk.ops[position], chunk.a[position], chunk.b[position], chunk.messages[position], tuple(args)
+
+    def highlight(self, index: int) -> List[int]:
+        """Returns the indices highlighted at the given step."""
+        op, a, b, _, _ = self.step(index)
+        return highlight_indices(op, a, b)
+
+    def message_args(self, index: int) -> Tuple[int, Tuple[int, ...]]:
+        """Returns the template id and arguments of the given step's message."""
+        _, _, _, message, args = self.step(index)
+        return message, args
+
+    def message(self, index: int) -> str:
+        """Formats the descriptive message of the given step."""
+        return format_message(*self.message_args(index))
+
+    def _spans(self, start: int, stop: int) -> Iterator[Tuple[Chunk, int, int]]:
+        """
+        Splits steps [start, stop) by chunk.
+
+        Yields:
+            Tuple[Chunk, int, int]: Each chunk and the positions in it of the
+            first step and one past the last step.
+        """
+        while start < stop:
+            number, position = divmod(start, self.keyframe_interval)
+            end = min(stop, (number + 1) * self.keyframe_interval)
+            yield self._chunk(number), position, position + end - start
+            start = end
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Step]:
+        """
+        Iterates over recorded steps in the (op, a, b, message, args) form
+        the sorting generators yield.
+
+        Args:
+            start (int): First step.
+            stop (Optional[int]): One past the last step. Defaults to the end.
+
+        Yields:
+            Step: The steps in order.
+        """
+        stop = self._length if stop is None else min(stop, self._length)
+        for chunk, first, last in self._spans(max(start, 0), stop):
+            offsets = chunk.arg_offsets
+            for position in range(first, last):
+                yield (chunk.ops[position], chunk.a[position], chunk.b[position], chunk.messages[position],
+                       tuple(chunk.args[offsets[position]:offsets[position + 1]]))
+
+    def find(self, start: int, ops: Sequence[int] = (), messages: Sequence[int] = ()) -> int:
+        """
+        Finds the first step at or after `start` with one of the given
+        operations or message templates.
+
+        Args:
+            start (int): The first step searched.
+            ops (Sequence[int]): Operation codes to look for.
+            messages (Sequence[int]): Message template ids to look for.
+
+        Returns:
+            int: The index of the matching step, or -1 if there is none.
+        """
+        start = max(start, 0)
+        for chunk, first, last in self._spans(start, self._length):
+            hits = [first_match(column[first:last], targets)
+                    for column, targets in ((chunk.ops, ops), (chunk.messages, messages)) if targets]
+            hits = [hit for hit in hits if hit >= 0]
+            if hits:
+                return start + min(hits)
+            start += last - first
+        return -1
+
+    def op_codes(self) -> bytes:
+        """Returns the operation code of every step, one byte per step."""
+        return b"".join(chunk.ops[first:last].tobytes() for chunk, first, last in self._spans(0, self._length))
+
+    def op_counts(self) -> Dict[str, int]:
+        """
+        Counts the recorded steps per operation.
+
+        Returns:
+            Dict[str, int]: Number of steps for each name in OP_NAMES.
+        """
+        codes = self.op_codes()
+        return {name: codes.count(op) for op, name in OP_NAMES.items()}
+
+    def columns(self, start: int = 0, stop: Optional[int] = None):
+        """
+        Returns the op codes and operands of steps [start, stop) as NumPy arrays.
+
+        Args:
+            start (int): First step.
+            stop (Optional[int]): One past the last step. Defaults to the end.
+
+        Returns:
+            Tuple[ndarray, ndarray, ndarray]: Operation codes, first operands
+            and second operands.
+        """
+        if np is None:
+            raise ImportError("TraceArchive.columns requires NumPy.")
+        start, stop, _ = slice(start, stop).indices(self._length)
+        spans = list(self._spans(start, stop))
+        if not spans:
+            return tuple(np.empty(0, dtype=np.int64) for _ in range(3))
+        return (np.concatenate([np.frombuffer(chunk.ops, dtype=np.int8)[first:last] for chunk, first, last in spans]),
+                np.concatenate([np.array(chunk.a[first:last], dtype=np.int64) for chunk, first, last in spans]),
+                np.concatenate([np.array(chunk.b[first:last], dtype=np.int64) for chunk, first, last in spans]))
+
+    def views(self) -> Tuple[TraceView, TraceView, TraceView]:
+        """
+        Returns list-like views compatible with the (steps, highlights, messages)
+        triple expected by the visualizer.
+        """
+        return TraceView(self, self.state), TraceView(self, self.highlight), TraceView(self, self.message)
+
+    def close(self):
+        """Closes the file and drops the decoded chunks."""
+        self._chunks.clear()
+        self._file.close()
+
+    def __enter__(self) -> "TraceArchive":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_trace(path: str):
+    """
+    Opens a trace written to disk, whichever format it is in.
+
+    Args:
+        path (str): A trace file written by tracefile.TraceWriter or an
+            archive written by ArchiveWriter.
+
+    Returns:
+        TraceFile | TraceArchive: The trace, to be closed by the caller.
+    """
+    with open(path, "rb") as file:
+        magic = file.read(len(MAGIC))
+    if magic == MAGIC:
+        return TraceArchive(path)
+    if magic == TRACE_FILE_MAGIC:
+        return TraceFile(path)
+    raise ValueError(f"{path} is not a trace file.")
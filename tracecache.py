@@ -0,0 +1,296 @@
+import hashlib
+import importlib
+import inspect
+import os
+from array import array
+from functools import lru_cache, partial
+from typing import Callable, List, Optional, Tuple
+
+from tracearchive import ARCHIVE_SUFFIX, FORMAT_VERSION, TraceArchive, compress_trace
+
+# Default location of the cache, following the XDG base directory convention.
+DEFAULT_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+                                 "algovisualizer", "traces")
+
+# Default bound on the total size of the cached archives.
+DEFAULT_MAX_BYTES = 512 * 2 ** 20
+
+# Modules that decide what a recorded trace means besides the algorithm's
+# own: the message templates and their arguments, how steps replay, and how
+# the parallel sorts split and merge their chunks.
+TRACE_MODULES = ("messages", "traces", "tracepool")
+
+
+@lru_cache(maxsize=None)
+def _module_digest(module: str) -> bytes:
+    """
+    Hashes the source file of a module, so that editing an algorithm
+    invalidates the traces it recorded.
+
+    Args:
+        module (str): Name of a module, imported if needed.
+
+    Returns:
+        bytes: The SHA-256 digest of the file, or of the module name if it has no source file.
+    """
+    path = getattr(importlib.import_module(module), "__file__", None)
+    if path is None:
+        return hashlib.sha256(module.encode()).digest()
+    with open(path, "rb") as file:
+        return hashlib.sha256(file.read()).digest()
+
+
+def _unwrap(sort_func: Callable) -> Tuple[Callable, tuple, dict]:
+    """Returns the function inside nested functools.partial objects and the arguments they bind."""
+    args, options = (), {}
+    while isinstance(sort_func, partial):
+        args = sort_func.args + args
+        options = {**sort_func.keywords, **options}
+        sort_func = sort_func.func
+    return sort_func, args, options
+
+
+def cacheable(sort_func: Callable) -> bool:
+    """
+    Tells whether a sorting function records the same trace on every run, so that it can be cached.
+
+    Args:
+        sort_func (Callable): A sorting function from algorithms.py, possibly with options bound.
+
+    Returns:
+        bool: False for quick sort with the random pivot and no seed.
+    """
+    _, _, options = _unwrap(sort_func)
+    return not (options.get("pivot") == "random" and options.get("seed") is None)
+
+
+def trace_key(sort_func: Callable, values: List[int]) -> str:
+    """
+    Computes the cache key of the trace of a sorting function on an input.
+
+    The key hashes the function's qualified name, the source of its module
+    and of TRACE_MODULES (standing in for the algorithm's version), the
+    options bound with functools.partial, e.g. by
+    algorithms.resolve_algorithm, the archive format version and the input
+    array. Functions taking `processes` split the input into one chunk per
+    process, so the process count they will use, defaulting to the CPU
+    count, is part of the key too.
+
+    Args:
+        sort_func (Callable): A sorting function from algorithms.py, possibly with options bound.
+        values (List[int]): The input array.
+
+    Returns:
+        str: A hexadecimal SHA-256 digest.
+    """
+    func, args, options = _unwrap(sort_func)
+    digest = hashlib.sha256()
+    digest.update(f"{func.__module__}.{func.__qualname__}\0".encode())
+    for module in (func.__module__, *TRACE_MODULES):
+        digest.update(_module_digest(module))
+    if "processes" in inspect.signature(func).parameters:
+        options = {**options, "processes": options.get("processes") or os.cpu_count() or 1}
+    digest.update(f"{args!r}{sorted(options.items())!r}\0{FORMAT_VERSION}\0{len(values)}\0".encode())
+    try:
+        digest.update(array('q', values).tobytes())
+    except OverflowError:
+        digest.update(repr(list(values)).encode())
+    return digest.hexdigest()
+
+
+class TraceCache:
+    """
+    On-disk, content-addressed cache of sorting traces.
+
+    Each trace is stored as a compressed archive (see tracearchive) named
+    after its trace_key, so it is found again whenever the same algorithm,
+    with the same options and unchanged source, sorts the same input. A hit
+    updates the archive's modification time; when the archives exceed
+    `max_bytes`, the least recently used ones are deleted.
+    """
+
+    def __init__(self, directory: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Opens the cache, creating its directory if needed.
+
+        Args:
+            directory (str): Directory holding the archives.
+            max_bytes (int): Bound on the total size of the archives.
+        """
+        if max_bytes < 0:
+            raise ValueError("max_bytes must not be negative")
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        """Returns the archive path for a cache key."""
+        return os.path.join(self.directory, key + ARCHIVE_SUFFIX)
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """Lists the cached archives as (last use, size, path), least recently used first."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            key, suffix = os.path.splitext(entry.name)
+            if suffix == ARCHIVE_SUFFIX and "." not in key and entry.is_file():  # Skips archives being written.
+                try:
+                    stat = entry.stat()
+                except OSError:  # Removed by another process meanwhile.
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        return entries
+
+    def size(self) -> int:
+        """Returns the total size in bytes of the cached archives."""
+        return sum(size for _, size, _ in self._entries())
+
+    def __len__(self) -> int:
+        return len(self._entries())
+
+    def get(self, sort_func: Callable, values: List[int]) -> Optional[TraceArchive]:
+        """
+        Looks up the trace of a sorting function on an input.
+
+        Args:
+            sort_func (Callable): A sorting function from algorithms.py, possibly with options bound.
+            values (List[int]): The input array.
+
+        Returns:
+            Optional[TraceArchive]: The cached trace, to be closed by the
+            caller, or None on a miss. Unreadable entries are deleted and
+            count as misses, and functions that are not cacheable always miss.
+        """
+        if not cacheable(sort_func):
+            return None
+        path = self.path(trace_key(sort_func, values))
+        try:
+            trace = TraceArchive(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            self._remove(path)
+            return None
+        os.utime(path)
+        return trace
+
+    def put(self, sort_func: Callable, values: List[int], trace) -> TraceArchive:
+        """
+        Stores an already recorded trace, e.g. one of tracepool.generate_traces.
+
+        Args:
+            sort_func (Callable): The sorting function that recorded it.
+            values (List[int]): The input array.
+            trace (Trace | TraceFile | TraceArchive): The complete trace.
+
+        Returns:
+            TraceArchive: The stored copy, to be closed by the caller, or
+            `trace` itself if the function is not cacheable.
+        """
+        if not cacheable(sort_func):
+            return trace
+        return self._store(trace_key(sort_func, values), lambda path: compress_trace(trace, path))
+
+    def record(self, sort_func: Callable, values: List[int], **trace_options) -> TraceArchive:
+        """
+        Returns the cached trace of a sorting function on an input, recording
+        it straight into the cache on a miss.
+
+        Args:
+            sort_func (Callable): A sorting function from algorithms.py, possibly with options bound.
+            values (List[int]): The input array. It is not modified.
+            **trace_options: Keyword arguments for tracearchive.write_archive,
+                such as codec. They do not change the trace, so they are not
+                part of the key.
+
+        Returns:
+            TraceArchive: The trace, to be closed by the caller. Functions
+            that are not cacheable are recorded in memory as a Trace instead.
+        """
+        if not cacheable(sort_func):
+            steps, _, _ = sort_func(list(values))
+            return steps.trace
+        trace = self.get(sort_func, values)
+        if trace is not None:
+            return trace
+
+        def write(path: str):
+            """Runs the sort, writing its archive to `path`."""
+            steps, _, _ = sort_func(list(values), path=path, **trace_options)
+            steps.trace.close()
+
+        return self._store(trace_key(sort_func, values), write)
+
+    def store(self, sort_func: Callable, values: List[int], **trace_options) -> bool:
+        """
+        Records the trace of a sorting function into the cache unless it is
+        already there, without opening it, e.g. from a background process.
+
+        Args:
+            sort_func (Callable): A sorting function from algorithms.py, possibly with options bound.
+            values (List[int]): The input array. It is not modified.
+            **trace_options: Keyword arguments for tracearchive.write_archive.
+
+        Returns:
+            bool: True if the trace was recorded, False if it was already
+            cached or the function is not cacheable.
+        """
+        if not cacheable(sort_func):
+            return False
+        trace = self.get(sort_func, values)
+        if trace is None:
+            trace = self.record(sort_func, values, **trace_options)
+            recorded = True
+        else:
+            recorded = False
+        trace.close()
+        return recorded
+
+    def _store(self, key: str, write: Callable[[str], object]) -> TraceArchive:
+        """
+        Writes an archive under a temporary name, moves it into place and evicts old entries.
+
+        Writing under a temporary name keeps readers, including other
+        processes, from ever seeing a partial archive.
+        """
+        path = self.path(key)
+        temporary = os.path.join(self.directory, f"{key}.{os.getpid()}.tmp{ARCHIVE_SUFFIX}")
+        try:
+            write(temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            self._remove(temporary)
+            raise
+        trace = TraceArchive(path)
+        self.evict(keep=path)
+        return trace
+
+    @staticmethod
+    def _remove(path: str):
+        """Deletes a file, ignoring one that is already gone or still in use."""
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def evict(self, keep: Optional[str] = None):
+        """
+        Deletes the least recently used archives until the cache fits in max_bytes.
+
+        Args:
+            keep (Optional[str]): An archive that is never deleted, such as
+                the one just stored, even if it alone exceeds the bound.
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path != keep:
+                self._remove(path)
+                total -= size
+
+    def clear(self):
+        """Deletes every cached archive."""
+        for _, _, path in self._entries():
+            self._remove(path)
@@ -0,0 +1,411 @@
+import mmap
+import struct
+import sys
+from array import array
+from operator import itemgetter
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from messages import INITIAL_ARRAY, format_message
+from traces import (DEFAULT_KEYFRAME_INTERVAL, NOTE, OP_NAMES, Step, TraceView, first_match,
+                    highlight_indices, replay)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for TraceFile.columns and speeds up find.
+    np = None
+
+# A trace file starts with a fixed header followed by blocks of
+# `keyframe_interval` steps. Each block holds a keyframe (the array after the
+# block's first step) and then one fixed-size record per step, so the byte
+# offset of any step is computed directly from its index.
+MAGIC = b"ALGOTRC1"
+HEADER = struct.Struct("<8sB7xqq")  # magic, value width in bytes, array length, keyframe interval
+
+# Largest number of message template arguments a record can hold.
+MAX_ARGS = 4
+
+_INT32 = (-2 ** 31, 2 ** 31 - 1)
+
+
+def _record_struct(width: int) -> struct.Struct:
+    """
+    Returns the layout of one step record.
+
+    Records hold the op code, the number of message arguments, the message
+    template id, both operands and MAX_ARGS argument slots.
+
+    Args:
+        width (int): Size in bytes of operands and arguments, 4 or 8.
+
+    Returns:
+        struct.Struct: The little-endian record layout.
+    """
+    code = "i" if width == 4 else "q"
+    return struct.Struct("<bBH" + code * (2 + MAX_ARGS))
+
+
+def _typecode(width: int) -> str:
+    """Returns the array.array typecode of keyframe values for a value width."""
+    return "i" if width == 4 else "q"
+
+
+class TraceWriter:
+    """
+    Writes a trace step by step to a binary file instead of keeping it in memory.
+
+    Every value that fits in 32 bits (the array values and its length) is
+    stored in 4 bytes, otherwise in 8.
+    """
+
+    def __init__(self, path: str, arr: List[int], keyframe_interval: Optional[int] = None):
+        """
+        Creates the file and records the initial state of `arr` as its first step.
+
+        Args:
+            path (str): Destination file; it is overwritten.
+            arr (List[int]): The array being sorted. It is observed, not copied.
+            keyframe_interval (Optional[int]): Number of steps between two
+                keyframes. Defaults to the larger of DEFAULT_KEYFRAME_INTERVAL
+                and len(arr).
+        """
+        if keyframe_interval is None:
+            keyframe_interval = max(DEFAULT_KEYFRAME_INTERVAL, len(arr))
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        low, high = _INT32
+        fits = not arr or (low <= min(arr) and max(arr) <= high and len(arr) <= high)
+        self.width = 4 if fits else 8
+        self.keyframe_interval = keyframe_interval
+        self._live = arr
+        self._pack = _record_struct(self.width).pack
+        self._padding = [(0,) * (MAX_ARGS - count) for count in range(MAX_ARGS + 1)]
+        self._typecode = _typecode(self.width)
+        self._count = 0
+        self._file = open(path, "wb")
+        self._file.write(HEADER.pack(MAGIC, self.width, len(arr), keyframe_interval))
+        self.record(NOTE, 0, 0, INITIAL_ARRAY)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def record(self, op: int, a: int, b: int, message: int, args: Tuple[int, ...] = ()):
+        """
+        Appends one step, preceded by a keyframe at every block boundary.
+
+        Args:
+            op (int): The operation code.
+            a (int): First operand.
+            b (int): Second operand.
+            message (int): The message template id for the step.
+            args (Tuple[int, ...]): The message template arguments.
+        """
+        if len(args) > MAX_ARGS:
+            raise ValueError(f"Trace files hold at most {MAX_ARGS} message arguments, got {len(args)}.")
+        if self._count % self.keyframe_interval == 0:
+            keyframe = array(self._typecode, self._live)
+            if sys.byteorder == "big":
+                keyframe.byteswap()
+            self._file.write(keyframe.tobytes())
+        self._file.write(self._pack(op, len(args), message, a, b, *args, *self._padding[len(args)]))
+        self._count += 1
+
+    def close(self):
+        """Flushes and closes the file."""
+        self._file.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_trace(path: str, arr: List[int], steps: Iterable[Step], keyframe_interval: Optional[int] = None) -> int:
+    """
+    Runs a sorting generator to completion, writing its trace to a file.
+
+    Args:
+        path (str): Destination file.
+        arr (List[int]): The array sorted by the generator.
+        steps (Iterable[Step]): The sorting generator, e.g. algorithms.iter_quick_sort(arr).
+        keyframe_interval (Optional[int]): Number of steps between two keyframes.
+
+    Returns:
+        int: The number of steps written.
+    """
+    with TraceWriter(path, arr, keyframe_interval) as writer:
+        record = writer.record
+        for op, a, b, message, args in steps:
+            record(op, a, b, message, args)
+        return len(writer)
+
+
+class TraceFile:
+    """
+    Read-only, memory-mapped view of a trace written by TraceWriter.
+
+    Only the pages holding the requested steps are read from disk, so a
+    trace far larger than memory can be replayed and sought by index. It
+    offers the same read API as traces.Trace.
+    """
+
+    def __init__(self, path: str):
+        """
+        Opens and maps a trace file.
+
+        Args:
+            path (str): The trace file.
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file.
+            self._file.close()
+            raise ValueError(f"{path} is not a trace file.")
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError(f"{path} is not a trace file.")
+        magic, width, size, interval = HEADER.unpack_from(self._map)
+        if magic != MAGIC or width not in (4, 8):
+            self.close()
+            raise ValueError(f"{path} is not a trace file.")
+        self.width = width
+        self.size = size
+        self.keyframe_interval = interval
+        self._record = _record_struct(width)
+        self._typecode = _typecode(width)
+        self._keyframe_bytes = size * width
+        self._block_bytes = self._keyframe_bytes + interval * self._record.size
+
+        blocks, rest = divmod(len(self._map) - HEADER.size, self._block_bytes)
+        partial = max(0, rest - self._keyframe_bytes) // self._record.size
+        self._length = blocks * interval + partial
+        self._cache_index = -1
+        self._cache_state = None
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def complete(self) -> bool:
+        """Always True; a trace file holds every step already."""
+        return True
+
+    def fill(self, index: Optional[int] = None) -> int:
+        """Returns the number of steps; kept for compatibility with Trace.fill."""
+        return self._length
+
+    def _offset(self, index: int) -> int:
+        """Returns the byte offset of step `index`'s record."""
+        block, position = divmod(index, self.keyframe_interval)
+        return HEADER.size + block * self._block_bytes + self._keyframe_bytes + position * self._record.size
+
+    def _records(self, start: int, stop: int) -> Iterator[tuple]:
+        """
+        Unpacks the records of steps [start, stop), skipping over keyframes.
+
+        Yields:
+            tuple: (op, argument count, message, a, b, *argument slots).
+        """
+        view = memoryview(self._map)
+        try:
+            while start < stop:
+                end = min(stop, (start // self.keyframe_interval + 1) * self.keyframe_interval)
+                offset = self._offset(start)
+                yield from self._record.iter_unpack(view[offset:offset + (end - start) * self._record.size])
+                start = end
+        finally:
+            view.release()
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Step]:
+        """
+        Iterates over recorded steps in the (op, a, b, message, args) form
+        the sorting generators yield, e.g. to record them into another trace.
+
+        Args:
+            start (int): First step.
+            stop (Optional[int]): One past the last step. Defaults to the end.
+
+        Yields:
+            Step: The steps in order.
+        """
+        stop = self._length if stop is None else min(stop, self._length)
+        for op, count, message, a, b, *args in self._records(max(start, 0), stop):
+            yield op, a, b, message, tuple(args[:count])
+
+    def _keyframe(self, block: int) -> List[int]:
+        """Reads the keyframe of a block as a list."""
+        offset = HEADER.size + block * self._block_bytes
+        keyframe = array(self._typecode)
+        keyframe.frombytes(self._map[offset:offset + self._keyframe_bytes])
+        if sys.byteorder == "big":
+            keyframe.byteswap()
+        return keyframe.tolist()
+
+    def state(self, index: int) -> List[int]:
+        """
+        Reconstructs the array after the given step.
+
+        Args:
+            index (int): The step index.
+
+        Returns:
+            List[int]: A fresh copy of the array state at that step.
+        """
+        if not 0 <= index < self._length:
+            raise IndexError("trace index out of range")
+
+        cached = self._cache_index
+        if self._cache_state is not None and cached <= index and index - cached <= self.keyframe_interval:
+            state = self._cache_state
+            position = cached
+        else:
+            block = index // self.keyframe_interval
+            state = self._keyframe(block)
+            position = block * self.keyframe_interval
+
+        replay(state, map(itemgetter(0, 3, 4), self._records(position + 1, index + 1)))
+
+        self._cache_index = index
+        self._cache_state = state
+        return list(state)
+
+    def step(self, index: int) -> Step:
+        """
+        Returns the recorded operation of the given step.
+
+        Args:
+            index (int): The step index.
+
+        Returns:
+            Tuple[int, int, int, int, Tuple[int, ...]]: The operation code,
+            its two operands, the message template id and its arguments.
+        """
+        if not 0 <= index < self._length:
+            raise IndexError("trace index out of range")
+        op, count, message, a, b, *args = self._record.unpack_from(self._map, self._offset(index))
+        return op, a, b, message, tuple(args[:count])
+
+    def highlight(self, index: int) -> List[int]:
+        """Returns the indices highlighted at the given step."""
+        op, a, b, _, _ = self.step(index)
+        return highlight_indices(op, a, b)
+
+    def message_args(self, index: int) -> Tuple[int, Tuple[int, ...]]:
+        """Returns the template id and arguments of the given step's message."""
+        _, _, _, message, args = self.step(index)
+        return message, args
+
+    def message(self, index: int) -> str:
+        """Formats the descriptive message of the given step."""
+        return format_message(*self.message_args(index))
+
+    def _record_arrays(self, start: int, stop: int):
+        """
+        Maps the records of steps [start, stop) as NumPy structured arrays, one per block.
+
+        The arrays share memory with the file map and must be released before
+        the trace file is closed.
+
+        Returns:
+            List[ndarray]: Records with fields op, count, message, a, b and args.
+        """
+        value = "<i4" if self.width == 4 else "<i8"
+        dtype = np.dtype([("op", "i1"), ("count", "u1"), ("message", "<u2"),
+                          ("a", value), ("b", value), ("args", value, (MAX_ARGS,))])
+        chunks = []
+        while start < stop:
+            end = min(stop, (start // self.keyframe_interval + 1) * self.keyframe_interval)
+            chunks.append(np.frombuffer(self._map, dtype, end - start, self._offset(start)))
+            start = end
+        return chunks
+
+    def find(self, start: int, ops: Sequence[int] = (), messages: Sequence[int] = ()) -> int:
+        """
+        Finds the first step at or after `start` with one of the given
+        operations or message templates.
+
+        Args:
+            start (int): The first step searched.
+            ops (Sequence[int]): Operation codes to look for.
+            messages (Sequence[int]): Message template ids to look for.
+
+        Returns:
+            int: The index of the matching step, or -1 if there is none.
+        """
+        start = max(start, 0)
+        if np is None:
+            for index, (op, _, message, *_) in enumerate(self._records(start, self._length), start):
+                if op in ops or message in messages:
+                    return index
+            return -1
+        for records in self._record_arrays(start, self._length):
+            hits = [first_match(records[field], targets)
+                    for field, targets in (("op", ops), ("message", messages)) if targets]
+            hits = [hit for hit in hits if hit >= 0]
+            if hits:
+                return start + min(hits)
+            start += len(records)
+        return -1
+
+    def op_codes(self) -> bytes:
+        """
+        Returns the operation code of every step, one byte per step, by
+        reading the first byte of every record.
+        """
+        stride = self._record.size
+        codes = bytearray()
+        for block in range(-(-self._length // self.keyframe_interval)):
+            start = HEADER.size + block * self._block_bytes + self._keyframe_bytes
+            steps = min(self.keyframe_interval, self._length - block * self.keyframe_interval)
+            codes += self._map[start:start + steps * stride:stride]
+        return bytes(codes)
+
+    def op_counts(self) -> Dict[str, int]:
+        """
+        Counts the recorded steps per operation.
+
+        Returns:
+            Dict[str, int]: Number of steps for each name in OP_NAMES.
+        """
+        codes = self.op_codes()
+        return {name: codes.count(op) for op, name in OP_NAMES.items()}
+
+    def columns(self, start: int = 0, stop: Optional[int] = None):
+        """
+        Returns the op codes and operands of steps [start, stop) as NumPy arrays.
+
+        Args:
+            start (int): First step.
+            stop (Optional[int]): One past the last step. Defaults to the end.
+
+        Returns:
+            Tuple[ndarray, ndarray, ndarray]: Operation codes, first operands
+            and second operands, copied out of the file.
+        """
+        if np is None:
+            raise ImportError("TraceFile.columns requires NumPy.")
+        start, stop, _ = slice(start, stop).indices(self._length)
+        chunks = self._record_arrays(start, stop)
+        if not chunks:
+            return tuple(np.empty(0, dtype=np.int64) for _ in range(3))
+        return tuple(np.concatenate([records[field] for records in chunks]) for field in ("op", "a", "b"))
+
+    def views(self) -> Tuple[TraceView, TraceView, TraceView]:
+        """
+        Returns list-like views compatible with the (steps, highlights, messages)
+        triple expected by the visualizer.
+        """
+        return TraceView(self, self.state), TraceView(self, self.highlight), TraceView(self, self.message)
+
+    def close(self):
+        """Unmaps and closes the file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "TraceFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
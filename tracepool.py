@@ -0,0 +1,313 @@
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from traces import Trace
+
+# Phases timed by iter_radix_passes: starting the pool and the shared
+# buffers, counting digits in the workers, computing the scatter offsets in
+# the parent, moving values in the workers, and reading results back.
+RADIX_PHASES = ("setup", "histogram", "prefix", "scatter", "collect")
+
+
+def share_array(values: List[int]) -> SharedMemory:
+    """
+    Copies an integer array into a new shared memory block.
+
+    The caller owns the block and must close and unlink it.
+
+    Args:
+        values (List[int]): The array; every value must fit in 64 bits.
+
+    Returns:
+        SharedMemory: A block holding the values as native int64.
+    """
+    data = array('q', values)
+    shm = SharedMemory(create=True, size=max(1, len(data) * data.itemsize))
+    shm.buf[:len(data) * data.itemsize] = data.tobytes()
+    return shm
+
+
+def read_shared_array(name: str, length: int, start: int = 0) -> List[int]:
+    """
+    Reads an array written by share_array from another process.
+
+    Args:
+        name (str): Name of the shared memory block.
+        length (int): Number of values to read.
+        start (int): Index of the first value to read.
+
+    Returns:
+        List[int]: A private copy of the values.
+    """
+    shm = SharedMemory(name=name)
+    try:
+        values = shm.buf[start * 8:(start + length) * 8].cast('q')
+        try:
+            return values.tolist()
+        finally:
+            values.release()
+    finally:
+        shm.close()
+
+
+def write_shared_array(name: str, values: List[int], start: int = 0):
+    """
+    Overwrites part of an array created by share_array.
+
+    Args:
+        name (str): Name of the shared memory block.
+        values (List[int]): The new values.
+        start (int): Index of the first value to overwrite.
+    """
+    shm = SharedMemory(name=name)
+    try:
+        data = array('q', values)
+        shm.buf[start * 8:start * 8 + len(data) * data.itemsize] = data.tobytes()
+    finally:
+        shm.close()
+
+
+def generate_trace(sort_func: Callable, name: str, length: int, **trace_options) -> Trace:
+    """
+    Sorts the shared input array and returns the complete trace. Runs inside a worker process.
+
+    Args:
+        sort_func (Callable): A sorting function from algorithms.py.
+        name (str): Name of the shared memory block holding the input.
+        length (int): Number of values in the input.
+        **trace_options: Keyword arguments for traces.Trace.
+
+    Returns:
+        Trace: The trace. Only its recorded columns are sent back to the
+        parent process.
+    """
+    arr = read_shared_array(name, length)
+    steps, highlights, messages = sort_func(arr, **trace_options)
+    return steps.trace
+
+
+def generate_traces(sort_funcs: Sequence[Callable], array: List[int], processes: Optional[int] = None,
+                    **trace_options) -> List[Trace]:
+    """
+    Records the traces of several sorting functions on one input in parallel.
+
+    The input is placed once in shared memory instead of being pickled for
+    every job; each worker copies it, sorts, and sends back the compact
+    trace, so the total time is that of the slowest sort when there are
+    enough CPUs.
+
+    Args:
+        sort_funcs (Sequence[Callable]): Sorting functions from algorithms.py.
+        array (List[int]): The input array. It is not modified.
+        processes (Optional[int]): Number of worker processes. Defaults to the CPU count.
+        **trace_options: Keyword arguments for traces.Trace, such as backend.
+
+    Returns:
+        List[Trace]: The complete trace of each function, in order. Use
+        trace.views() for the (steps, highlights, messages) triple.
+    """
+    shm = share_array(array)
+    try:
+        job = partial(generate_trace, name=shm.name, length=len(array), **trace_options)
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            return list(executor.map(job, sort_funcs))
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def sort_chunk(bounds: Tuple[int, int], sort_func: Callable, name: str, level: str = "full", **trace_options):
+    """
+    Sorts one chunk of the shared array and writes it back. Runs inside a worker process.
+
+    Args:
+        bounds (Tuple[int, int]): Start and end (exclusive) of the chunk.
+        sort_func (Callable): A sorting function from algorithms.py.
+        name (str): Name of the shared memory block holding the array.
+        level (str): Recording level passed to the sorting function.
+        **trace_options: Keyword arguments for traces.Trace.
+
+    Returns:
+        Trace | Dict[str, int] | None: The chunk's trace, with indices
+        relative to the chunk, for level "full"; its counters for
+        "counters"; None for "none".
+    """
+    start, end = bounds
+    chunk = read_shared_array(name, end - start, start)
+    result = sort_func(chunk, level=level, **trace_options)
+    write_shared_array(name, chunk, start)
+    return result[0].trace if level == "full" else result
+
+
+def sort_chunks(sort_func: Callable, array: List[int], bounds: Sequence[Tuple[int, int]],
+                processes: Optional[int] = None, level: str = "full", **trace_options) -> Tuple[List[int], list]:
+    """
+    Sorts disjoint chunks of an array in parallel.
+
+    The array is shared once; each worker sorts its chunk in place in the
+    shared block, so only traces or counters are pickled back.
+
+    Args:
+        sort_func (Callable): A sorting function from algorithms.py.
+        array (List[int]): The input array. It is not modified.
+        bounds (Sequence[Tuple[int, int]]): (start, end) of each chunk.
+        processes (Optional[int]): Number of worker processes. Defaults to the CPU count.
+        level (str): Recording level passed to the sorting function.
+        **trace_options: Keyword arguments for traces.Trace, such as backend.
+
+    Returns:
+        Tuple[List[int], list]: The array with every chunk sorted, and the
+        result of sort_chunk for each chunk, in order.
+    """
+    shm = share_array(array)
+    try:
+        job = partial(sort_chunk, sort_func=sort_func, name=shm.name, level=level, **trace_options)
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(job, bounds))
+        return read_shared_array(shm.name, len(array)), results
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def count_digits(bounds: Tuple[int, int], name: str, shift: int, mask: int, offset: int) -> List[int]:
+    """
+    Builds the digit histogram of one chunk of a shared array. Runs inside a worker process.
+
+    Args:
+        bounds (Tuple[int, int]): Start and end (exclusive) of the chunk.
+        name (str): Name of the shared memory block holding the values.
+        shift (int): Bit position of the digit.
+        mask (int): Base minus one.
+        offset (int): Subtracted from every value to make the keys non-negative.
+
+    Returns:
+        List[int]: The number of values of the chunk with each digit.
+    """
+    start, end = bounds
+    count = [0] * (mask + 1)
+    for value in read_shared_array(name, end - start, start):
+        count[((value - offset) >> shift) & mask] += 1
+    return count
+
+
+def scatter_digits(job: Tuple[Tuple[int, int], List[int]], source: str, target: str, shift: int, mask: int,
+                   offset: int):
+    """
+    Moves the values of one chunk to their place for one digit. Runs inside a worker process.
+
+    Args:
+        job (Tuple[Tuple[int, int], List[int]]): The chunk bounds, and the
+            index in the target where the chunk's first value with each
+            digit goes.
+        source (str): Name of the shared memory block holding the values.
+        target (str): Name of the shared memory block receiving them.
+        shift (int): Bit position of the digit.
+        mask (int): Base minus one.
+        offset (int): Subtracted from every value to make the keys non-negative.
+    """
+    (start, end), positions = job
+    values = read_shared_array(source, end - start, start)
+    shm = SharedMemory(name=target)
+    try:
+        view = shm.buf.cast('q')
+        try:
+            for value in values:
+                digit = ((value - offset) >> shift) & mask
+                view[positions[digit]] = value
+                positions[digit] += 1
+        finally:
+            view.release()
+    finally:
+        shm.close()
+
+
+def iter_radix_passes(values: List[int], base: int, bounds: Sequence[Tuple[int, int]],
+                      processes: Optional[int] = None,
+                      timings: Optional[Dict[str, float]] = None) -> Iterator[Tuple[int, int, List[List[int]],
+                                                                                      Callable[[], List[int]]]]:
+    """
+    Runs a parallel LSD radix sort over two shared buffers, one digit pass at a time.
+
+    In every pass, each worker counts the digits of its chunk; the parent
+    turns the histograms into the position where each chunk's values with
+    each digit start, ordered by digit and then by chunk, which keeps the
+    sort stable; then each worker writes its chunk to those positions in
+    the other buffer. The pool and buffers live until the generator ends.
+
+    Args:
+        values (List[int]): The input array. It is not modified.
+        base (int): The radix, a power of two such as 256 or 65536.
+        bounds (Sequence[Tuple[int, int]]): (start, end) of each worker's
+            chunk, covering the array in order.
+        processes (Optional[int]): Number of worker processes. Defaults to the CPU count.
+        timings (Optional[Dict[str, float]]): If given, the seconds spent in
+            each of RADIX_PHASES are added to it.
+
+    Yields:
+        Tuple[int, int, List[List[int]], Callable[[], List[int]]]: For each
+        pass, the digit position, the number of passes, the histogram of
+        every chunk, and a function that reads the array after the pass.
+        The function is only valid until the generator is resumed.
+    """
+    if base < 2 or base & (base - 1):
+        raise ValueError(f"Parallel radix sort needs a power-of-two base, got {base}.")
+    if timings is None:
+        timings = {}
+    for phase in RADIX_PHASES:
+        timings.setdefault(phase, 0.0)
+
+    clock = time.perf_counter()
+    offset = min(0, min(values, default=0))
+    max_key = max(values, default=0) - offset
+    bits = base.bit_length() - 1
+    passes = 0
+    while max_key >> (bits * passes):
+        passes += 1
+    buffers = [share_array(values), share_array(values)]
+    try:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            # Run one trivial task per chunk so that the worker processes are
+            # started here, and their start-up counts as setup rather than as
+            # part of the first histogram phase.
+            list(executor.map(abs, range(len(bounds))))
+            timings["setup"] += time.perf_counter() - clock
+
+            for position in range(passes):
+                source, target = buffers[position % 2].name, buffers[(position + 1) % 2].name
+                digit = {"shift": bits * position, "mask": base - 1, "offset": offset}
+
+                clock = time.perf_counter()
+                histograms = list(executor.map(partial(count_digits, name=source, **digit), bounds))
+                timings["histogram"] += time.perf_counter() - clock
+
+                clock = time.perf_counter()
+                positions = [[0] * base for _ in bounds]
+                total = 0
+                for d in range(base):
+                    for chunk, histogram in enumerate(histograms):
+                        positions[chunk][d] = total
+                        total += histogram[d]
+                timings["prefix"] += time.perf_counter() - clock
+
+                clock = time.perf_counter()
+                list(executor.map(partial(scatter_digits, source=source, target=target, **digit),
+                                  zip(bounds, positions)))
+                timings["scatter"] += time.perf_counter() - clock
+
+                def read(name: str = target) -> List[int]:
+                    """Reads the array as left by this pass."""
+                    clock = time.perf_counter()
+                    result = read_shared_array(name, len(values))
+                    timings["collect"] += time.perf_counter() - clock
+                    return result
+
+                yield position, passes, histograms, read
+    finally:
+        for shm in buffers:
+            shm.close()
+            shm.unlink()
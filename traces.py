@@ -0,0 +1,606 @@
+from array import array
+from collections.abc import Sequence
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from messages import INDEX_ARGS, INITIAL_ARRAY, format_message
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the "numpy" backend.
+    np = None
+
+# Operation codes recorded for every step of a trace.
+NOTE = 0      # Message only; the array is unchanged and nothing is highlighted.
+VISIT = 1     # Highlights a single index without changing the array.
+COMPARE = 2   # Compares two indices; the array is unchanged.
+SWAP = 3      # Swaps the values at two indices.
+WRITE = 4     # Writes a value to an index.
+
+OP_NAMES = {NOTE: "notes", VISIT: "visits", COMPARE: "compares", SWAP: "swaps", WRITE: "writes"}
+
+DEFAULT_KEYFRAME_INTERVAL = 1024
+
+# Number of steps scanned (and, for streamed traces, generated) at a time by `Trace.find`.
+FIND_CHUNK = 65536
+
+Step = Tuple[int, int, int, int, Tuple[int, ...]]
+
+
+def replay(state: List[int], steps: Iterable[Tuple[int, int, int]]):
+    """
+    Applies recorded operations to an array state in place.
+
+    Args:
+        state (List[int]): The array state to update.
+        steps (Iterable[Tuple[int, int, int]]): (op, a, b) triples in trace order.
+    """
+    for op, i, j in steps:
+        if op == SWAP:
+            state[i], state[j] = state[j], state[i]
+        elif op == WRITE:
+            state[i] = j
+
+
+def highlight_indices(op: int, a: int, b: int) -> List[int]:
+    """
+    Returns the indices highlighted by one recorded operation.
+
+    Args:
+        op (int): The operation code.
+        a (int): First operand.
+        b (int): Second operand.
+
+    Returns:
+        List[int]: Highlighted indices (empty for message-only steps).
+    """
+    if op == NOTE:
+        return []
+    if op == VISIT or op == WRITE or a == b:
+        return [a]
+    return [a, b]
+
+
+def shift_step(step: Step, offset: int) -> Step:
+    """
+    Moves a step recorded on a slice of an array to the whole array.
+
+    Args:
+        step (Step): An (op, a, b, message, args) step whose indices are
+            relative to the start of the slice.
+        offset (int): Index of the slice's first element in the whole array.
+
+    Returns:
+        Step: The same step with every index operand and index argument
+        (see messages.INDEX_ARGS) shifted by `offset`. Written values are
+        left unchanged.
+    """
+    op, a, b, message, args = step
+    if op != NOTE:
+        a += offset
+        if op == COMPARE or op == SWAP:
+            b += offset
+    positions = INDEX_ARGS.get(message)
+    if positions:
+        args = tuple(value + offset if position in positions else value for position, value in enumerate(args))
+    return op, a, b, message, args
+
+
+def first_match(values, targets: Sequence[int]) -> int:
+    """
+    Returns the position of the first value in `targets`.
+
+    Args:
+        values (array | ndarray): A slice of a trace column.
+        targets (Sequence[int]): The values searched for.
+
+    Returns:
+        int: The position of the first match, or -1 if there is none.
+    """
+    if isinstance(values, array):
+        return min((values.index(target) for target in targets if target in values), default=-1)
+    hits = np.flatnonzero(np.isin(values, targets))
+    return int(hits[0]) if len(hits) else -1
+
+
+class NumpyColumn:
+    """
+    Growable NumPy array with the part of the array.array API used by Trace.
+
+    Appends go to a small array.array staging buffer (so `append` is a C
+    method, as fast as with the default backend) and are moved into a
+    preallocated NumPy buffer, grown by a quarter as needed, whenever the
+    column is read or `flush` is called.
+    """
+
+    def __init__(self, dtype, typecode: str = 'q', capacity: int = 1024):
+        """
+        Args:
+            dtype: NumPy dtype of the stored values.
+            typecode (str): array.array typecode of the staging buffer; it
+                must be able to hold every value appended.
+            capacity (int): Initial number of preallocated elements.
+        """
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+        self._pending = array(typecode)
+        self.append = self._pending.append
+        self.extend = self._pending.extend
+
+    @classmethod
+    def from_array(cls, values, typecode: str = 'q') -> "NumpyColumn":
+        """
+        Wraps an existing NumPy array, e.g. one loaded from disk, as a column.
+
+        Args:
+            values (ndarray): The column values.
+            typecode (str): array.array typecode for further appends.
+
+        Returns:
+            NumpyColumn: A column holding `values`.
+        """
+        column = cls(values.dtype, typecode, capacity=0)
+        column._data = values
+        column._size = len(values)
+        return column
+
+    def __len__(self) -> int:
+        return self._size + len(self._pending)
+
+    def flush(self):
+        """Moves staged values into the NumPy buffer."""
+        pending = len(self._pending)
+        if not pending:
+            return
+        needed = self._size + pending
+        if needed > len(self._data):
+            grown = np.empty(max(needed, len(self._data) + len(self._data) // 4 + 1024), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:needed] = self._pending
+        self._size = needed
+        del self._pending[:]
+
+    def view(self):
+        """Returns the filled part of the buffer as a NumPy array (no copy)."""
+        self.flush()
+        return self._data[:self._size]
+
+    def __getitem__(self, index):
+        return self.view()[index]
+
+    def __reduce__(self):
+        return NumpyColumn.from_array, (self.view(), self._pending.typecode)
+
+    def count(self, value: int) -> int:
+        return int(np.count_nonzero(self.view() == value))
+
+
+class TraceView(Sequence):
+    """
+    Read-only, list-like view over one column of a Trace.
+
+    Items are produced on demand, so a view can be indexed and iterated
+    like the lists the sorting functions used to return without ever
+    materialising the whole column.
+    """
+
+    def __init__(self, trace: "Trace", getter: Callable[[int], object]):
+        self.trace = trace
+        self._getter = getter
+
+    def __len__(self) -> int:
+        return len(self.trace)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._getter(i) for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("trace index out of range")
+        return self._getter(index)
+
+
+class Trace:
+    """
+    Delta-encoded record of a sorting run.
+
+    Instead of copying the whole array at every step, a trace stores the
+    operation performed at each step (compare, swap, write, ...) together
+    with a full keyframe of the array every `keyframe_interval` steps.
+    The array state at any step is rebuilt on demand by replaying the
+    operations recorded since the closest preceding keyframe.
+
+    The trace observes the list being sorted: the sorting code mutates the
+    list first and then records the operation, so each step describes the
+    state of the array after that operation.
+
+    Messages are kept as a template id from messages.py plus integer
+    arguments and are only formatted when a step's message is read.
+
+    A trace can also be attached to a `source` of (op, a, b, message, args) steps,
+    typically one of the sorting generators in algorithms.py, and pull from
+    it only as far as a consumer needs via `fill`.
+
+    Two storage backends are available: "array" (the default) keeps every
+    column in an array.array, "numpy" keeps them in growable NumPy arrays,
+    with narrow integer types for keyframes and indices, which can be sliced
+    with `columns` and written to an .npz file with `save`.
+    """
+
+    def __init__(self, arr: List[int], source: Optional[Iterable[Step]] = None,
+                 keyframe_interval: Optional[int] = None, backend: str = "array"):
+        """
+        Starts a trace whose first step is the initial state of `arr`.
+
+        Args:
+            arr (List[int]): The array being sorted. It is observed, not copied.
+            source (Optional[Iterable[Step]]): Steps still
+                to be recorded, consumed lazily by `fill`.
+            keyframe_interval (Optional[int]): Number of steps between two
+                keyframes. Defaults to the larger of DEFAULT_KEYFRAME_INTERVAL
+                and len(arr), which keeps keyframe memory proportional to the
+                operation log.
+            backend (str): "array" or "numpy".
+        """
+        if keyframe_interval is None:
+            keyframe_interval = max(DEFAULT_KEYFRAME_INTERVAL, len(arr))
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.keyframe_interval = keyframe_interval
+        self._live = arr
+        self._init_storage(backend, arr)
+        self._cache_index = -1
+        self._cache_state = None
+        self._source = iter(source) if source is not None else None
+        self.note(INITIAL_ARRAY)
+
+    def _init_storage(self, backend: str, arr: List[int]):
+        """
+        Creates the empty step columns for the chosen backend.
+
+        Args:
+            backend (str): "array" or "numpy".
+            arr (List[int]): The initial array, used to pick the value type.
+        """
+        self.backend = backend
+        self._keyframes = []
+        self._value_dtype = None
+        if backend == "array":
+            self._ops = array('b')
+            self._a = array('q')
+            self._b = array('q')
+            self._messages = array('H')
+            self._arg_offsets = array('q')
+            self._args = array('q')
+        elif backend == "numpy":
+            if np is None:
+                raise ImportError("The numpy trace backend requires NumPy.")
+            limit = np.iinfo(np.int32)
+            fits = not arr or (limit.min <= min(arr) and max(arr) <= limit.max and len(arr) <= limit.max)
+            value_dtype = np.int32 if fits else np.int64
+            self._value_dtype = value_dtype
+            self._ops = NumpyColumn(np.int8, 'b')
+            self._a = NumpyColumn(np.int32)
+            # Operands and message arguments can leave the value range, e.g.
+            # the offset radix sort adds to negative keys, so they stay 64-bit.
+            self._b = NumpyColumn(np.int64)
+            self._messages = NumpyColumn(np.uint16, 'H')
+            self._arg_offsets = NumpyColumn(np.int64)
+            self._args = NumpyColumn(np.int64)
+        else:
+            raise ValueError(f"Unknown trace backend {backend!r}; expected 'array' or 'numpy'.")
+
+    def _snapshot(self, values: List[int]):
+        """Copies the array into a keyframe in the backend's storage type."""
+        if self._value_dtype is None:
+            return array('q', values)
+        return np.array(values, dtype=self._value_dtype)
+
+    def __getstate__(self) -> dict:
+        """
+        Pickles the recorded columns only, so that complete traces can be
+        returned from worker processes. Pending source steps are recorded first.
+        """
+        self.fill()
+        state = self.__dict__.copy()
+        state.update(_live=None, _source=None, _cache_index=-1, _cache_state=None)
+        return state
+
+    def __len__(self) -> int:
+        return len(self._ops)
+
+    @property
+    def complete(self) -> bool:
+        """True once the source, if any, has been fully consumed."""
+        return self._source is None
+
+    def fill(self, index: Optional[int] = None) -> int:
+        """
+        Pulls steps from the source until the trace holds step `index`.
+
+        Args:
+            index (Optional[int]): The step that must be available. If None,
+                the source is consumed entirely.
+
+        Returns:
+            int: The number of steps now recorded.
+        """
+        source = self._source
+        if source is None:
+            return len(self._ops)
+        needed = None if index is None else index + 1 - len(self._ops)
+        if needed is not None and needed <= 0:
+            return len(self._ops)
+        record = self.record
+        pulled = 0
+        for op, a, b, message, args in islice(source, needed):
+            record(op, a, b, message, args)
+            pulled += 1
+        if needed is None or pulled < needed:
+            self._source = None
+        return len(self._ops)
+
+    def record(self, op: int, a: int, b: int, message: int, args: Tuple[int, ...] = ()):
+        """
+        Appends one step to the trace.
+
+        Args:
+            op (int): The operation code.
+            a (int): First operand (an index, or 0 when unused).
+            b (int): Second operand (an index, a written value, or 0 when unused).
+            message (int): The message template id for the step.
+            args (Tuple[int, ...]): The message template arguments.
+        """
+        index = len(self._ops)
+        self._ops.append(op)
+        self._a.append(a)
+        self._b.append(b)
+        self._messages.append(message)
+        self._arg_offsets.append(len(self._args))
+        self._args.extend(args)
+        if index % self.keyframe_interval == 0:
+            self._keyframes.append(self._snapshot(self._live))
+            if self.backend == "numpy":
+                for column in (self._ops, self._a, self._b, self._messages, self._arg_offsets, self._args):
+                    column.flush()
+
+    def note(self, message: int, *args: int):
+        """Records a message-only step."""
+        self.record(NOTE, 0, 0, message, args)
+
+    def visit(self, i: int, message: int, *args: int):
+        """Records a step highlighting index i."""
+        self.record(VISIT, i, 0, message, args)
+
+    def compare(self, i: int, j: int, message: int, *args: int):
+        """Records a comparison between indices i and j."""
+        self.record(COMPARE, i, j, message, args)
+
+    def swap(self, i: int, j: int, message: int, *args: int):
+        """Records that the values at indices i and j have been swapped."""
+        self.record(SWAP, i, j, message, args)
+
+    def write(self, i: int, value: int, message: int, *args: int):
+        """Records that `value` has been written to index i."""
+        self.record(WRITE, i, value, message, args)
+
+    def state(self, index: int) -> List[int]:
+        """
+        Reconstructs the array after the given step.
+
+        Args:
+            index (int): The step index.
+
+        Returns:
+            List[int]: A fresh copy of the array state at that step.
+        """
+        if not 0 <= index < len(self._ops):
+            raise IndexError("trace index out of range")
+
+        cached = self._cache_index
+        if self._cache_state is not None and cached <= index and index - cached <= self.keyframe_interval:
+            state = self._cache_state
+            position = cached
+        else:
+            keyframe = index // self.keyframe_interval
+            state = self._keyframes[keyframe].tolist()
+            position = keyframe * self.keyframe_interval
+
+        span = slice(position + 1, index + 1)
+        replay(state, zip(self._ops[span].tolist(), self._a[span].tolist(), self._b[span].tolist()))
+
+        self._cache_index = index
+        self._cache_state = state
+        return list(state)
+
+    def highlight(self, index: int) -> List[int]:
+        """
+        Returns the indices highlighted at the given step.
+
+        Args:
+            index (int): The step index.
+
+        Returns:
+            List[int]: Highlighted indices (empty for message-only steps).
+        """
+        return highlight_indices(self._ops[index], int(self._a[index]), int(self._b[index]))
+
+    def message_args(self, index: int) -> Tuple[int, Tuple[int, ...]]:
+        """
+        Returns the unformatted message of the given step.
+
+        Args:
+            index (int): The step index.
+
+        Returns:
+            Tuple[int, Tuple[int, ...]]: The template id and its arguments.
+        """
+        start = self._arg_offsets[index]
+        end = self._arg_offsets[index + 1] if index + 1 < len(self._arg_offsets) else len(self._args)
+        return int(self._messages[index]), tuple(self._args[start:end].tolist())
+
+    def message(self, index: int) -> str:
+        """Formats the descriptive message of the given step."""
+        return format_message(*self.message_args(index))
+
+    def find(self, start: int, ops: Sequence[int] = (), messages: Sequence[int] = ()) -> int:
+        """
+        Finds the first step at or after `start` with one of the given
+        operations or message templates.
+
+        Streamed traces are filled chunk by chunk until a match is found.
+
+        Args:
+            start (int): The first step searched.
+            ops (Sequence[int]): Operation codes to look for, e.g. (SWAP,).
+            messages (Sequence[int]): Message template ids to look for.
+
+        Returns:
+            int: The index of the matching step, or -1 if there is none.
+        """
+        position = max(start, 0)
+        while True:
+            stop = min(self.fill(position + FIND_CHUNK), position + FIND_CHUNK)
+            if position >= stop:
+                return -1
+            hits = [first_match(column[position:stop], targets)
+                    for column, targets in ((self._ops, ops), (self._messages, messages)) if targets]
+            hits = [hit for hit in hits if hit >= 0]
+            if hits:
+                return position + min(hits)
+            position = stop
+
+    def records(self, start: int = 0, stop: Optional[int] = None) -> Iterator[Step]:
+        """
+        Iterates over recorded steps in the (op, a, b, message, args) form
+        the sorting generators yield, e.g. to record them into another trace.
+
+        Args:
+            start (int): First step.
+            stop (Optional[int]): One past the last step. Defaults to the end;
+                pending source steps are recorded as needed.
+
+        Yields:
+            Step: The steps in order.
+        """
+        stop = self.fill() if stop is None else min(stop, self.fill(stop - 1))
+        for position in range(start, stop, FIND_CHUNK):
+            end = min(position + FIND_CHUNK, stop)
+            offsets = self._arg_offsets[position:end].tolist()
+            offsets.append(int(self._arg_offsets[end]) if end < len(self._arg_offsets) else len(self._args))
+            base = offsets[0]
+            args = self._args[base:offsets[-1]].tolist()
+            columns = (self._ops[position:end].tolist(), self._a[position:end].tolist(),
+                       self._b[position:end].tolist(), self._messages[position:end].tolist())
+            for op, a, b, message, first, last in zip(*columns, offsets, offsets[1:]):
+                yield op, a, b, message, tuple(args[first - base:last - base])
+
+    def op_codes(self) -> bytes:
+        """
+        Returns the operation code of every recorded step, one byte per step.
+        """
+        if isinstance(self._ops, NumpyColumn):
+            return self._ops.view().tobytes()
+        return self._ops.tobytes()
+
+    def op_counts(self) -> Dict[str, int]:
+        """
+        Counts the recorded steps per operation.
+
+        Returns:
+            Dict[str, int]: Number of steps for each name in OP_NAMES.
+        """
+        return {name: self._ops.count(op) for op, name in OP_NAMES.items()}
+
+    def columns(self, start: int = 0, stop: Optional[int] = None):
+        """
+        Returns the raw step columns as NumPy arrays for vectorised access.
+
+        Args:
+            start (int): First step.
+            stop (Optional[int]): One past the last step. Defaults to the end.
+
+        Returns:
+            Tuple[ndarray, ndarray, ndarray]: Operation codes, first operands
+            and second operands of steps [start, stop).
+        """
+        if np is None:
+            raise ImportError("Trace.columns requires NumPy.")
+        span = slice(start, stop)
+        return tuple(self._column_array(column)[span] for column in (self._ops, self._a, self._b))
+
+    @staticmethod
+    def _column_array(column):
+        """Returns a column as a NumPy array (a view for the numpy backend, a copy otherwise)."""
+        return column.view() if isinstance(column, NumpyColumn) else np.array(column)
+
+    def save(self, path: str):
+        """
+        Writes the complete trace to an .npz file with np.savez.
+
+        Any steps still pending in the source are recorded first.
+
+        Args:
+            path (str): Destination file.
+        """
+        if np is None:
+            raise ImportError("Trace.save requires NumPy.")
+        self.fill()
+        np.savez(
+            path,
+            keyframe_interval=np.int64(self.keyframe_interval),
+            keyframes=np.stack([np.asarray(keyframe) for keyframe in self._keyframes]),
+            ops=self._column_array(self._ops),
+            a=self._column_array(self._a),
+            b=self._column_array(self._b),
+            messages=self._column_array(self._messages),
+            arg_offsets=self._column_array(self._arg_offsets),
+            args=self._column_array(self._args),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "Trace":
+        """
+        Reads a trace written by `save` into the numpy backend.
+
+        Args:
+            path (str): The .npz file.
+
+        Returns:
+            Trace: The complete trace.
+        """
+        if np is None:
+            raise ImportError("Trace.load requires NumPy.")
+        with np.load(path) as data:
+            trace = cls.__new__(cls)
+            trace.keyframe_interval = int(data["keyframe_interval"])
+            trace.backend = "numpy"
+            trace._live = None
+            keyframes = data["keyframes"]
+            trace._keyframes = list(keyframes)
+            trace._value_dtype = keyframes.dtype
+            trace._ops = NumpyColumn.from_array(data["ops"], 'b')
+            trace._a = NumpyColumn.from_array(data["a"])
+            trace._b = NumpyColumn.from_array(data["b"])
+            trace._messages = NumpyColumn.from_array(data["messages"], 'H')
+            trace._arg_offsets = NumpyColumn.from_array(data["arg_offsets"])
+            trace._args = NumpyColumn.from_array(data["args"])
+        trace._cache_index = -1
+        trace._cache_state = None
+        trace._source = None
+        return trace
+
+    def views(self) -> Tuple[TraceView, TraceView, TraceView]:
+        """
+        Returns list-like views compatible with the (steps, highlights, messages)
+        triple expected by the visualizer.
+
+        Returns:
+            Tuple[TraceView, TraceView, TraceView]:
+                - steps: Array state after each step.
+                - highlights: Indices to highlight at each step.
+                - messages: Descriptive message for each step.
+        """
+        return TraceView(self, self.state), TraceView(self, self.highlight), TraceView(self, self.message)
@@ -1,88 +1,64 @@
-from typing import List
-import matplotlib.pyplot as plt
+import argparse
+import math
+import os
+import time
+from typing import List, Optional, Sequence, Tuple
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import tkinter as tk
 
+from messages import PASS_MESSAGES
+from plotting import BarBlitter, create_dashboard_figure, create_figure, initialize_bars, update_visualization
+from race import step_at
+from tracearchive import open_trace
+from traces import SWAP, WRITE
 
-def create_figure():
-    """
-    Creates a Matplotlib figure with two subplots:
-    - Top subplot for the bar chart.
-    - Bottom subplot for descriptive messages.
-
-    Returns:
-        Tuple[Figure, Axes, Axes, Text]:
-            - fig: The Matplotlib figure object.
-            - ax_bar: The Axes for the bar chart.
-            - ax_text: The Axes for the messages.
-            - message_text: The Text object for displaying messages.
-    """
-    fig, (ax_bar, ax_text) = plt.subplots(2, 1, figsize=(6, 4))
-    fig.tight_layout(pad=3.0)
-
-    # Bar chart configuration
-    ax_bar.set_title("Sorting Visualization", fontsize=14)
-    ax_bar.set_xlabel("Index", fontsize=10)
-    ax_bar.set_ylabel("Value", fontsize=10)
-    ax_bar.set_xlim(0, 1) 
-    ax_bar.set_ylim(0, 1) 
-    ax_bar.grid(True, which='both', linestyle='--', linewidth=0.5)
+# Number of steps pulled ahead of the current one when playing a streamed trace.
+STREAM_BUFFER = 256
 
-    # Text box configuration
-    ax_text.axis('off')  
-    message_text = ax_text.text(0.5, 0.5, "", fontsize=10, ha='center', va='center', wrap=True)
+# Playback speeds offered by the player, in steps per second. The default
+# matches the original fixed 500 ms per step.
+PLAYBACK_SPEEDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+DEFAULT_SPEED = 2
 
-    return fig, ax_bar, ax_text, message_text
+# Shortest delay between two rendered frames, in milliseconds (about 60 fps).
+MIN_FRAME_DELAY = 16
 
 
-def initialize_bars(ax_bar, array: List[int]):
+def fill_steps(steps: Sequence[List[int]], index: Optional[int]) -> int:
     """
-    Initializes the bar chart with the initial array.
+    Makes sure step `index` is available if `steps` is a streamed trace view.
 
     Args:
-        ax_bar (Axes): The Axes object for the bar chart.
-        array (List[int]): The array to visualize.
+        steps (Sequence[List[int]]): The steps to play, either a list or a trace view.
+        index (Optional[int]): The step that should be available, or None
+            for the whole trace.
 
     Returns:
-        BarContainer: The bar container object.
-    """
-    ax_bar.clear()
-    ax_bar.set_title("Sorting Visualization", fontsize=14)
-    ax_bar.set_xlabel("Index", fontsize=10)
-    ax_bar.set_ylabel("Value", fontsize=10)
-    ax_bar.set_xlim(0, len(array))
-    ax_bar.set_ylim(0, max(array) * 1.1)
-    ax_bar.grid(True, which='both', linestyle='--', linewidth=0.5)
-    bars = ax_bar.bar(range(len(array)), array, align="edge", color='red')
-    return bars
-
-
-def update_visualization(bars, array: List[int], highlights: List[int], message_text, message: str):
+        int: The number of steps currently available.
     """
-    Updates the bar chart and the descriptive message.
-
-    Args:
-        bars (BarContainer): The bar container object.
-        array (List[int]): The current state of the array.
-        highlights (List[int]): Indices to highlight in the current step.
-        message_text (Text): The Text object for displaying messages.
-        message (str): The descriptive message for the current step.
-    """
-    for bar, val in zip(bars, array):
-        bar.set_height(val)
-        bar.set_color('red')  
-
-    for idx in highlights:
-        if 0 <= idx < len(bars):
-            bars[idx].set_color('blue')  
-
-    message_text.set_text(message)
+    trace = getattr(steps, "trace", None)
+    if trace is not None:
+        trace.fill(index)
+    return len(steps)
 
 
 def visualize_sorting_gui(root, steps: List[List[int]], highlights: List[List[int]], messages: List[str], algorithm_name: str):
     """
     Sets up the Tkinter GUI for visualizing the sorting process with interactive controls.
 
+    Streamed traces are consumed lazily: only STREAM_BUFFER steps beyond the
+    current one are generated ahead of playback.
+
+    The timeline slider jumps straight to any step: a trace rebuilds it from
+    the keyframe preceding it, so the cost does not depend on the distance
+    travelled. For traces, "Next Swap" and "Next Pass" jump to the next step
+    that changes the array or starts a new pass (see messages.PASS_MESSAGES).
+
+    Playback follows a clock rather than a fixed delay per step: each frame
+    shows the step due at the selected speed, skipping the steps in between
+    when they cannot all be rendered in time, so the window stays responsive
+    at thousands of steps per second.
+
     Args:
         root (Tk): The main Tkinter window.
         steps (List[List[int]]): List of array states after each operation.
@@ -95,11 +71,70 @@ def visualize_sorting_gui(root, steps: List[List[int]], highlights: List[List[in
     canvas.draw()
     canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
 
+    fill_steps(steps, STREAM_BUFFER)
     bars = initialize_bars(ax_bar, steps[0])
     message_text.set_text(messages[0])
+    blitter = BarBlitter(canvas, ax_bar, bars, message_text)
 
+    trace = getattr(steps, "trace", None)
     current_step = [0] 
     is_playing = [False]
+    # Time and step at which playback last started, changed speed or was moved.
+    clock = [0.0, 0]
+
+    def show_step():
+        """
+        Blits the current step, redrawing only the bars that changed.
+        """
+        changed = update_visualization(
+            bars,
+            steps[current_step[0]],
+            highlights[current_step[0]],
+            message_text,
+            messages[current_step[0]]
+        )
+        blitter.blit(changed)
+        timeline.configure(to=max(0, len(steps) - 1))
+        timeline.set(current_step[0])
+
+    def seek(index: int):
+        """
+        Jumps to the given step, clamped to the available steps.
+
+        Args:
+            index (int): The step to show.
+        """
+        index = max(0, min(index, fill_steps(steps, index + STREAM_BUFFER) - 1))
+        if index != current_step[0]:
+            current_step[0] = index
+            show_step()
+            restart_clock()
+
+    def on_timeline(value: str):
+        """
+        Follows the timeline slider. Moves made by show_step itself are ignored.
+        """
+        seek(int(float(value)))
+
+    def jump(ops=(), templates=()):
+        """
+        Jumps to the next step with one of the given operations or message
+        templates, or to the last step if there is none.
+        """
+        index = trace.find(current_step[0] + 1, ops, templates)
+        seek(index if index >= 0 else fill_steps(steps, None) - 1)
+
+    def next_swap():
+        """
+        Jumps to the next step that swaps or writes array values.
+        """
+        jump(ops=(SWAP, WRITE))
+
+    def next_pass():
+        """
+        Jumps to the next step that starts a pass of the algorithm's outer loop.
+        """
+        jump(templates=PASS_MESSAGES)
 
     def play():
         """
@@ -107,6 +142,7 @@ def visualize_sorting_gui(root, steps: List[List[int]], highlights: List[List[in
         """
         if not is_playing[0]:
             is_playing[0] = True
+            restart_clock()
             advance_step()
 
     def stop():
@@ -121,45 +157,55 @@ def visualize_sorting_gui(root, steps: List[List[int]], highlights: List[List[in
         """
         if current_step[0] > 0:
             current_step[0] -= 1
-            update_visualization(
-                bars,
-                steps[current_step[0]],
-                highlights[current_step[0]],
-                message_text,
-                messages[current_step[0]]
-            )
-            canvas.draw()
+            show_step()
+            restart_clock()
 
     def forward():
         """
         Moves one step forward in the sorting visualization.
         """
-        if current_step[0] < len(steps) - 1:
+        if current_step[0] < fill_steps(steps, current_step[0] + STREAM_BUFFER) - 1:
             current_step[0] += 1
-            update_visualization(
-                bars,
-                steps[current_step[0]],
-                highlights[current_step[0]],
-                message_text,
-                messages[current_step[0]]
-            )
-            canvas.draw()
+            show_step()
+            restart_clock()
+
+    def speed() -> int:
+        """
+        Returns the selected playback speed in steps per second.
+        """
+        try:
+            return max(1, int(speed_var.get()))
+        except ValueError:
+            return DEFAULT_SPEED
+
+    def restart_clock():
+        """
+        Restarts the playback clock from the current step.
+        """
+        clock[0] = time.perf_counter()
+        clock[1] = current_step[0]
 
     def advance_step():
         """
-        Advances the visualization by one step if playing.
+        Shows the step due on the playback clock if playing, skipping any
+        steps in between, and schedules the next frame.
         """
-        if is_playing[0] and current_step[0] < len(steps) - 1:
-            current_step[0] += 1
-            update_visualization(
-                bars,
-                steps[current_step[0]],
-                highlights[current_step[0]],
-                message_text,
-                messages[current_step[0]]
-            )
-            canvas.draw()
-            root.after(500, advance_step) 
+        if not is_playing[0]:
+            return
+        started, origin = clock
+        rate = speed()
+        due = origin + int((time.perf_counter() - started) * rate)
+        available = fill_steps(steps, due + STREAM_BUFFER)
+        if current_step[0] >= available - 1:
+            is_playing[0] = False
+            return
+        due = min(due, available - 1)
+        if due > current_step[0]:
+            current_step[0] = due
+            show_step()
+        next_due = started + (current_step[0] - origin + 1) / rate
+        delay = round((next_due - time.perf_counter()) * 1000)
+        root.after(max(MIN_FRAME_DELAY, delay), advance_step)
 
     control_frame = tk.Frame(root)
     control_frame.pack(side=tk.BOTTOM)
@@ -176,155 +222,279 @@ def visualize_sorting_gui(root, steps: List[List[int]], highlights: List[List[in
     forward_button = tk.Button(control_frame, text="Forward", command=forward)
     forward_button.pack(side=tk.LEFT, padx=5, pady=5)
 
+    jump_state = tk.NORMAL if trace is not None else tk.DISABLED
+    next_swap_button = tk.Button(control_frame, text="Next Swap", command=next_swap, state=jump_state)
+    next_swap_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+    next_pass_button = tk.Button(control_frame, text="Next Pass", command=next_pass, state=jump_state)
+    next_pass_button.pack(side=tk.LEFT, padx=5, pady=5)
+
+    speed_label = tk.Label(control_frame, text="Steps/s")
+    speed_label.pack(side=tk.LEFT, padx=(5, 0), pady=5)
+
+    speed_var = tk.StringVar(value=str(DEFAULT_SPEED))
+    speed_box = tk.Spinbox(control_frame, values=PLAYBACK_SPEEDS, textvariable=speed_var, width=6,
+                           command=restart_clock)
+    speed_var.set(str(DEFAULT_SPEED))  # Tk resets the variable to the first value.
+    speed_box.pack(side=tk.LEFT, padx=5, pady=5)
+    speed_box.bind("<Return>", lambda event: restart_clock())
+
+    timeline = tk.Scale(root, from_=0, to=max(0, len(steps) - 1), orient=tk.HORIZONTAL,
+                        showvalue=True, label="Step", command=on_timeline)
+    timeline.pack(side=tk.BOTTOM, fill=tk.X, padx=5)
+
     ax_bar.set_title(f"{algorithm_name} Visualization", fontsize=14)
     canvas.draw()
 
 
-def visualize_selection_sort(steps: List[List[int]], highlights: List[List[int]], messages: List[str]):
+class Panel:
     """
-    Launches the Tkinter window for Selection Sort visualization.
-
-    Args:
-        steps (List[List[int]]): List of array states after each operation.
-        highlights (List[List[int]]): List of indices to highlight at each step.
-        messages (List[str]): List of descriptive messages for each step.
+    One algorithm shown in the dashboard, with its own chart and step cursor.
     """
-    root = tk.Tk()
-    root.title("Selection Sort Visualization")
-    visualize_sorting_gui(root, steps, highlights, messages, "Selection Sort")
-    root.mainloop()
 
+    def __init__(self, name: str, steps: Sequence[List[int]], highlights: Sequence[List[int]],
+                 messages: Sequence[str], canvas, ax_bar, message_text):
+        """
+        Draws the initial step of the trace in the given Axes.
+
+        Args:
+            name (str): The name of the sorting algorithm.
+            steps (Sequence[List[int]]): Array state after each operation.
+            highlights (Sequence[List[int]]): Indices to highlight at each step.
+            messages (Sequence[str]): Descriptive message for each step.
+            canvas (FigureCanvasTkAgg): The canvas shared by all panels.
+            ax_bar (Axes): The Axes for this panel's bar chart.
+            message_text (Text): The Text object for this panel's messages.
+        """
+        self.name = name
+        self.steps = steps
+        self.highlights = highlights
+        self.messages = messages
+        self.message_text = message_text
+        self.cursor = 0
+
+        fill_steps(steps, STREAM_BUFFER)
+        self.bars = initialize_bars(ax_bar, steps[0])
+        ax_bar.set_title(name, fontsize=9)
+        ax_bar.set_xlabel("")
+        ax_bar.set_ylabel("")
+        ax_bar.tick_params(labelsize=6)
+        message_text.set_text(messages[0])
+        self.blitter = BarBlitter(canvas, ax_bar, self.bars, message_text)
+
+    def seek(self, index: int) -> bool:
+        """
+        Moves the cursor to a step, clamped to the trace, and blits the panel if it moved.
 
-def visualize_bubble_sort(steps: List[List[int]], highlights: List[List[int]], messages: List[str]):
-    """
-    Launches the Tkinter window for Bubble Sort visualization.
+        Args:
+            index (int): The step to show.
 
-    Args:
-        steps (List[List[int]]): List of array states after each operation.
-        highlights (List[List[int]]): List of indices to highlight at each step.
-        messages (List[str]): List of descriptive messages for each step.
-    """
-    root = tk.Tk()
-    root.title("Bubble Sort Visualization")
-    visualize_sorting_gui(root, steps, highlights, messages, "Bubble Sort")
-    root.mainloop()
+        Returns:
+            bool: True if the cursor is on the last step of the trace.
+        """
+        available = fill_steps(self.steps, index + STREAM_BUFFER)
+        index = max(0, min(index, available - 1))
+        if index != self.cursor:
+            self.cursor = index
+            changed = update_visualization(
+                self.bars,
+                self.steps[index],
+                self.highlights[index],
+                self.message_text,
+                self.messages[index]
+            )
+            self.blitter.blit(changed)
+        return index == available - 1
 
 
-def visualize_insertion_sort(steps: List[List[int]], highlights: List[List[int]], messages: List[str]):
+def visualize_dashboard_gui(root, runs: Sequence[Tuple[str, Sequence[List[int]], Sequence[List[int]], Sequence[str]]],
+                            columns: Optional[int] = None, costs: Optional[Sequence[Sequence[float]]] = None,
+                            speed: int = DEFAULT_SPEED, unit: str = "Steps"):
     """
-    Launches the Tkinter window for Insertion Sort visualization.
+    Sets up one Tkinter window showing several sorting runs side by side.
+
+    All panels share a single figure, canvas and playback clock. Every
+    frame, each panel's cursor is moved to the current step (or to its last
+    step once its trace has ended) and only the panels that moved are blitted.
+
+    In race mode (`costs` given) the shared clock counts cost units instead
+    of steps, and each panel shows the last step it has paid for, so panels
+    advance at the relative speed of their algorithms (see race.py).
 
     Args:
-        steps (List[List[int]]): List of array states after each operation.
-        highlights (List[List[int]]): List of indices to highlight at each step.
-        messages (List[str]): List of descriptive messages for each step.
+        root (Tk): The main Tkinter window.
+        runs (Sequence[Tuple[str, Sequence[List[int]], Sequence[List[int]], Sequence[str]]]):
+            The algorithm name and the (steps, highlights, messages) of each run.
+        columns (Optional[int]): Number of panels per row. Defaults to at most five.
+        costs (Optional[Sequence[Sequence[float]]]): For a race, the
+            cumulative cost of every step of each run, from race.cumulative_costs.
+        speed (int): Initial playback speed in clock units per second.
+        unit (str): Name of the clock unit shown next to the speed control.
     """
-    root = tk.Tk()
-    root.title("Insertion Sort Visualization")
-    visualize_sorting_gui(root, steps, highlights, messages, "Insertion Sort")
-    root.mainloop()
+    if columns is None:
+        columns = min(len(runs), 5)
+    fig, axes = create_dashboard_figure(len(runs), columns)
+    canvas = FigureCanvasTkAgg(fig, master=root)
+    canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+    panels = [
+        Panel(name, steps, highlights, messages, canvas, ax_bar, message_text)
+        for (name, steps, highlights, messages), (ax_bar, ax_text, message_text) in zip(runs, axes)
+    ]
 
+    position = [0]
+    is_playing = [False]
+    # Time and step at which playback last started, changed speed or was moved.
+    clock = [0.0, 0]
 
-def visualize_heap_sort(steps: List[List[int]], highlights: List[List[int]], messages: List[str]):
-    """
-    Launches the Tkinter window for Heap Sort visualization.
+    def move_to(index: int) -> bool:
+        """
+        Moves every panel to the given step.
 
-    Args:
-        steps (List[List[int]]): List of array states after each operation.
-        highlights (List[List[int]]): List of indices to highlight at each step.
-        messages (List[str]): List of descriptive messages for each step.
-    """
-    root = tk.Tk()
-    root.title("Heap Sort Visualization")
-    visualize_sorting_gui(root, steps, highlights, messages, "Heap Sort")
-    root.mainloop()
+        Args:
+            index (int): The shared step position.
 
+        Returns:
+            bool: True once every panel is on its last step.
+        """
+        position[0] = max(0, index)
+        if costs is None:
+            finished = all([panel.seek(position[0]) for panel in panels])
+        else:
+            finished = all([panel.seek(step_at(cost, position[0])) for panel, cost in zip(panels, costs)])
+        if finished:
+            position[0] = max(panel.cursor for panel in panels) if costs is None else math.ceil(max(cost[-1] for cost in costs))
+        return finished
+
+    def clock_speed() -> int:
+        """
+        Returns the selected playback speed in clock units per second.
+        """
+        try:
+            return max(1, int(speed_var.get()))
+        except ValueError:
+            return speed
 
-def visualize_quick_sort(steps: List[List[int]], highlights: List[List[int]], messages: List[str]):
-    """
-    Launches the Tkinter window for Quick Sort visualization.
+    def restart_clock():
+        """
+        Restarts the playback clock from the current position.
+        """
+        clock[0] = time.perf_counter()
+        clock[1] = position[0]
 
-    Args:
-        steps (List[List[int]]): List of array states after each operation.
-        highlights (List[List[int]]): List of indices to highlight at each step.
-        messages (List[str]): List of descriptive messages for each step.
-    """
-    root = tk.Tk()
-    root.title("Quick Sort Visualization")
-    visualize_sorting_gui(root, steps, highlights, messages, "Quick Sort")
-    root.mainloop()
+    def play():
+        """
+        Starts the automatic progression of all panels.
+        """
+        if not is_playing[0]:
+            is_playing[0] = True
+            restart_clock()
+            advance_step()
 
+    def stop():
+        """
+        Stops the automatic progression of all panels.
+        """
+        is_playing[0] = False
 
-def visualize_merge_sort(steps: List[List[int]], highlights: List[List[int]], messages: List[str]):
-    """
-    Launches the Tkinter window for Merge Sort visualization.
+    def back():
+        """
+        Moves every panel one step backward.
+        """
+        move_to(position[0] - 1)
+        restart_clock()
 
-    Args:
-        steps (List[List[int]]): List of array states after each operation.
-        highlights (List[List[int]]): List of indices to highlight at each step.
-        messages (List[str]): List of descriptive messages for each step.
-    """
-    root = tk.Tk()
-    root.title("Merge Sort Visualization")
-    visualize_sorting_gui(root, steps, highlights, messages, "Merge Sort")
-    root.mainloop()
+    def forward():
+        """
+        Moves every panel one step forward.
+        """
+        move_to(position[0] + 1)
+        restart_clock()
 
+    def advance_step():
+        """
+        Moves every panel to the step due on the playback clock if playing,
+        skipping any steps in between, and schedules the next frame.
+        """
+        if not is_playing[0]:
+            return
+        started, origin = clock
+        rate = clock_speed()
+        due = origin + int((time.perf_counter() - started) * rate)
+        if due > position[0] and move_to(due):
+            is_playing[0] = False
+            return
+        next_due = started + (position[0] - origin + 1) / rate
+        delay = round((next_due - time.perf_counter()) * 1000)
+        root.after(max(MIN_FRAME_DELAY, delay), advance_step)
 
-def visualize_shell_sort(steps: List[List[int]], highlights: List[List[int]], messages: List[str]):
-    """
-    Launches the Tkinter window for Shell Sort visualization.
+    control_frame = tk.Frame(root)
+    control_frame.pack(side=tk.BOTTOM)
 
-    Args:
-        steps (List[List[int]]): List of array states after each operation.
-        highlights (List[List[int]]): List of indices to highlight at each step.
-        messages (List[str]): List of descriptive messages for each step.
-    """
-    root = tk.Tk()
-    root.title("Shell Sort Visualization")
-    visualize_sorting_gui(root, steps, highlights, messages, "Shell Sort")
-    root.mainloop()
+    for text, command in (("Play", play), ("Stop", stop), ("Back", back), ("Forward", forward)):
+        tk.Button(control_frame, text=text, command=command).pack(side=tk.LEFT, padx=5, pady=5)
+
+    speed_label = tk.Label(control_frame, text=f"{unit}/s")
+    speed_label.pack(side=tk.LEFT, padx=(5, 0), pady=5)
+
+    speed_var = tk.StringVar(value=str(speed))
+    speed_box = tk.Spinbox(control_frame, values=sorted({*PLAYBACK_SPEEDS, speed}), textvariable=speed_var, width=8,
+                           command=restart_clock)
+    speed_var.set(str(speed))  # Tk resets the variable to the first value.
+    speed_box.pack(side=tk.LEFT, padx=5, pady=5)
+    speed_box.bind("<Return>", lambda event: restart_clock())
+
+    canvas.draw()
 
 
-def visualize_counting_sort(steps: List[List[int]], highlights: List[List[int]], messages: List[str]):
+def visualize_dashboard(runs: Sequence[Tuple[str, Sequence[List[int]], Sequence[List[int]], Sequence[str]]], **options):
     """
-    Launches the Tkinter window for Counting Sort visualization.
+    Launches a single Tkinter window showing several sorting runs side by side.
 
     Args:
-        steps (List[List[int]]): List of array states after each operation.
-        highlights (List[List[int]]): List of indices to highlight at each step.
-        messages (List[str]): List of descriptive messages for each step.
+        runs (Sequence[Tuple[str, Sequence[List[int]], Sequence[List[int]], Sequence[str]]]):
+            The algorithm name and the (steps, highlights, messages) of each run.
+        **options: Keyword arguments for visualize_dashboard_gui, such as
+            the costs of a race.
     """
     root = tk.Tk()
-    root.title("Counting Sort Visualization")
-    visualize_sorting_gui(root, steps, highlights, messages, "Counting Sort")
+    root.title("Sorting Visualization")
+    visualize_dashboard_gui(root, runs, **options)
     root.mainloop()
 
 
-def visualize_radix_sort(steps: List[List[int]], highlights: List[List[int]], messages: List[str]):
+def visualize_trace_file(path: str, algorithm_name: Optional[str] = None):
     """
-    Launches the Tkinter window for Radix Sort visualization.
+    Launches the Tkinter window for a trace file written by tracefile.TraceWriter
+    or a trace archive written by tracearchive.ArchiveWriter, e.g. with
+    quick_sort(arr, path="quick.trace") or quick_sort(arr, path="quick.trz").
+
+    Each step is rebuilt from the nearest keyframe when it is shown, so the
+    trace is never loaded as a whole.
 
     Args:
-        steps (List[List[int]]): List of array states after each operation.
-        highlights (List[List[int]]): List of indices to highlight at each step.
-        messages (List[str]): List of descriptive messages for each step.
+        path (str): The trace file.
+        algorithm_name (Optional[str]): The name shown in the title. Defaults
+            to the file name.
     """
-    root = tk.Tk()
-    root.title("Radix Sort Visualization")
-    visualize_sorting_gui(root, steps, highlights, messages, "Radix Sort")
-    root.mainloop()
+    if algorithm_name is None:
+        algorithm_name = os.path.splitext(os.path.basename(path))[0]
+    with open_trace(path) as trace:
+        root = tk.Tk()
+        root.title(f"{algorithm_name} Visualization")
+        visualize_sorting_gui(root, *trace.views(), algorithm_name)
+        root.mainloop()
 
 
-def visualize_cocktail_shaker_sort(steps: List[List[int]], highlights: List[List[int]], messages: List[str]):
+def main():
     """
-    Launches the Tkinter window for Cocktail Shaker Sort visualization.
-
-    Args:
-        steps (List[List[int]]): List of array states after each operation.
-        highlights (List[List[int]]): List of indices to highlight at each step.
-        messages (List[str]): List of descriptive messages for each step.
+    Command line entry point: replays a trace file in the visualizer.
     """
-    root = tk.Tk()
-    root.title("Cocktail Shaker Sort Visualization")
-    visualize_sorting_gui(root, steps, highlights, messages, "Cocktail Shaker Sort")
-    root.mainloop()
+    parser = argparse.ArgumentParser(description="Replay a sorting trace file.")
+    parser.add_argument("path", help="Trace file or archive written with a sorting function's path option.")
+    parser.add_argument("--name", default=None, help="Algorithm name shown in the title.")
+    args = parser.parse_args()
+    visualize_trace_file(args.path, args.name)
+
+
+if __name__ == "__main__":
+    main()